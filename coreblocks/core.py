@@ -2,25 +2,32 @@ from amaranth import *
 
 from coreblocks.params.dependencies import DependencyManager
 from coreblocks.stages.func_blocks_unifier import FuncBlocksUnifier
-from transactron.core import Transaction, TModule
+from transactron.core import TModule
 from transactron.lib import FIFO, ConnectTrans
 from coreblocks.params.layouts import *
-from coreblocks.params.keys import BranchResolvedKey, GenericCSRRegistersKey, InstructionPrecommitKey, WishboneDataKey
+from coreblocks.params.keys import (
+    BranchResolvedKey,
+    GenericCSRRegistersKey,
+    InstructionPrecommitKey,
+    RFIssueReadKey,
+    WishboneDataKey,
+)
 from coreblocks.params.genparams import GenParams
 from coreblocks.params.isa import Extension
 from coreblocks.frontend.decode import Decode
 from coreblocks.structs_common.rat import FRAT, RRAT
 from coreblocks.structs_common.rob import ReorderBuffer
 from coreblocks.structs_common.rf import RegisterFile
-from coreblocks.structs_common.csr_generic import GenericCSRRegisters
+from coreblocks.structs_common.free_list import FreeList
+from coreblocks.structs_common.csr_generic import GenericCSRRegisters, TransactionCountersCSR
 from coreblocks.structs_common.exception import ExceptionCauseRegister
+from coreblocks.structs_common.retirement_trace import RetirementTrace
 from coreblocks.scheduler.scheduler import Scheduler
 from coreblocks.stages.backend import ResultAnnouncement
 from coreblocks.stages.retirement import Retirement
 from coreblocks.frontend.icache import ICache, SimpleWBCacheRefiller, ICacheBypass
 from coreblocks.peripherals.wishbone import WishboneMaster, WishboneBus
 from coreblocks.frontend.fetch import Fetch, UnalignedFetch
-from transactron.utils.fifo import BasicFifo
 
 __all__ = ["Core"]
 
@@ -37,9 +44,7 @@ class Core(Elaboratable):
 
         # make fifo_fetch visible outside the core for injecting instructions
         self.fifo_fetch = FIFO(self.gen_params.get(FetchLayouts).raw_instr, 2)
-        self.free_rf_fifo = BasicFifo(
-            self.gen_params.get(SchedulerLayouts).free_rf_layout, 2**self.gen_params.phys_regs_bits
-        )
+        self.free_rf_list = FreeList(self.gen_params)
 
         cache_layouts = self.gen_params.get(ICacheLayouts)
         if gen_params.icache_params.enable:
@@ -62,9 +67,13 @@ class Core(Elaboratable):
 
         connections = gen_params.get(DependencyManager)
         connections.add_dependency(WishboneDataKey(), self.wb_master_data)
+        connections.add_dependency(RFIssueReadKey(), (self.RF.issue_read1, self.RF.issue_read2))
 
         self.exception_cause_register = ExceptionCauseRegister(self.gen_params, rob_get_indices=self.ROB.get_indices)
 
+        if gen_params.retirement_trace:
+            self.retirement_trace = RetirementTrace(self.gen_params)
+
         self.func_blocks_unifier = FuncBlocksUnifier(
             gen_params=gen_params,
             blocks=gen_params.func_units_config,
@@ -79,9 +88,23 @@ class Core(Elaboratable):
             rf_write=self.RF.write,
         )
 
+        self.retirement = Retirement(
+            self.gen_params,
+            rob_peek=self.ROB.peek,
+            rob_retire=self.ROB.retire,
+            r_rat_commit=self.RRAT.commit,
+            free_rf_put=self.free_rf_list.free[0],
+            rf_free=self.RF.free,
+            precommit=self.func_blocks_unifier.get_extra_method(InstructionPrecommitKey()),
+            exception_cause_get=self.exception_cause_register.get,
+        )
+
         self.csr_generic = GenericCSRRegisters(self.gen_params)
         connections.add_dependency(GenericCSRRegistersKey(), self.csr_generic)
 
+        if gen_params.transaction_counters:
+            self.transaction_counters = TransactionCountersCSR(self.gen_params)
+
     def elaborate(self, platform):
         m = TModule()
 
@@ -91,9 +114,9 @@ class Core(Elaboratable):
         m.submodules.wb_master_instr = self.wb_master_instr
         m.submodules.wb_master_data = self.wb_master_data
 
-        m.submodules.free_rf_fifo = free_rf_fifo = self.free_rf_fifo
+        m.submodules.free_rf_list = free_rf_list = self.free_rf_list
         m.submodules.FRAT = frat = self.FRAT
-        m.submodules.RRAT = rrat = self.RRAT
+        m.submodules.RRAT = self.RRAT
         m.submodules.RF = rf = self.RF
         m.submodules.ROB = rob = self.ROB
 
@@ -110,7 +133,7 @@ class Core(Elaboratable):
 
         m.submodules.scheduler = Scheduler(
             get_instr=fifo_decode.read,
-            get_free_reg=free_rf_fifo.read,
+            get_free_reg=free_rf_list.alloc[0],
             rat_rename=frat.rename,
             rob_put=rob.put,
             rf_read1=rf.read1,
@@ -127,23 +150,14 @@ class Core(Elaboratable):
 
         m.submodules.announcement = self.announcement
         m.submodules.func_blocks_unifier = self.func_blocks_unifier
-        m.submodules.retirement = Retirement(
-            self.gen_params,
-            rob_peek=rob.peek,
-            rob_retire=rob.retire,
-            r_rat_commit=rrat.commit,
-            free_rf_put=free_rf_fifo.write,
-            rf_free=rf.free,
-            precommit=self.func_blocks_unifier.get_extra_method(InstructionPrecommitKey()),
-            exception_cause_get=self.exception_cause_register.get,
-        )
+        m.submodules.retirement = self.retirement
 
         m.submodules.csr_generic = self.csr_generic
 
-        # push all registers to FreeRF at reset. r0 should be skipped, stop when counter overflows to 0
-        free_rf_reg = Signal(self.gen_params.phys_regs_bits, reset=1)
-        with Transaction(name="InitFreeRFFifo").body(m, request=(free_rf_reg.bool())):
-            free_rf_fifo.write(m, free_rf_reg)
-            m.d.sync += free_rf_reg.eq(free_rf_reg + 1)
+        if self.gen_params.transaction_counters:
+            m.submodules.transaction_counters = self.transaction_counters
+
+        if self.gen_params.retirement_trace:
+            m.submodules.retirement_trace = self.retirement_trace
 
         return m
@@ -39,6 +39,9 @@ class Decode(Elaboratable):
 
         m.submodules.instr_decoder = instr_decoder = InstrDecoder(self.gp)
 
+        if self.gp.retirement_trace:
+            retirement_trace = self.gp.get(DependencyManager).get_dependency(RetirementTraceKey())
+
         with Transaction().body(m):
             raw = self.get_raw(m)
 
@@ -91,4 +94,9 @@ class Decode(Elaboratable):
                 },
             )
 
+            if self.gp.pipeline_timeline:
+                retirement_trace.report_instr(m, instr=raw.instr, fetch=raw.fetch)
+            elif self.gp.retirement_trace:
+                retirement_trace.report_instr(m, instr=raw.instr)
+
         return m
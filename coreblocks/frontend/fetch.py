@@ -43,6 +43,12 @@ class Fetch(Elaboratable):
 
         speculative_pc = Signal(self.gp.isa.xlen, reset=self.gp.start_pc)
 
+        # The fetch cycle is passed with the instruction to the retirement trace.
+        timeline_fields: dict[str, Value] = {}
+        if self.gp.pipeline_timeline:
+            retirement_trace = self.gp.get(DependencyManager).get_dependency(RetirementTraceKey())
+            timeline_fields["fetch"] = retirement_trace.timestamp
+
         stalled = Signal()
         spin = Signal()
 
@@ -82,7 +88,7 @@ class Fetch(Elaboratable):
                     m.d.sync += self.pc.eq(target.addr)
                     m.d.comb += instr.eq(res.instr)
 
-                self.cont(m, instr=instr, pc=target.addr, access_fault=fetch_error, rvc=0)
+                self.cont(m, instr=instr, pc=target.addr, access_fault=fetch_error, rvc=0, **timeline_fields)
 
         @def_method(m, self.verify_branch, ready=stalled)
         def _(from_pc: Value, next_pc: Value):
@@ -132,6 +138,12 @@ class UnalignedFetch(Elaboratable):
         flushing = Signal()
         stalled = Signal()
 
+        # The fetch cycle is passed with the instruction to the retirement trace.
+        timeline_fields: dict[str, Value] = {}
+        if self.gp.pipeline_timeline:
+            retirement_trace = self.gp.get(DependencyManager).get_dependency(RetirementTraceKey())
+            timeline_fields["fetch"] = retirement_trace.timestamp
+
         with Transaction().body(m, request=~stalled):
             aligned_pc = Cat(Repl(0, 2), cache_req_pc[2:])
             self.icache.issue_req(m, addr=aligned_pc)
@@ -210,7 +222,7 @@ class UnalignedFetch(Elaboratable):
                 with m.If(~cache_resp.error):
                     m.d.sync += current_pc.eq(current_pc + Mux(is_rvc, C(2, 3), C(4, 3)))
 
-                self.cont(m, instr=instr, pc=current_pc, access_fault=cache_resp.error, rvc=is_rvc)
+                self.cont(m, instr=instr, pc=current_pc, access_fault=cache_resp.error, rvc=is_rvc, **timeline_fields)
 
         @def_method(m, self.verify_branch, ready=(stalled & ~flushing))
         def _(from_pc: Value, next_pc: Value):
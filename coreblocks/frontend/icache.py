@@ -172,19 +172,10 @@ class ICache(Elaboratable, ICacheInterface):
         refill_finish = Signal()
         refill_error = Signal()
 
-        flush_start = Signal()
-        flush_finish = Signal()
-
-        with m.FSM(reset="FLUSH") as fsm:
-            with m.State("FLUSH"):
-                with m.If(flush_finish):
-                    m.next = "LOOKUP"
-
+        with m.FSM(reset="LOOKUP") as fsm:
             with m.State("LOOKUP"):
                 with m.If(needs_refill):
                     m.next = "REFILL"
-                with m.Elif(flush_start):
-                    m.next = "FLUSH"
 
             with m.State("REFILL"):
                 with m.If(refill_finish):
@@ -211,15 +202,20 @@ class ICache(Elaboratable, ICacheInterface):
         instr_out = extract_instr_from_word(m, self.params, mem_out, request_addr[:])
 
         refill_error_saved = Signal()
-        m.d.comb += needs_refill.eq(request_valid & ~tag_hit_any & ~refill_error_saved)
+        # The response for the oldest request was already produced, but not yet accepted.
+        # A flush can invalidate the line in the meantime, so it must not be refilled again.
+        resp_sent = Signal()
+        m.d.comb += needs_refill.eq(request_valid & ~tag_hit_any & ~refill_error_saved & ~resp_sent)
 
         with Transaction().body(m, request=request_valid & fsm.ongoing("LOOKUP") & (tag_hit_any | refill_error_saved)):
             self.res_fwd.write(m, instr=instr_out, error=refill_error_saved)
             m.d.sync += refill_error_saved.eq(0)
+            m.d.sync += resp_sent.eq(1)
 
         @def_method(m, self.accept_res)
         def _():
             self.req_fifo.read(m)
+            m.d.sync += resp_sent.eq(0)
             return self.res_fwd.read(m)
 
         mem_read_addr = Record(self.addr_layout)
@@ -240,17 +236,11 @@ class ICache(Elaboratable, ICacheInterface):
             self.mem.data_rd_addr.offset.eq(mem_read_addr.offset),
         ]
 
-        # Flush logic
-        flush_index = Signal(self.params.index_bits)
-        with m.If(fsm.ongoing("FLUSH")):
-            m.d.sync += flush_index.eq(flush_index + 1)
-
+        # Flush logic - all the valid bits are cleared in a single cycle.
+        # Pending requests which didn't hit before the flush are looked up again after it.
         @def_method(m, self.flush, ready=accepting_requests)
         def _() -> None:
-            m.d.sync += flush_index.eq(0)
-            m.d.comb += flush_start.eq(1)
-
-        m.d.comb += flush_finish.eq(flush_index == self.params.num_of_sets - 1)
+            m.d.comb += self.mem.flush.eq(1)
 
         # Slow path - data refilling
         with Transaction().body(m, request=fsm.ongoing("LOOKUP") & needs_refill):
@@ -273,22 +263,13 @@ class ICache(Elaboratable, ICacheInterface):
             m.d.comb += refill_error.eq(ret.error)
             m.d.sync += refill_error_saved.eq(ret.error)
 
-        with m.If(fsm.ongoing("FLUSH")):
-            m.d.comb += [
-                self.mem.way_wr_en.eq(Repl(1, self.params.num_of_ways)),
-                self.mem.tag_wr_index.eq(flush_index),
-                self.mem.tag_wr_data.valid.eq(0),
-                self.mem.tag_wr_data.tag.eq(0),
-                self.mem.tag_wr_en.eq(1),
-            ]
-        with m.Else():
-            m.d.comb += [
-                self.mem.way_wr_en.eq(way_selector),
-                self.mem.tag_wr_index.eq(request_addr.index),
-                self.mem.tag_wr_data.valid.eq(~refill_error),
-                self.mem.tag_wr_data.tag.eq(request_addr.tag),
-                self.mem.tag_wr_en.eq(refill_finish),
-            ]
+        m.d.comb += [
+            self.mem.way_wr_en.eq(way_selector),
+            self.mem.tag_wr_index.eq(request_addr.index),
+            self.mem.tag_wr_data.valid.eq(~refill_error),
+            self.mem.tag_wr_data.tag.eq(request_addr.tag),
+            self.mem.tag_wr_en.eq(refill_finish),
+        ]
 
         return m
 
@@ -301,6 +282,9 @@ class ICacheMemory(Elaboratable):
     ways are separately exposed (as an array).
 
     The data memory is addressed using a machine word.
+
+    Valid bits are not stored in the tag memory, but in a register vector, so that
+    the whole cache can be invalidated in a single cycle by setting `flush`.
     """
 
     def __init__(self, params: ICacheParameters) -> None:
@@ -316,6 +300,8 @@ class ICacheMemory(Elaboratable):
         self.tag_wr_en = Signal()
         self.tag_wr_data = Record(self.tag_data_layout)
 
+        self.flush = Signal()
+
         self.data_addr_layout = [("index", self.params.index_bits), ("offset", self.params.offset_bits)]
 
         self.data_rd_addr = Record(self.data_addr_layout)
@@ -330,20 +316,36 @@ class ICacheMemory(Elaboratable):
         for i in range(self.params.num_of_ways):
             way_wr = self.way_wr_en[i]
 
-            tag_mem = Memory(width=len(self.tag_wr_data), depth=self.params.num_of_sets)
+            tag_mem = Memory(width=self.params.tag_bits, depth=self.params.num_of_sets)
             tag_mem_rp = tag_mem.read_port()
             tag_mem_wp = tag_mem.write_port()
             m.submodules[f"tag_mem_{i}_rp"] = tag_mem_rp
             m.submodules[f"tag_mem_{i}_wp"] = tag_mem_wp
 
             m.d.comb += [
-                assign(self.tag_rd_data[i], tag_mem_rp.data),
+                self.tag_rd_data[i].tag.eq(tag_mem_rp.data),
                 tag_mem_rp.addr.eq(self.tag_rd_index),
                 tag_mem_wp.addr.eq(self.tag_wr_index),
-                assign(tag_mem_wp.data, self.tag_wr_data),
+                tag_mem_wp.data.eq(self.tag_wr_data.tag),
                 tag_mem_wp.en.eq(self.tag_wr_en & way_wr),
             ]
 
+            # Valid bits are read with the same latency and transparency as the tag memory.
+            valid = Signal(self.params.num_of_sets)
+            valid_rd = Signal()
+            m.d.comb += self.tag_rd_data[i].valid.eq(valid_rd)
+
+            with m.If(self.flush):
+                m.d.sync += valid.eq(0)
+                m.d.sync += valid_rd.eq(0)
+            with m.Else():
+                with m.If(tag_mem_wp.en):
+                    m.d.sync += valid.bit_select(self.tag_wr_index, 1).eq(self.tag_wr_data.valid)
+                with m.If(tag_mem_wp.en & (self.tag_wr_index == self.tag_rd_index)):
+                    m.d.sync += valid_rd.eq(self.tag_wr_data.valid)
+                with m.Else():
+                    m.d.sync += valid_rd.eq(valid.bit_select(self.tag_rd_index, 1))
+
             data_mem = Memory(width=self.params.word_width, depth=self.params.num_of_sets * self.params.words_in_block)
             data_mem_rp = data_mem.read_port()
             data_mem_wp = data_mem.write_port()
@@ -1,3 +1,4 @@
+from typing import Optional
 from amaranth import *
 
 from transactron import Method, def_method, Transaction, TModule
@@ -26,7 +27,13 @@ class LSUDummyInternals(Elaboratable):
         Signals that `resultData` is valid.
     """
 
-    def __init__(self, gen_params: GenParams, bus: WishboneMaster, current_instr: Record) -> None:
+    def __init__(
+        self,
+        gen_params: GenParams,
+        bus: WishboneMaster,
+        current_instr: Record,
+        report_issue: Optional[Method] = None,
+    ) -> None:
         """
         Parameters
         ----------
@@ -36,13 +43,18 @@ class LSUDummyInternals(Elaboratable):
             An instance of the Wishbone master for interfacing with the data memory.
         current_instr : Record, in
             Reference to signal containing instruction currently processed by LSU.
+        report_issue : Method, optional
+            Called when the memory access starts, for the pipeline timeline.
         """
         self.gen_params = gen_params
         self.current_instr = current_instr
         self.bus = bus
+        self.report_issue = report_issue
 
         self.dependency_manager = self.gen_params.get(DependencyManager)
         self.report = self.dependency_manager.get_dependency(ExceptionReportKey())
+        if self.gen_params.retirement_trace:
+            self.retirement_trace = self.dependency_manager.get_dependency(RetirementTraceKey())
 
         self.loadedData = Signal(self.gen_params.isa.xlen)
         self.get_result_ack = Signal()
@@ -133,11 +145,15 @@ class LSUDummyInternals(Elaboratable):
                     with m.If(aligned):
                         with Transaction().body(m):
                             self.bus.request(m, addr=addr >> 2, we=~is_load, sel=bytes_mask, data=data)
+                            if self.report_issue is not None:
+                                self.report_issue(m, rob_id=self.current_instr.rob_id)
                             m.next = "End"
                     with m.Else():
                         with Transaction().body(m):
                             m.d.sync += self.op_exception.eq(1)
                             m.d.sync += self.result_ready.eq(1)
+                            if self.report_issue is not None:
+                                self.report_issue(m, rob_id=self.current_instr.rob_id)
 
                             cause = Mux(
                                 is_load, ExceptionCause.LOAD_ADDRESS_MISALIGNED, ExceptionCause.STORE_ADDRESS_MISALIGNED
@@ -152,6 +168,16 @@ class LSUDummyInternals(Elaboratable):
 
                     m.d.sync += self.loadedData.eq(self.postprocess_load_data(m, fetched.data, addr))
 
+                    if self.gen_params.retirement_trace:
+                        self.retirement_trace.report_mem(
+                            m,
+                            rob_id=self.current_instr.rob_id,
+                            mem_addr=addr & ~0b11,
+                            mem_rmask=Mux(is_load, bytes_mask, 0),
+                            mem_wmask=Mux(is_load, 0, bytes_mask),
+                            mem_data=Mux(is_load, fetched.data, data),
+                        )
+
                     with m.If(fetched.err):
                         cause = Mux(is_load, ExceptionCause.LOAD_ACCESS_FAULT, ExceptionCause.STORE_ACCESS_FAULT)
                         self.report(m, rob_id=self.current_instr.rob_id, cause=cause)
@@ -212,12 +238,19 @@ class LSUDummy(FuncBlock, Elaboratable):
 
         self.bus = bus
 
+        self.report_issue: Optional[Method] = None
+        if gen_params.pipeline_timeline:
+            retirement_trace = gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+            self.report_issue = retirement_trace.new_report_issue()
+
     def elaborate(self, platform):
         m = TModule()
         reserved = Signal()  # means that current_instr is reserved
         current_instr = Record(self.lsu_layouts.rs.data_layout + [("valid", 1)])
 
-        m.submodules.internal = internal = LSUDummyInternals(self.gen_params, self.bus, current_instr)
+        m.submodules.internal = internal = LSUDummyInternals(
+            self.gen_params, self.bus, current_instr, self.report_issue
+        )
 
         result_ready = internal.result_ready | ((current_instr.exec_fn.op_type == OpType.FENCE) & current_instr.valid)
 
@@ -57,6 +57,15 @@ class CoreConfiguration:
         Log of the cache line size (in bytes).
     allow_partial_extensions: bool
         Allow partial support of extensions.
+    transaction_counters: bool
+        Enables transaction utilization counters, readable through custom CSRs
+        (see `TransactionCountersCSR`).
+    retirement_trace: bool
+        Enables the retirement trace port (see `RetirementTrace`), which reports the
+        retired instructions with their results, for commit logs.
+    pipeline_timeline: bool
+        Adds to the retirement trace port the cycles in which the instruction
+        passed the pipeline stages, for pipeline viewers. Implies `retirement_trace`.
     _implied_extensions: Extenstion
         Bit flag specifing enabled extenstions that are not specified by func_units_config. Used in internal tests.
     """
@@ -78,6 +87,11 @@ class CoreConfiguration:
 
     allow_partial_extensions: bool = False
 
+    transaction_counters: bool = False
+
+    retirement_trace: bool = False
+    pipeline_timeline: bool = False
+
     _implied_extensions: Extension = Extension(0)
 
     def replace(self, **kwargs):
@@ -8,6 +8,7 @@ from coreblocks.peripherals.wishbone import WishboneMaster
 
 if TYPE_CHECKING:
     from coreblocks.structs_common.csr_generic import GenericCSRRegisters  # noqa: F401
+    from coreblocks.structs_common.retirement_trace import RetirementTrace  # noqa: F401
 
 __all__ = [
     "WishboneDataKey",
@@ -15,6 +16,8 @@ __all__ = [
     "BranchResolvedKey",
     "ExceptionReportKey",
     "GenericCSRRegistersKey",
+    "RFIssueReadKey",
+    "RetirementTraceKey",
 ]
 
 
@@ -41,3 +44,13 @@ class ExceptionReportKey(SimpleKey[Method]):
 @dataclass(frozen=True)
 class GenericCSRRegistersKey(SimpleKey["GenericCSRRegisters"]):
     pass
+
+
+@dataclass(frozen=True)
+class RFIssueReadKey(SimpleKey[tuple[Method, Method]]):
+    pass
+
+
+@dataclass(frozen=True)
+class RetirementTraceKey(SimpleKey["RetirementTrace"]):
+    pass
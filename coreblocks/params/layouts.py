@@ -18,6 +18,7 @@ __all__ = [
     "LSULayouts",
     "CSRLayouts",
     "ICacheLayouts",
+    "RetirementTraceLayouts",
 ]
 
 
@@ -184,6 +185,9 @@ class SchedulerLayouts:
 
         self.free_rf_layout: LayoutList = [fields.reg_id]
 
+        self.free_rf_state: LayoutList = [("free", 2**gen_params.phys_regs_bits)]
+        """Free physical registers, as a bit vector indexed by the register number."""
+
 
 class RFLayouts:
     """Layouts used in the register file."""
@@ -237,9 +241,6 @@ class ROBLayouts:
         self.rob_data: LayoutListField = ("rob_data", self.data_layout)
         """Data stored in a reorder buffer entry."""
 
-        self.done: LayoutListField = ("done", 1)
-        """Instruction has executed, but is not committed yet."""
-
         self.start: LayoutListField = ("start", gen_params.rob_entries_bits)
         """Index of the first (the earliest) entry in the reorder buffer."""
 
@@ -248,12 +249,6 @@ class ROBLayouts:
 
         self.id_layout: LayoutList = [fields.rob_id]
 
-        self.internal_layout: LayoutList = [
-            self.rob_data,
-            self.done,
-            fields.exception,
-        ]
-
         self.mark_done_layout: LayoutList = [
             fields.rob_id,
             fields.exception,
@@ -331,7 +326,7 @@ class RetirementLayouts:
 class RSLayouts:
     """Layouts used in the reservation station."""
 
-    def __init__(self, gen_params: GenParams, *, rs_entries_bits: int):
+    def __init__(self, gen_params: GenParams, *, rs_entries_bits: int, dataless: bool = False):
         data = gen_params.get(RSFullDataLayout)
 
         self.ready_list: LayoutListField = ("ready_list", 2**rs_entries_bits)
@@ -345,11 +340,11 @@ class RSLayouts:
                 "rp_dst",
                 "rob_id",
                 "exec_fn",
-                "s1_val",
-                "s2_val",
                 "imm",
                 "pc",
-            },
+            }
+            # Data-less stations keep only the source register numbers and read the values at issue.
+            | ({"rp_s1_reg", "rp_s2_reg"} if dataless else {"s1_val", "s2_val"}),
         )
 
         self.rs = gen_params.get(RSInterfaceLayouts, rs_entries_bits=rs_entries_bits, data_layout=data_layout)
@@ -420,6 +415,12 @@ class FetchLayouts:
             self.rvc,
         ]
 
+        if gen_params.pipeline_timeline:
+            self.fetch_timestamp: LayoutListField = ("fetch", gen_params.get(RetirementTraceLayouts).timestamp_bits)
+            """Cycle in which the instruction was fetched, for the retirement trace."""
+
+            self.raw_instr.append(self.fetch_timestamp)
+
         self.branch_verify: LayoutList = [
             ("from_pc", gen_params.isa.xlen),
             ("next_pc", gen_params.isa.xlen),
@@ -579,3 +580,70 @@ class ExceptionRegisterLayouts:
         ]
 
         self.report = self.get
+
+
+class RetirementTraceLayouts:
+    """Layouts used in the retirement trace."""
+
+    def __init__(self, gen_params: GenParams):
+        fields = gen_params.get(CommonLayoutFields)
+        mask_width = gen_params.isa.xlen // gen_params.wb_params.granularity
+
+        self.rd_data: LayoutListField = ("rd_data", gen_params.isa.xlen)
+        """Value written to the destination register."""
+
+        self.mem_addr: LayoutListField = ("mem_addr", gen_params.isa.xlen)
+        """Word-aligned address of the memory access."""
+
+        self.mem_rmask: LayoutListField = ("mem_rmask", mask_width)
+        """Bytes of the word read from the memory."""
+
+        self.mem_wmask: LayoutListField = ("mem_wmask", mask_width)
+        """Bytes of the word written to the memory."""
+
+        self.mem_data: LayoutListField = ("mem_data", gen_params.isa.xlen)
+        """Word read from or written to the memory."""
+
+        self.valid: LayoutListField = ("valid", 1)
+        """An instruction was retired in the previous cycle."""
+
+        self.stages = ["fetch", "decode", "rename", "dispatch", "issue", "writeback", "retire"]
+        """Pipeline stages in the timeline, in order."""
+
+        self.timestamp_bits = 32
+
+        self.timeline: LayoutListField = ("timeline", [(stage, self.timestamp_bits) for stage in self.stages])
+        """Cycles in which the instruction passed the pipeline stages, modulo `2**timestamp_bits`."""
+
+        self.report_instr: LayoutList = [fields.instr]
+
+        if gen_params.pipeline_timeline:
+            self.report_instr.append(("fetch", self.timestamp_bits))
+
+        self.report_dispatch: LayoutList = [fields.rob_id]
+
+        self.report_issue: LayoutList = [fields.rob_id]
+
+        self.report_alloc: LayoutList = [fields.rob_id, fields.pc]
+
+        self.report_result: LayoutList = [fields.rob_id, self.rd_data]
+
+        self.report_mem: LayoutList = [fields.rob_id, self.mem_addr, self.mem_rmask, self.mem_wmask, self.mem_data]
+
+        self.retire: LayoutList = [fields.rob_id, fields.rl_dst, fields.exception]
+
+        self.trace: LayoutList = [
+            self.valid,
+            fields.pc,
+            fields.instr,
+            fields.rl_dst,
+            self.rd_data,
+            self.mem_addr,
+            self.mem_rmask,
+            self.mem_wmask,
+            self.mem_data,
+            fields.exception,
+        ]
+
+        if gen_params.pipeline_timeline:
+            self.trace.append(self.timeline)
@@ -4,7 +4,7 @@ from amaranth import *
 
 from transactron import Method, Transaction, TModule
 from transactron.lib import FIFO, Forwarder
-from coreblocks.params import SchedulerLayouts, GenParams, OpType
+from coreblocks.params import SchedulerLayouts, GenParams, OpType, DependencyManager, RetirementTraceKey
 from transactron.utils import assign, AssignType
 from coreblocks.utils.protocols import FuncBlock
 
@@ -114,6 +114,10 @@ class Renaming(Elaboratable):
             m.d.comb += data_out.regs_p.rp_s2.eq(renamed_regs.rp_s2)
             self.push_instr(m, data_out)
 
+            if self.gen_params.pipeline_timeline:
+                retirement_trace = self.gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+                retirement_trace.report_rename(m)
+
         return m
 
 
@@ -166,6 +170,10 @@ class ROBAllocation(Elaboratable):
             m.d.comb += assign(data_out, instr, fields=AssignType.COMMON)
             m.d.comb += data_out.rob_id.eq(rob_id.rob_id)
 
+            if self.gen_params.retirement_trace:
+                retirement_trace = self.gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+                retirement_trace.report_alloc(m, rob_id=rob_id.rob_id, pc=instr.pc)
+
             self.push_instr(m, data_out)
 
         return m
@@ -333,6 +341,10 @@ class RSInsertion(Elaboratable):
                 with m.If(instr.rs_selected == i):
                     rs_insert(m, arg)
 
+            if self.gen_params.pipeline_timeline:
+                retirement_trace = self.gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+                retirement_trace.report_dispatch(m, rob_id=instr.rob_id)
+
         return m
 
 
@@ -1,6 +1,6 @@
 from amaranth import *
 
-from coreblocks.params import GenParams
+from coreblocks.params import GenParams, DependencyManager, RetirementTraceKey
 from transactron import Method, Transaction, TModule
 
 __all__ = ["ResultAnnouncement"]
@@ -41,6 +41,7 @@ class ResultAnnouncement(Elaboratable):
             Method which is invoked to save value which is an output of finished instruction to RF.
         """
 
+        self.gen_params = gen
         self.m_get_result = get_result
         self.m_rob_mark_done = rob_mark_done
         self.m_rs_update = rs_update
@@ -56,6 +57,10 @@ class ResultAnnouncement(Elaboratable):
             result = self.m_get_result(m)
             self.m_rob_mark_done(m, rob_id=result.rob_id, exception=result.exception)
 
+            if self.gen_params.retirement_trace:
+                retirement_trace = self.gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+                retirement_trace.report_result(m, rob_id=result.rob_id, rd_data=result.result)
+
             with m.If(result.exception == 0):
                 self.m_rf_write_val(m, reg_id=result.rp_dst, reg_val=result.result)
                 with m.If(result.rp_dst != 0):
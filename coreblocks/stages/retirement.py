@@ -1,6 +1,6 @@
 from amaranth import *
 from coreblocks.params.dependencies import DependencyManager
-from coreblocks.params.keys import GenericCSRRegistersKey
+from coreblocks.params.keys import GenericCSRRegistersKey, RetirementTraceKey
 
 from transactron.core import Method, Transaction, TModule
 from coreblocks.params.genparams import GenParams
@@ -66,4 +66,10 @@ class Retirement(Elaboratable):
 
             self.instret_csr.increment(m)
 
+            if self.gen_params.retirement_trace:
+                retirement_trace = self.gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+                retirement_trace.retire(
+                    m, rob_id=rob_entry.rob_id, rl_dst=rob_entry.rob_data.rl_dst, exception=rob_entry.exception
+                )
+
         return m
@@ -1,10 +1,11 @@
 from collections.abc import Collection, Iterable
+from typing import Optional
 from amaranth import *
 from dataclasses import dataclass
 from coreblocks.params import *
 from coreblocks.structs_common.rs import RS
 from coreblocks.scheduler.wakeup_select import WakeupSelect
-from transactron import Method, TModule
+from transactron import Method, TModule, def_method
 from coreblocks.utils.protocols import FuncUnit, FuncBlock
 from transactron.lib import Collector
 
@@ -29,7 +30,13 @@ class RSFuncBlock(FuncBlock, Elaboratable):
         layout described by `FuncUnitLayouts`.
     """
 
-    def __init__(self, gen_params: GenParams, func_units: Iterable[tuple[FuncUnit, set[OpType]]], rs_entries: int):
+    def __init__(
+        self,
+        gen_params: GenParams,
+        func_units: Iterable[tuple[FuncUnit, set[OpType]]],
+        rs_entries: int,
+        rf_read: Optional[tuple[Method, Method]] = None,
+    ):
         """
         Parameters
         ----------
@@ -39,11 +46,15 @@ class RSFuncBlock(FuncBlock, Elaboratable):
             Functional units to be used by this module.
         rs_entries: int
             Number of entries in RS.
+        rf_read: tuple[Method, Method], optional
+            Register file read methods. If given, a data-less RS is used,
+            which reads the source operands when instructions are issued.
         """
         self.gen_params = gen_params
         self.rs_entries = rs_entries
         self.rs_entries_bits = (rs_entries - 1).bit_length()
-        self.rs_layouts = gen_params.get(RSLayouts, rs_entries_bits=self.rs_entries_bits)
+        self.rf_read = rf_read
+        self.rs_layouts = gen_params.get(RSLayouts, rs_entries_bits=self.rs_entries_bits, dataless=rf_read is not None)
         self.fu_layouts = gen_params.get(FuncUnitLayouts)
         self.func_units = list(func_units)
 
@@ -52,6 +63,10 @@ class RSFuncBlock(FuncBlock, Elaboratable):
         self.update = Method(i=self.rs_layouts.rs.update_in)
         self.get_result = Method(o=self.fu_layouts.accept)
 
+        if gen_params.pipeline_timeline:
+            retirement_trace = gen_params.get(DependencyManager).get_dependency(RetirementTraceKey())
+            self.report_issue = retirement_trace.new_report_issue()
+
     def elaborate(self, platform):
         m = TModule()
 
@@ -59,13 +74,25 @@ class RSFuncBlock(FuncBlock, Elaboratable):
             gen_params=self.gen_params,
             rs_entries=self.rs_entries,
             ready_for=(optypes for _, optypes in self.func_units),
+            rf_read=self.rf_read,
         )
 
+        take = self.rs.take
+        if self.gen_params.pipeline_timeline:
+            # Instructions are issued when they are taken from the RS.
+            take = Method.like(self.rs.take)
+
+            @def_method(m, take)
+            def _(arg):
+                row = self.rs.take(m, arg)
+                self.report_issue(m, rob_id=row.rob_id)
+                return row
+
         for n, (func_unit, _) in enumerate(self.func_units):
             wakeup_select = WakeupSelect(
                 gen_params=self.gen_params,
                 get_ready=self.rs.get_ready_list[n],
-                take_row=self.rs.take,
+                take_row=take,
                 issue=func_unit.issue,
             )
             m.submodules[f"func_unit_{n}"] = func_unit
@@ -85,10 +112,15 @@ class RSFuncBlock(FuncBlock, Elaboratable):
 class RSBlockComponent(BlockComponentParams):
     func_units: Collection[FunctionalComponentParams]
     rs_entries: int
+    dataless: bool = False
 
     def get_module(self, gen_params: GenParams) -> FuncBlock:
         modules = list((u.get_module(gen_params), u.get_optypes()) for u in self.func_units)
-        rs_unit = RSFuncBlock(gen_params=gen_params, func_units=modules, rs_entries=self.rs_entries)
+        rf_read = None
+        if self.dataless:
+            connections = gen_params.get(DependencyManager)
+            rf_read = connections.get_dependency(RFIssueReadKey())
+        rs_unit = RSFuncBlock(gen_params=gen_params, func_units=modules, rs_entries=self.rs_entries, rf_read=rf_read)
         return rs_unit
 
     def get_optypes(self) -> set[OpType]:
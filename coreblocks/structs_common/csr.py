@@ -9,7 +9,12 @@ from coreblocks.params.dependencies import DependencyManager, ListKey
 from coreblocks.params.fu_params import BlockComponentParams
 from coreblocks.params.layouts import FetchLayouts, FuncUnitLayouts, CSRLayouts
 from coreblocks.params.isa import Funct3, ExceptionCause
-from coreblocks.params.keys import BranchResolvedKey, ExceptionReportKey, InstructionPrecommitKey
+from coreblocks.params.keys import (
+    BranchResolvedKey,
+    ExceptionReportKey,
+    InstructionPrecommitKey,
+    RetirementTraceKey,
+)
 from coreblocks.params.optypes import OpType
 from coreblocks.utils.protocols import FuncBlock
 
@@ -202,6 +207,10 @@ class CSRUnit(FuncBlock, Elaboratable):
 
         self.regfile: dict[int, tuple[Method, Method]] = {}
 
+        if gen_params.pipeline_timeline:
+            retirement_trace = self.dependency_manager.get_dependency(RetirementTraceKey())
+            self.report_issue = retirement_trace.new_report_issue()
+
     def _create_regfile(self):
         # Fills `self.regfile` with `CSRRegister`s provided by `CSRListKey` depenecy.
         for csr in self.dependency_manager.get_dependency(CSRListKey()):
@@ -253,6 +262,9 @@ class CSRUnit(FuncBlock, Elaboratable):
 
         # Methods used within this Tranaction are CSRRegister internal _fu_(read|write) handlers which are always ready
         with Transaction().body(m, request=(ready_to_process & ~done)):
+            if self.gen_params.pipeline_timeline:
+                self.report_issue(m, rob_id=instr.rob_id)
+
             with m.Switch(instr.csr):
                 for csr_number, methods in self.regfile.items():
                     read, write = methods
@@ -5,7 +5,7 @@ from typing import Optional
 
 from coreblocks.params.genparams import GenParams
 from coreblocks.structs_common.csr import CSRRegister
-from transactron.core import Method, Transaction, def_method, TModule
+from transactron.core import Method, Transaction, TransactionContext, def_method, TModule
 
 
 class CSRAddress(IntEnum, shape=12):
@@ -16,6 +16,11 @@ class CSRAddress(IntEnum, shape=12):
     CYCLEH = 0xC80
     TIMEH = 0xC81
     INSTRETH = 0xC82
+    # Custom CSRs
+    TRANSACTION_COUNTER_SELECT = 0x8C0
+    TRANSACTION_COUNTER_CLEAR = 0x8C1
+    TRANSACTION_COUNTER_DATA = 0xCC0
+    TRANSACTION_COUNTER_DATAH = 0xCC1
 
 
 class DoubleCounterCSR(Elaboratable):
@@ -67,6 +72,62 @@ class DoubleCounterCSR(Elaboratable):
         return m
 
 
+class TransactionCountersCSR(Elaboratable):
+    """TransactionCountersCSR
+    Exposes the transaction utilization counters (see `UtilizationCounters`)
+    through custom CSRs. The index of the counter is written to the
+    `TRANSACTION_COUNTER_SELECT` register, and the value of the selected counter
+    can be then read from the read-only `TRANSACTION_COUNTER_DATA` (bits
+    `[isa.xlen-1 : 0]`) and `TRANSACTION_COUNTER_DATAH` (bits
+    `[2*isa.xlen-1 : isa.xlen]`) registers. The counters are `2*isa.xlen`
+    bits wide, so that they don't overflow in long runs. The two halves are
+    read in different cycles, so, like `CYCLE` and `CYCLEH`, a consistent
+    value is obtained by reading the high half again and retrying if it has
+    changed. The counter names, in index order, are available in the `names`
+    attribute of the `UtilizationCounters` interface of the `TransactionManager`.
+
+    A write of any value to the `TRANSACTION_COUNTER_CLEAR` register resets
+    all the counters to zero in the following cycle.
+
+    The counters are enabled in the `TransactionManager` of the current
+    `TransactionContext` when this module is elaborated.
+    """
+
+    def __init__(self, gen_params: GenParams):
+        """
+        Parameters
+        ----------
+        gen_params: GenParams
+            Core generation parameters.
+        """
+        self.gen_params = gen_params
+
+        self.select = CSRRegister(CSRAddress.TRANSACTION_COUNTER_SELECT, gen_params)
+        self.clear = CSRRegister(CSRAddress.TRANSACTION_COUNTER_CLEAR, gen_params)
+        self.data = CSRRegister(CSRAddress.TRANSACTION_COUNTER_DATA, gen_params)
+        self.data_high = CSRRegister(CSRAddress.TRANSACTION_COUNTER_DATAH, gen_params)
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        xlen = self.gen_params.isa.xlen
+
+        m.submodules.select = self.select
+        m.submodules.clear = self.clear
+        m.submodules.data = self.data
+        m.submodules.data_high = self.data_high
+
+        counters = TransactionContext.get().utilization_counters(width=2 * xlen)
+
+        with Transaction().body(m):
+            m.d.comb += counters.addr.eq(self.select.read(m).data)
+            m.d.comb += counters.clear.eq(self.clear.read(m).written)
+            self.data.write(m, data=counters.data[:xlen])
+            self.data_high.write(m, data=counters.data[xlen:])
+
+        return m
+
+
 class GenericCSRRegisters(Elaboratable):
     def __init__(self, gp: GenParams):
         self.csr_cycle = DoubleCounterCSR(gp, CSRAddress.CYCLE, CSRAddress.CYCLEH)
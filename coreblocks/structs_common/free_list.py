@@ -0,0 +1,97 @@
+from amaranth import *
+from amaranth.lib.coding import PriorityEncoder
+from transactron import Method, def_method, TModule
+from transactron.core import Priority
+from coreblocks.params import SchedulerLayouts, GenParams
+
+__all__ = ["FreeList"]
+
+
+class FreeList(Elaboratable):
+    """Free physical register list.
+
+    The set of free physical registers is kept as a bit vector. Each
+    allocation port has its own priority encoder, which selects the lowest
+    free register not selected by the preceding ports, so that all the
+    ports can allocate a register in the same cycle. After reset, all the
+    registers except register 0 are free.
+
+    Attributes
+    ----------
+    alloc: list[Method]
+        Allocation ports. Each one returns a free register, which stops
+        being free. Ready only if there is a free register for the port.
+    free: list[Method]
+        Deallocation ports. Each one marks the given register as free.
+    get_state: Method
+        Returns the current set of free registers, which can be later
+        passed to `restore` as a checkpoint.
+    restore: Method
+        Replaces the set of free registers in a single cycle. Has priority
+        over the `alloc` and `free` methods.
+    """
+
+    def __init__(self, gen_params: GenParams, *, alloc_ports: int = 1, free_ports: int = 1):
+        """
+        Parameters
+        ----------
+        gen_params: GenParams
+            Core generation parameters.
+        alloc_ports: int
+            Number of allocations possible in a single cycle.
+        free_ports: int
+            Number of deallocations possible in a single cycle.
+        """
+        self.gen_params = gen_params
+        layouts = gen_params.get(SchedulerLayouts)
+        self.count = 2**gen_params.phys_regs_bits
+
+        self.alloc = [Method(o=layouts.free_rf_layout) for _ in range(alloc_ports)]
+        self.free = [Method(i=layouts.free_rf_layout) for _ in range(free_ports)]
+        self.get_state = Method(o=layouts.free_rf_state, nonexclusive=True)
+        self.restore = Method(i=layouts.free_rf_state)
+
+        # all registers except r0 are free at reset
+        self.free_vector = Signal(self.count, reset=(1 << self.count) - 2)
+
+        for method in self.alloc + self.free:
+            self.restore.add_conflict(method, Priority.LEFT)
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        alloc_mask = Signal(self.count)
+        free_mask = Signal(self.count)
+
+        available = self.free_vector
+        for i, alloc in enumerate(self.alloc):
+            m.submodules[f"enc_alloc_{i}"] = enc = PriorityEncoder(self.count)
+            m.d.comb += enc.i.eq(available)
+            selected = Signal(self.count, name=f"selected_{i}")
+            m.d.comb += selected.eq(Mux(enc.n, 0, 1 << enc.o))
+
+            @def_method(m, alloc, ready=~enc.n)
+            def _():
+                m.d.comb += alloc_mask.bit_select(enc.o, 1).eq(1)
+                return enc.o
+
+            available = available & ~selected
+
+        for free in self.free:
+
+            @def_method(m, free)
+            def _(reg_id: Value):
+                m.d.comb += free_mask.bit_select(reg_id, 1).eq(1)
+
+        @def_method(m, self.get_state)
+        def _():
+            return self.free_vector
+
+        @def_method(m, self.restore)
+        def _(free: Value):
+            m.d.sync += self.free_vector.eq(free)
+
+        with m.If(~self.restore.run):
+            m.d.sync += self.free_vector.eq((self.free_vector & ~alloc_mask) | free_mask)
+
+        return m
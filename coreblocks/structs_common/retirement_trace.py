@@ -0,0 +1,244 @@
+from amaranth import *
+
+from coreblocks.params import GenParams, RetirementTraceLayouts
+from coreblocks.params.dependencies import DependencyManager
+from coreblocks.params.keys import RetirementTraceKey
+from transactron import Method, TModule, def_method
+from transactron.lib import FIFO
+from transactron.utils import assign, AssignType
+
+__all__ = ["RetirementTrace"]
+
+
+class RetirementTrace(Elaboratable):
+    """Trace of the retired instructions, in the style of the RISC-V Formal Interface.
+
+    The pipeline stages report what they learn about an instruction, and the
+    reports are stored in tables indexed by the ROB entry of the instruction.
+    When the instruction retires, the collected information is presented on
+    the `trace` port for one cycle.
+
+    The raw instruction is known only to the decoder, before a ROB entry is
+    allocated. The instructions between the decoder and the ROB allocation
+    are not reordered nor dropped, so they are passed in a FIFO. Compressed
+    instructions are reported after expansion.
+
+    The module is present in the core only if `retirement_trace` is enabled
+    in the core configuration.
+
+    With `pipeline_timeline` enabled, the trace also contains the cycles in
+    which the instruction was fetched, decoded, renamed, dispatched to a
+    reservation station, issued to a functional unit, written back and
+    retired. The fetch cycle is passed with the instruction through
+    `fifo_fetch` and reported by the decoder, so the instructions written to
+    `fifo_fetch` by other modules (e.g. injected by tests) are traced with
+    the fetch cycle supplied by the writer. The instructions pass through the
+    rename stage in order, so its cycles are collected in a FIFO mirroring the
+    buffer after the renaming step of the scheduler.
+
+    Attributes
+    ----------
+    trace: Record, out
+        The retired instruction. Uses `RetirementTraceLayouts.trace`.
+    report_instr: Method
+        Called by the decoder. Uses `RetirementTraceLayouts.report_instr`.
+    report_alloc: Method
+        Called when a ROB entry is allocated. Uses `RetirementTraceLayouts.report_alloc`.
+    report_result: Method
+        Called when the result of an instruction is announced. Uses `RetirementTraceLayouts.report_result`.
+    report_mem: Method
+        Called when a memory access finishes. Uses `RetirementTraceLayouts.report_mem`.
+    retire: Method
+        Called at retirement. Uses `RetirementTraceLayouts.retire`.
+    report_rename: Method
+        Called when an instruction is renamed. Present only with `pipeline_timeline`.
+    report_dispatch: Method
+        Called when an instruction is inserted to a reservation station. Uses
+        `RetirementTraceLayouts.report_dispatch`. Present only with `pipeline_timeline`.
+    report_issue: list[Method]
+        Called when an instruction is issued to a functional unit, one method
+        for each functional block (see `new_report_issue`). Use
+        `RetirementTraceLayouts.report_issue`.
+    timestamp: Signal
+        Cycle counter used in the timeline.
+    """
+
+    # Decode stage FIFO and the buffers between the scheduler steps before the ROB allocation.
+    instr_fifo_depth = 6
+    # Mirrors the buffer after the renaming step of the scheduler.
+    rename_fifo_depth = 2
+
+    def __init__(self, gen_params: GenParams):
+        """
+        Parameters
+        ----------
+        gen_params: GenParams
+            Core generation parameters.
+        """
+        self.gen_params = gen_params
+        self.layouts = gen_params.get(RetirementTraceLayouts)
+
+        self.trace = Record(self.layouts.trace, name="retirement_trace")
+
+        self.report_instr = Method(i=self.layouts.report_instr)
+        self.report_alloc = Method(i=self.layouts.report_alloc)
+        self.report_result = Method(i=self.layouts.report_result)
+        self.report_mem = Method(i=self.layouts.report_mem)
+        self.retire = Method(i=self.layouts.retire)
+
+        if gen_params.pipeline_timeline:
+            self.report_rename = Method()
+            self.report_dispatch = Method(i=self.layouts.report_dispatch)
+        self.report_issue: list[Method] = []
+
+        self.timestamp = Signal(self.layouts.timestamp_bits)
+
+        gen_params.get(DependencyManager).add_dependency(RetirementTraceKey(), self)
+
+    def new_report_issue(self) -> Method:
+        """Creates a method for reporting the issued instructions.
+
+        Every functional block calls its own method, so the blocks issuing
+        instructions in the same cycle don't conflict. The methods have to be
+        created before the module is elaborated.
+        """
+        method = Method(i=self.layouts.report_issue, name=f"report_issue_{len(self.report_issue)}")
+        self.report_issue.append(method)
+        return method
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        xlen = self.gen_params.isa.xlen
+        rob_entries = 2**self.gen_params.rob_entries_bits
+        timeline = self.gen_params.pipeline_timeline
+        timestamp_bits = self.layouts.timestamp_bits
+        mem_layout = [field for field in self.layouts.report_mem if field[0] != "rob_id"]
+        # Timestamps of the stages before the ROB allocation, passed with the instruction.
+        front_layout = [(stage, timestamp_bits) for stage in ["fetch", "decode", "rename"]] if timeline else []
+        # The fetch timestamp is a part of `report_instr`.
+        instr_layout = self.layouts.report_instr + front_layout[1:2]
+
+        m.submodules.instr_fifo = instr_fifo = FIFO(instr_layout, self.instr_fifo_depth)
+
+        # Tables written at arbitrary positions and read at the head of the ROB.
+        instrs = Memory(width=xlen + self.gen_params.isa.ilen + len(Record(front_layout)), depth=rob_entries)
+        results = Memory(width=xlen, depth=rob_entries)
+        accesses = Memory(width=len(Record(mem_layout)), depth=rob_entries)
+        # Set for the instructions which accessed the memory.
+        accessed = Signal(rob_entries)
+
+        m.submodules.instrs_read = instrs_read = instrs.read_port(domain="comb")
+        m.submodules.instrs_write = instrs_write = instrs.write_port()
+        m.submodules.results_read = results_read = results.read_port(domain="comb")
+        m.submodules.results_write = results_write = results.write_port()
+        m.submodules.accesses_read = accesses_read = accesses.read_port(domain="comb")
+        m.submodules.accesses_write = accesses_write = accesses.write_port()
+
+        m.d.sync += self.trace.valid.eq(self.retire.run)
+
+        if timeline:
+            m.d.sync += self.timestamp.eq(self.timestamp + 1)
+
+            m.submodules.rename_fifo = rename_fifo = FIFO(front_layout[2:], self.rename_fifo_depth)
+
+            dispatches = Memory(width=timestamp_bits, depth=rob_entries)
+            writebacks = Memory(width=timestamp_bits, depth=rob_entries)
+            issues = Memory(width=timestamp_bits, depth=rob_entries)
+
+            m.submodules.dispatches_read = dispatches_read = dispatches.read_port(domain="comb")
+            m.submodules.dispatches_write = dispatches_write = dispatches.write_port()
+            m.submodules.writebacks_read = writebacks_read = writebacks.read_port(domain="comb")
+            m.submodules.writebacks_write = writebacks_write = writebacks.write_port()
+            m.submodules.issues_read = issues_read = issues.read_port(domain="comb")
+
+            @def_method(m, self.report_rename)
+            def _():
+                rename_fifo.write(m, rename=self.timestamp)
+
+            @def_method(m, self.report_dispatch)
+            def _(rob_id):
+                m.d.top_comb += dispatches_write.addr.eq(rob_id)
+                m.d.top_comb += dispatches_write.data.eq(self.timestamp)
+                m.d.comb += dispatches_write.en.eq(1)
+
+            for i, report_issue in enumerate(self.report_issue):
+                issues_write = issues.write_port()
+                m.submodules[f"issues_write_{i}"] = issues_write
+
+                @def_method(m, report_issue)
+                def _(rob_id):
+                    m.d.top_comb += issues_write.addr.eq(rob_id)
+                    m.d.top_comb += issues_write.data.eq(self.timestamp)
+                    m.d.comb += issues_write.en.eq(1)
+
+        @def_method(m, self.report_instr)
+        def _(arg):
+            if timeline:
+                instr_fifo.write(m, instr=arg.instr, fetch=arg.fetch, decode=self.timestamp)
+            else:
+                instr_fifo.write(m, instr=arg.instr)
+
+        @def_method(m, self.report_alloc)
+        def _(rob_id, pc):
+            instr = instr_fifo.read(m)
+            front = Record(front_layout)
+            if timeline:
+                m.d.top_comb += assign(front, instr, fields={"fetch", "decode"})
+                m.d.top_comb += front.rename.eq(rename_fifo.read(m).rename)
+            m.d.top_comb += instrs_write.addr.eq(rob_id)
+            m.d.top_comb += instrs_write.data.eq(Cat(pc, instr.instr, front))
+            m.d.comb += instrs_write.en.eq(1)
+            m.d.sync += accessed.bit_select(rob_id, 1).eq(0)
+
+        @def_method(m, self.report_result)
+        def _(rob_id, rd_data):
+            m.d.top_comb += results_write.addr.eq(rob_id)
+            m.d.top_comb += results_write.data.eq(rd_data)
+            m.d.comb += results_write.en.eq(1)
+            if timeline:
+                m.d.top_comb += writebacks_write.addr.eq(rob_id)
+                m.d.top_comb += writebacks_write.data.eq(self.timestamp)
+                m.d.comb += writebacks_write.en.eq(1)
+
+        @def_method(m, self.report_mem)
+        def _(arg):
+            access = Record(mem_layout)
+            m.d.top_comb += assign(access, arg, fields=AssignType.COMMON)
+            m.d.top_comb += accesses_write.addr.eq(arg.rob_id)
+            m.d.top_comb += accesses_write.data.eq(access)
+            m.d.comb += accesses_write.en.eq(1)
+            m.d.sync += accessed.bit_select(arg.rob_id, 1).eq(1)
+
+        @def_method(m, self.retire)
+        def _(rob_id, rl_dst, exception):
+            m.d.top_comb += instrs_read.addr.eq(rob_id)
+            m.d.top_comb += results_read.addr.eq(rob_id)
+            m.d.top_comb += accesses_read.addr.eq(rob_id)
+
+            instr_fields = Record([("pc", xlen), ("instr", self.gen_params.isa.ilen)] + front_layout)
+            m.d.comb += instr_fields.eq(instrs_read.data)
+
+            m.d.sync += self.trace.pc.eq(instr_fields.pc)
+            m.d.sync += self.trace.instr.eq(instr_fields.instr)
+            m.d.sync += self.trace.rl_dst.eq(rl_dst)
+            m.d.sync += self.trace.rd_data.eq(Mux(rl_dst != 0, results_read.data, 0))
+            m.d.sync += self.trace.exception.eq(exception)
+
+            access = Record(mem_layout)
+            with m.If(accessed.bit_select(rob_id, 1)):
+                m.d.comb += access.eq(accesses_read.data)
+            m.d.sync += assign(self.trace, access, fields={"mem_addr", "mem_rmask", "mem_wmask", "mem_data"})
+
+            if timeline:
+                m.d.top_comb += dispatches_read.addr.eq(rob_id)
+                m.d.top_comb += issues_read.addr.eq(rob_id)
+                m.d.top_comb += writebacks_read.addr.eq(rob_id)
+
+                m.d.sync += assign(self.trace.timeline, instr_fields, fields={"fetch", "decode", "rename"})
+                m.d.sync += self.trace.timeline.dispatch.eq(dispatches_read.data)
+                m.d.sync += self.trace.timeline.issue.eq(issues_read.data)
+                m.d.sync += self.trace.timeline.writeback.eq(writebacks_read.data)
+                m.d.sync += self.trace.timeline.retire.eq(self.timestamp)
+
+        return m
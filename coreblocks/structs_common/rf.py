@@ -6,15 +6,49 @@ __all__ = ["RegisterFile"]
 
 
 class RegisterFile(Elaboratable):
+    """Physical register file.
+
+    Register values are kept in an Amaranth `Memory` with one write port
+    and one combinational read port per read method, so that synthesis can
+    map them to replicated distributed RAM instead of flip-flops and wide
+    multiplexers. Validity bits are written by both `write` and `free`,
+    so they are kept in a flat register vector.
+
+    Attributes
+    ----------
+    entries: Memory
+        Values of the physical registers.
+    valid: Signal
+        Validity bit vector, one bit for every physical register.
+    read1: Method
+        Reads a register value together with its validity bit.
+        The value written in the current cycle is forwarded.
+    read2: Method
+        Same as `read1`, uses a separate read port.
+    issue_read1: Method
+        Same as `read1`, uses a separate read port. Used by data-less
+        reservation stations to read operands when instructions are issued.
+    issue_read2: Method
+        Same as `issue_read1`, uses a separate read port.
+    write: Method
+        Writes a register value and marks the register as valid.
+        Writes to register 0 are ignored.
+    free: Method
+        Marks a register as invalid.
+    """
+
     def __init__(self, *, gen_params: GenParams):
         self.gen_params = gen_params
         layouts = gen_params.get(RFLayouts)
-        self.internal_layout = [("reg_val", gen_params.isa.xlen), ("valid", 1)]
         self.read_layout = layouts.rf_read_out
-        self.entries = Array(Record(self.internal_layout) for _ in range(2**gen_params.phys_regs_bits))
+        self.entries = Memory(width=gen_params.isa.xlen, depth=2**gen_params.phys_regs_bits)
+        # Register 0 is always valid and never changes its value.
+        self.valid = Signal(2**gen_params.phys_regs_bits, reset=1)
 
         self.read1 = Method(i=layouts.rf_read_in, o=layouts.rf_read_out)
         self.read2 = Method(i=layouts.rf_read_in, o=layouts.rf_read_out)
+        self.issue_read1 = Method(i=layouts.rf_read_in, o=layouts.rf_read_out)
+        self.issue_read2 = Method(i=layouts.rf_read_in, o=layouts.rf_read_out)
         self.write = Method(i=layouts.rf_write)
         self.free = Method(i=layouts.rf_free)
 
@@ -24,40 +58,34 @@ class RegisterFile(Elaboratable):
         being_written = Signal(self.gen_params.phys_regs_bits)
         written_value = Signal(self.gen_params.isa.xlen)
 
-        # Register 0 always valid (this field won't be updated in methods below) - not sure
-        # how to set 0th entry valid signal at initialization stage so doing it here instead
-        # with a 1-cycle delay. I believe this has to be in sync domain like every other
-        # RF entry or else bad things will happen.
-        m.d.sync += self.entries[0].valid.eq(1)
+        m.submodules.write_port = write_port = self.entries.write_port()
 
-        @def_method(m, self.read1)
-        def _(reg_id: Value):
-            forward = being_written == reg_id
-            return {
-                "reg_val": Mux(forward, written_value, self.entries[reg_id].reg_val),
-                "valid": Mux(forward, 1, self.entries[reg_id].valid),
-            }
+        for i, read in enumerate([self.read1, self.read2, self.issue_read1, self.issue_read2]):
+            m.submodules[f"read_port{i + 1}"] = read_port = self.entries.read_port(domain="comb")
 
-        @def_method(m, self.read2)
-        def _(reg_id: Value):
-            forward = being_written == reg_id
-            return {
-                "reg_val": Mux(forward, written_value, self.entries[reg_id].reg_val),
-                "valid": Mux(forward, 1, self.entries[reg_id].valid),
-            }
+            @def_method(m, read)
+            def _(reg_id: Value):
+                forward = being_written == reg_id
+                m.d.top_comb += read_port.addr.eq(reg_id)
+                return {
+                    "reg_val": Mux(forward, written_value, read_port.data),
+                    "valid": Mux(forward, 1, self.valid.bit_select(reg_id, 1)),
+                }
 
         @def_method(m, self.write)
         def _(reg_id: Value, reg_val: Value):
             zero_reg = reg_id == 0
             m.d.comb += being_written.eq(reg_id)
             m.d.comb += written_value.eq(Mux(zero_reg, 0, reg_val))
+            m.d.top_comb += write_port.addr.eq(reg_id)
+            m.d.top_comb += write_port.data.eq(reg_val)
             with m.If(~(zero_reg)):
-                m.d.sync += self.entries[reg_id].reg_val.eq(reg_val)
-                m.d.sync += self.entries[reg_id].valid.eq(1)
+                m.d.comb += write_port.en.eq(1)
+                m.d.sync += self.valid.bit_select(reg_id, 1).eq(1)
 
         @def_method(m, self.free)
         def _(reg_id: Value):
             with m.If(reg_id != 0):
-                m.d.sync += self.entries[reg_id].valid.eq(0)
+                m.d.sync += self.valid.bit_select(reg_id, 1).eq(0)
 
         return m
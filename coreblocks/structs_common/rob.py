@@ -13,7 +13,11 @@ class ReorderBuffer(Elaboratable):
         self.mark_done = Method(i=layouts.mark_done_layout)
         self.peek = Method(o=layouts.peek_layout, nonexclusive=True)
         self.retire = Method(o=layouts.retire_layout)
-        self.data = Array(Record(layouts.internal_layout) for _ in range(2**gen_params.rob_entries_bits))
+        # Entry data is written once at `put` and only read at the head, so it is kept in a memory.
+        # `done` and `exception` bits are written at arbitrary positions and are kept in flat vectors.
+        self.data = Memory(width=len(Record(layouts.data_layout)), depth=2**gen_params.rob_entries_bits)
+        self.done = Signal(2**gen_params.rob_entries_bits)
+        self.exception = Signal(2**gen_params.rob_entries_bits)
         self.get_indices = Method(o=layouts.get_indices, nonexclusive=True)
 
     def elaborate(self, platform):
@@ -25,30 +29,37 @@ class ReorderBuffer(Elaboratable):
         peek_possible = start_idx != end_idx
         put_possible = (end_idx + 1)[0 : len(end_idx)] != start_idx
 
+        m.submodules.read_port = read_port = self.data.read_port(domain="comb")
+        m.submodules.write_port = write_port = self.data.write_port()
+
+        m.d.comb += read_port.addr.eq(start_idx)
+
         @def_method(m, self.peek, ready=peek_possible)
         def _():
             return {
-                "rob_data": self.data[start_idx].rob_data,
+                "rob_data": read_port.data,
                 "rob_id": start_idx,
-                "exception": self.data[start_idx].exception,
+                "exception": self.exception.bit_select(start_idx, 1),
             }
 
-        @def_method(m, self.retire, ready=self.data[start_idx].done)
+        @def_method(m, self.retire, ready=self.done.bit_select(start_idx, 1))
         def _():
             m.d.sync += start_idx.eq(start_idx + 1)
-            m.d.sync += self.data[start_idx].done.eq(0)
+            m.d.sync += self.done.bit_select(start_idx, 1).eq(0)
             # TODO: because of a problem with mocking nonexclusive methods,
             # retire replicates functionality of peek
             return {
-                "rob_data": self.data[start_idx].rob_data,
+                "rob_data": read_port.data,
                 "rob_id": start_idx,
-                "exception": self.data[start_idx].exception,
+                "exception": self.exception.bit_select(start_idx, 1),
             }
 
         @def_method(m, self.put, ready=put_possible)
         def _(arg):
-            m.d.sync += self.data[end_idx].rob_data.eq(arg)
-            m.d.sync += self.data[end_idx].done.eq(0)
+            m.d.top_comb += write_port.addr.eq(end_idx)
+            m.d.top_comb += write_port.data.eq(arg)
+            m.d.comb += write_port.en.eq(1)
+            m.d.sync += self.done.bit_select(end_idx, 1).eq(0)
             m.d.sync += end_idx.eq(end_idx + 1)
             return end_idx
 
@@ -57,8 +68,8 @@ class ReorderBuffer(Elaboratable):
         # could mark fields in ROB as done when they shouldn't.
         @def_method(m, self.mark_done)
         def _(rob_id: Value, exception):
-            m.d.sync += self.data[rob_id].done.eq(1)
-            m.d.sync += self.data[rob_id].exception.eq(exception)
+            m.d.sync += self.done.bit_select(rob_id, 1).eq(1)
+            m.d.sync += self.exception.bit_select(rob_id, 1).eq(exception)
 
         @def_method(m, self.get_indices)
         def _():
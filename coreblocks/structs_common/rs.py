@@ -10,14 +10,45 @@ __all__ = ["RS"]
 
 
 class RS(Elaboratable):
+    """
+    Reservation station.
+
+    By default, every entry stores the values of the source operands, which
+    are filled in by `update` when they are announced. When `rf_read` is
+    given, the station is data-less: entries store only the source register
+    numbers and ready bits, `update` only compares tags, and the operand
+    values are read from the register file in `take`. This removes the
+    per-entry operand datapath, which allows for larger stations.
+    """
+
     def __init__(
-        self, gen_params: GenParams, rs_entries: int, ready_for: Optional[Iterable[Iterable[OpType]]] = None
+        self,
+        gen_params: GenParams,
+        rs_entries: int,
+        ready_for: Optional[Iterable[Iterable[OpType]]] = None,
+        rf_read: Optional[tuple[Method, Method]] = None,
     ) -> None:
+        """
+        Parameters
+        ----------
+        gen_params: GenParams
+            Core generation parameters.
+        rs_entries: int
+            Number of entries in RS.
+        ready_for: Iterable[Iterable[OpType]], optional
+            Groups of operation types, one `get_ready_list` method is created
+            for every group.
+        rf_read: tuple[Method, Method], optional
+            Register file read methods used to read the first and the second
+            source operand in `take`. If given, the RS is data-less. They use
+            `RFLayouts.rf_read_in` and `RFLayouts.rf_read_out`.
+        """
         ready_for = ready_for or ((op for op in OpType),)
         self.gen_params = gen_params
         self.rs_entries = rs_entries
         self.rs_entries_bits = (rs_entries - 1).bit_length()
-        self.layouts = gen_params.get(RSLayouts, rs_entries_bits=self.rs_entries_bits)
+        self.rf_read = rf_read
+        self.layouts = gen_params.get(RSLayouts, rs_entries_bits=self.rs_entries_bits, dataless=rf_read is not None)
         self.internal_layout = [
             ("rs_data", self.layouts.rs.data_layout),
             ("rec_full", 1),
@@ -75,20 +106,30 @@ class RS(Elaboratable):
                 with m.If(record.rec_full.bool()):
                     with m.If(record.rs_data.rp_s1 == reg_id):
                         m.d.sync += record.rs_data.rp_s1.eq(0)
-                        m.d.sync += record.rs_data.s1_val.eq(reg_val)
+                        if self.rf_read is None:
+                            m.d.sync += record.rs_data.s1_val.eq(reg_val)
 
                     with m.If(record.rs_data.rp_s2 == reg_id):
                         m.d.sync += record.rs_data.rp_s2.eq(0)
-                        m.d.sync += record.rs_data.s2_val.eq(reg_val)
+                        if self.rf_read is None:
+                            m.d.sync += record.rs_data.s2_val.eq(reg_val)
 
         @def_method(m, self.take, ready=take_possible)
         def _(rs_entry_id: Value) -> RecordDict:
             record = self.data[rs_entry_id]
             m.d.sync += record.rec_reserved.eq(0)
             m.d.sync += record.rec_full.eq(0)
+            if self.rf_read is None:
+                s1_val = record.rs_data.s1_val
+                s2_val = record.rs_data.s2_val
+            else:
+                # The values are in the register file since the tags were announced.
+                rf_read1, rf_read2 = self.rf_read
+                s1_val = rf_read1(m, reg_id=record.rs_data.rp_s1_reg).reg_val
+                s2_val = rf_read2(m, reg_id=record.rs_data.rp_s2_reg).reg_val
             return {
-                "s1_val": record.rs_data.s1_val,
-                "s2_val": record.rs_data.s2_val,
+                "s1_val": s1_val,
+                "s2_val": s2_val,
                 "rp_dst": record.rs_data.rp_dst,
                 "rob_id": record.rs_data.rob_id,
                 "exec_fn": record.rs_data.exec_fn,
@@ -0,0 +1,168 @@
+import dataclasses
+import hashlib
+import importlib
+import json
+import os
+from collections.abc import Callable, Mapping
+from enum import Enum
+from functools import cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Optional
+
+__all__ = ["ElaborationCache", "config_hash", "source_hash"]
+
+
+def _canonical(obj: Any) -> Any:
+    """Converts a configuration object to a JSON-serializable form."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, Enum):
+        return {"__class__": _class_name(obj), "value": _canonical(obj.value)}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(item) for item in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted((_canonical(item) for item in obj), key=json.dumps)
+    if isinstance(obj, Mapping):
+        return sorted(([_canonical(k), _canonical(v)] for k, v in obj.items()), key=json.dumps)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        fields = {field.name: _canonical(getattr(obj, field.name)) for field in dataclasses.fields(obj)}
+        return {"__class__": _class_name(obj), **fields}
+    if hasattr(obj, "__dict__") and not isinstance(obj, type) and not callable(obj):
+        return {"__class__": _class_name(obj), **{k: _canonical(v) for k, v in sorted(vars(obj).items())}}
+    raise TypeError(f"Cannot compute a stable hash of {obj!r}")
+
+
+def _class_name(obj: Any) -> str:
+    return f"{type(obj).__module__}.{type(obj).__qualname__}"
+
+
+def config_hash(*configs: Any) -> str:
+    """Computes a stable hash of configuration objects.
+
+    Dataclasses (e.g. `CoreConfiguration`), plain objects (e.g. functional
+    unit components), enums and collections are hashed by their class
+    names and contents, so the hash does not depend on object identity
+    or `PYTHONHASHSEED`.
+
+    Parameters
+    ----------
+    *configs: Any
+        Hashed configuration objects.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(json.dumps(_canonical(configs), sort_keys=True).encode()).hexdigest()
+
+
+@cache
+def source_hash(packages: tuple[str, ...] = ("coreblocks", "transactron")) -> str:
+    """Computes a hash of the Python sources of the given packages.
+
+    The hash also covers the installed Amaranth version, as it influences
+    the generated code. It is computed once per process.
+
+    Parameters
+    ----------
+    packages: tuple[str, ...]
+        Names of the hashed packages.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(version("amaranth").encode())
+    for package in packages:
+        module = importlib.import_module(package)
+        assert module.__file__ is not None
+        root = Path(module.__file__).parent
+        for path in sorted(root.rglob("*.py")):
+            digest.update(f"{package}/{path.relative_to(root).as_posix()}\0".encode())
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ElaborationCache:
+    """Content-addressed cache of elaboration results.
+
+    Stores generated text (e.g. Verilog or RTLIL) under a key computed
+    from the configuration and the sources of the `coreblocks` and
+    `transactron` packages. Any change to the configuration or to the
+    sources results in a different key. Everything else which influences
+    the result, e.g. the source of the script defining the toplevel module
+    and its ports, has to be passed as a part of the configuration, or
+    stale entries would be used. Entries are not removed automatically.
+
+    Attributes
+    ----------
+    directory: Path
+        Directory where the cache entries are stored.
+    """
+
+    def __init__(self, directory: Optional[str | Path] = None):
+        """
+        Parameters
+        ----------
+        directory: str or Path, optional
+            Cache directory. By default, `COREBLOCKS_CACHE_DIR` environment
+            variable is used if set, otherwise `coreblocks/elaboration`
+            subdirectory of the user cache directory.
+        """
+        if directory is None:
+            directory = os.environ.get("COREBLOCKS_CACHE_DIR")
+        if directory is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+            directory = Path(cache_home) / "coreblocks" / "elaboration"
+        self.directory = Path(directory)
+
+    def key(self, kind: str, *configs: Any) -> str:
+        """Computes the cache key.
+
+        Parameters
+        ----------
+        kind: str
+            Kind of the cached result, e.g. `verilog`. Results of different
+            kinds are stored under different keys.
+        *configs: Any
+            Configuration objects which influence the result, besides the
+            sources of the packages.
+        """
+        return f"{kind}-{config_hash(kind, *configs, source_hash())}"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.directory / key
+        if not path.exists():
+            return None
+        return path.read_text()
+
+    def put(self, key: str, value: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # write atomically, so that concurrent runs never see partial results
+        tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+        tmp_path.write_text(value)
+        tmp_path.replace(self.directory / key)
+
+    def get_or_generate(self, generate: Callable[[], str], kind: str, *configs: Any) -> str:
+        """Returns a cached result, or generates and caches it.
+
+        Parameters
+        ----------
+        generate: Callable[[], str]
+            Function which elaborates the design and returns the result.
+        kind: str
+            Kind of the cached result, see `key`.
+        *configs: Any
+            Configuration objects which influence the result.
+        """
+        key = self.key(kind, *configs)
+        value = self.get(key)
+        if value is None:
+            value = generate()
+            self.put(key, value)
+        return value
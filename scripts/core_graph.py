@@ -7,6 +7,13 @@ from argparse import ArgumentParser, FileType
 par = ArgumentParser()
 par.add_argument("-p", "--prune", action="store_true", help="ignore disconnected nodes")
 par.add_argument("-f", "--format", default="elk", nargs="?")
+par.add_argument(
+    "-d",
+    "--depth",
+    type=int,
+    metavar="N",
+    help="instead of the graph, output N transaction and method signals with the deepest estimated logic",
+)
 par.add_argument("ofile", type=FileType("w"))
 
 arg = par.parse_args()
@@ -18,6 +25,7 @@ from transactron.graph import TracingFragment  # noqa: E402
 from test.test_core import TestElaboratable  # noqa: E402
 from coreblocks.params.configurations import basic_core_config  # noqa: E402
 from transactron.core import TransactionModule  # noqa: E402
+from transactron.logic_depth import transaction_depths  # noqa: E402
 
 gp = GenParams(basic_core_config)
 elaboratable = TestElaboratable(gp)
@@ -31,6 +39,13 @@ while not hasattr(core, "transactionManager"):
 mgr = core.transactionManager  # type: ignore
 
 with arg.ofile as fp:
+    if arg.depth is not None:
+        for entry in transaction_depths(fragment, mgr)[: arg.depth]:
+            fp.write(f"{entry.depth:4} {entry.kind} {entry.name} {entry.signal}\n")
+            for signal_name in entry.path:
+                fp.write(f"       {signal_name}\n")
+        sys.exit(0)
+
     graph = mgr.visual_graph(fragment)
     if arg.prune:
         graph.prune()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+topdir = Path(__file__).parent.parent
+sys.path.insert(0, str(topdir))
+
+from amaranth import Elaboratable  # noqa: E402
+from transactron import Method, Transaction, TransactionManager, TModule, def_method  # noqa: E402
+from transactron.core import MethodMap, TransactionContext  # noqa: E402
+
+
+class SyntheticTransactions(Elaboratable):
+    """Synthetic transaction graph for elaboration benchmarks.
+
+    Transactions are divided into clusters. Transactions in a cluster are
+    connected by random simultaneity relations. In some clusters, two
+    transactions call the same method, which makes them independent, so
+    the transitivity computation has to explore alternative groups.
+    """
+
+    def __init__(self, manager: TransactionManager, size: int, cluster_size: int, seed: int):
+        self.manager = manager
+        self.size = size
+        self.cluster_size = cluster_size
+        self.seed = seed
+
+    def elaborate(self, platform):
+        m = TModule()
+        rand = random.Random(self.seed)
+
+        with TransactionContext(self.manager):
+            shared = [Method() for _ in range(self.size // self.cluster_size + 1)]
+            for method in shared:
+
+                @def_method(m, method)
+                def _():
+                    pass
+
+            transactions: list[Transaction] = []
+            for i in range(self.size):
+                cluster = i // self.cluster_size
+                with (transaction := Transaction()).body(m):
+                    # every tenth cluster has a pair of independent transactions
+                    if cluster % 10 == 0 and i % self.cluster_size in [0, self.cluster_size - 1]:
+                        shared[cluster](m)
+                transactions.append(transaction)
+
+            for i in range(self.size):
+                start = i - i % self.cluster_size
+                if i == start + self.cluster_size - 1:
+                    # avoid making independent transactions simultaneous
+                    start += 1
+                if i > start:
+                    transactions[i].simultaneous(transactions[rand.randrange(start, i)])
+
+        return m
+
+
+def benchmark(size: int, cluster_size: int, seed: int) -> dict[str, float]:
+    manager = TransactionManager()
+    SyntheticTransactions(manager, size, cluster_size, seed).elaborate(None)
+
+    start = time.perf_counter()
+    manager._simultaneous()
+    simultaneous_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TransactionManager._conflict_graph(MethodMap(manager.transactions))
+    conflict_graph_time = time.perf_counter() - start
+
+    return {"simultaneous": simultaneous_time, "conflict_graph": conflict_graph_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures elaboration time of the transaction manager.")
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 300, 1000, 3000],
+        help="Numbers of transactions in the synthetic graphs. Default: %(default)s",
+    )
+    parser.add_argument(
+        "-c",
+        "--cluster-size",
+        type=int,
+        default=8,
+        help="Size of simultaneous transaction clusters. Default: %(default)s",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed. Default: %(default)s")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark.json",
+        help="Selects output file to write information to. Default: %(default)s",
+    )
+
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        times = benchmark(size, args.cluster_size, args.seed)
+        for phase, value in times.items():
+            results.append({"name": f"{phase} ({size} transactions)", "unit": "s", "value": value})
+        print(f"{size} transactions: " + ", ".join(f"{phase}={value:.4f}s" for phase, value in times.items()))
+
+    with open(args.output, "w") as benchmark_file:
+        json.dump(results, benchmark_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
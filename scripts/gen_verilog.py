@@ -3,9 +3,11 @@
 import os
 import sys
 import argparse
+from pathlib import Path
+from typing import Literal, Optional
 
 from amaranth.build import Platform
-from amaranth.back import verilog
+from amaranth.back import verilog, rtlil
 from amaranth import Module, Elaboratable
 
 if __name__ == "__main__":
@@ -16,6 +18,8 @@ from coreblocks.params.genparams import GenParams
 from coreblocks.peripherals.wishbone import WishboneBus
 from coreblocks.core import Core
 from transactron import TransactionModule
+from transactron.profiler import ElaborationProfiler
+from coreblocks.utils.elaboration_cache import ElaborationCache
 from transactron.utils.utils import flatten_signals
 
 from coreblocks.params.configurations import *
@@ -34,22 +38,46 @@ class Top(Elaboratable):
         self.wb_instr = WishboneBus(self.gp.wb_params, name="wb_instr")
         self.wb_data = WishboneBus(self.gp.wb_params, name="wb_data")
 
+        self.core = Core(gen_params=self.gp, wb_instr_bus=self.wb_instr, wb_data_bus=self.wb_data)
+
     def elaborate(self, platform: Platform):
         m = Module()
         tm = TransactionModule(m)
 
-        m.submodules.c = Core(gen_params=self.gp, wb_instr_bus=self.wb_instr, wb_data_bus=self.wb_data)
+        m.submodules.c = self.core
 
         return tm
 
 
-def gen_verilog(core_config: CoreConfiguration, output_path):
+def gen_verilog(
+    core_config: CoreConfiguration,
+    output_path,
+    *,
+    format: Literal["verilog", "rtlil"] = "verilog",
+    cache: Optional[ElaborationCache] = None,
+):
     top = Top(GenParams(core_config))
+    signals = list(flatten_signals(top.wb_instr)) + list(flatten_signals(top.wb_data))
+    if core_config.retirement_trace or core_config.pipeline_timeline:
+        signals += list(flatten_signals(top.core.retirement_trace.trace))
+
+    def generate():
+        if format == "rtlil":
+            return rtlil.convert(top, ports=signals)
+        return verilog.convert(top, ports=signals, strip_internal_attrs=True)
+
+    if cache is None:
+        code = generate()
+    else:
+        # This script defines the toplevel and its ports, which aren't covered by the package sources.
+        script_source = Path(__file__).read_text()
+        port_names = [signal.name for signal in signals]
+        code = cache.get_or_generate(
+            generate, format, core_config, os.environ.get("AMARANTH_verbose"), script_source, port_names
+        )
 
     with open(output_path, "w") as f:
-        signals = list(flatten_signals(top.wb_instr)) + list(flatten_signals(top.wb_data))
-
-        f.write(verilog.convert(top, ports=signals, strip_internal_attrs=True))
+        f.write(code)
 
 
 def main():
@@ -74,6 +102,49 @@ def main():
         "-o", "--output", action="store", default="core.v", help="Output file path. Default: %(default)s"
     )
 
+    parser.add_argument(
+        "-f",
+        "--format",
+        action="store",
+        default="verilog",
+        choices=["verilog", "rtlil"],
+        help="Output format. RTLIL output can be used for simulation with CXXRTL. Default: %(default)s",
+    )
+
+    parser.add_argument(
+        "--retirement-trace",
+        action="store_true",
+        help="Enable the retirement trace port (`retirement_trace__*` signals), "
+        + "used for writing commit logs in simulation. Default: %(default)s",
+    )
+
+    parser.add_argument(
+        "--pipeline-timeline",
+        action="store_true",
+        help="Add the pipeline timeline to the retirement trace port (`retirement_trace__timeline__*` signals), "
+        + "used for writing pipeline timelines in simulation. Implies --retirement-trace. Default: %(default)s",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always elaborate the core, do not use the elaboration cache. Default: %(default)s",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--profile",
+        action="store",
+        help="Profile the elaboration and write the report to PROFILE.txt "
+        + "and the flamegraph input (folded stacks) to PROFILE.folded.",
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Measure memory allocations when profiling. Slows down the elaboration. Default: %(default)s",
+    )
+
     args = parser.parse_args()
 
     os.environ["AMARANTH_verbose"] = "true" if args.verbose else "false"
@@ -81,7 +152,24 @@ def main():
     if args.config not in str_to_coreconfig:
         raise KeyError(f"Unknown config '{args.config}'")
 
-    gen_verilog(str_to_coreconfig[args.config], args.output)
+    config = str_to_coreconfig[args.config]
+    if args.retirement_trace:
+        config = config.replace(retirement_trace=True)
+    if args.pipeline_timeline:
+        config = config.replace(pipeline_timeline=True)
+
+    if args.profile is None:
+        cache = None if args.no_cache else ElaborationCache()
+        gen_verilog(config, args.output, format=args.format, cache=cache)
+        return
+
+    with ElaborationProfiler(trace_memory=args.profile_memory) as profiler:
+        gen_verilog(config, args.output, format=args.format)
+
+    with open(args.profile + ".txt", "w") as f:
+        f.write(profiler.report() + "\n")
+    with open(args.profile + ".folded", "w") as f:
+        profiler.dump_flamegraph(f)
 
 
 if __name__ == "__main__":
@@ -8,21 +8,28 @@ import re
 import sys
 import os
 import subprocess
-from typing import Literal
+from dataclasses import replace
+from typing import Callable, Literal, Optional
 from pathlib import Path
 
 topdir = Path(__file__).parent.parent
 sys.path.insert(0, str(topdir))
 
 import test.regression.benchmark  # noqa: E402
+import test.regression.sampling  # noqa: E402
+from test.regression.common import SimulationBackend, run_in_pool  # noqa: E402
 from test.regression.pysim import PySimulation  # noqa: E402
+from test.regression.cxxrtl import CXXRTLSimulation, build_model  # noqa: E402
+from test.regression.iss import ISASimulation  # noqa: E402
+from test.regression.checkpoint import BOOT_ADDRESS  # noqa: E402
+from coreblocks.params.configurations import full_core_config  # noqa: E402
 
 
 def cd_to_topdir():
     os.chdir(str(topdir))
 
 
-def load_benchmarks():
+def load_benchmarks(include_slow: bool):
     all_tests = test.regression.benchmark.get_all_benchmark_names()
     if len(all_tests) == 0:
         res = subprocess.run(["make", "-C", "test/external/embench"])
@@ -49,10 +56,15 @@ def load_benchmarks():
         "tarfind",
     }
 
+    if include_slow:
+        return all_tests
+
     return list(set(all_tests) - exclude)
 
 
-def run_benchmarks_with_cocotb(benchmarks: list[str], traces: bool) -> bool:
+def run_benchmarks_with_cocotb(
+    benchmarks: list[str], traces: bool, native_memory: bool, timeline_dir: Optional[str]
+) -> bool:
     arglist = ["make", "-C", "test/regression/cocotb", "-f", "benchmark.Makefile", "--no-print-directory"]
 
     test_cases = ",".join(benchmarks)
@@ -61,22 +73,27 @@ def run_benchmarks_with_cocotb(benchmarks: list[str], traces: bool) -> bool:
     if traces:
         arglist += ["TRACES=1"]
 
+    if native_memory:
+        arglist += ["NATIVE_MEMORY=1"]
+
+    if timeline_dir is not None:
+        # The core has to be generated with the pipeline timeline, see `gen_verilog.py --pipeline-timeline`.
+        arglist += [f"TIMELINE_DIR={os.path.abspath(timeline_dir)}"]
+
     res = subprocess.run(arglist)
 
     return res.returncode == 0
 
 
-def run_benchmarks_with_pysim(benchmarks: list[str], traces: bool, verbose: bool) -> bool:
+def run_programs(benchmarks: list[str], run_program: Callable[[str], None], verbose: bool, jobs: int) -> bool:
+    if jobs > 1:
+        return run_in_pool(benchmarks, run_program, jobs)
+
     suite = unittest.TestSuite()
 
     def _gen_test(test_name: str):
         def test_fn():
-            traces_file = None
-            if traces:
-                traces_file = "benchmark." + test_name
-            asyncio.run(
-                test.regression.benchmark.run_benchmark(PySimulation(verbose, traces_file=traces_file), test_name)
-            )
+            run_program(test_name)
 
         test_fn.__name__ = test_name
         test_fn.__qualname__ = test_name
@@ -92,11 +109,85 @@ def run_benchmarks_with_pysim(benchmarks: list[str], traces: bool, verbose: bool
     return result.wasSuccessful()
 
 
-def run_benchmarks(benchmarks: list[str], backend: Literal["pysim", "cocotb"], traces: bool, verbose: bool) -> bool:
+def run_benchmarks_in_process(
+    benchmarks: list[str], make_backend: Callable[[str], SimulationBackend], verbose: bool, jobs: int
+) -> bool:
+    def run_program(test_name: str):
+        asyncio.run(test.regression.benchmark.run_benchmark(make_backend(test_name), test_name))
+
+    return run_programs(benchmarks, run_program, verbose, jobs)
+
+
+def run_benchmarks_with_pysim(
+    benchmarks: list[str], traces: bool, verbose: bool, jobs: int, timeline_dir: Optional[str]
+) -> bool:
+    def timeline_file(test_name: str) -> Optional[str]:
+        if timeline_dir is None:
+            return None
+        return os.path.join(timeline_dir, f"{test_name}.pipeview")
+
+    # The simulator is elaborated once and reset for each program, unless traces are dumped.
+    backend = PySimulation(verbose, config=full_core_config.replace(pipeline_timeline=timeline_dir is not None))
+
+    def make_backend(test_name: str):
+        if traces:
+            return PySimulation(verbose, traces_file="benchmark." + test_name, timeline_file=timeline_file(test_name))
+        backend.timeline_file = timeline_file(test_name)
+        return backend
+
+    return run_benchmarks_in_process(benchmarks, make_backend, verbose, jobs)
+
+
+def run_sampled_benchmarks_with_pysim(benchmarks: list[str], sample: list[int], verbose: bool, jobs: int) -> bool:
+    # The core boots from the stub injecting the checkpoints.
+    backend = PySimulation(verbose, config=replace(full_core_config, start_pc=BOOT_ADDRESS))
+
+    def run_program(test_name: str):
+        asyncio.run(test.regression.sampling.run_sampled_benchmark(backend, test_name, *sample))
+
+    return run_programs(benchmarks, run_program, verbose, jobs)
+
+
+def run_benchmarks_with_cxxrtl(benchmarks: list[str], traces: bool, verbose: bool, jobs: int) -> bool:
+    if traces:
+        print("Dumping waveforms is not supported by the CXXRTL backend")
+
+    if not build_model():
+        print("Couldn't build the CXXRTL model")
+        return False
+
+    return run_benchmarks_in_process(benchmarks, lambda _: CXXRTLSimulation(verbose), verbose, jobs)
+
+
+def run_benchmarks(
+    benchmarks: list[str],
+    backend: Literal["pysim", "cocotb", "cocotb-native", "cxxrtl", "iss"],
+    traces: bool,
+    verbose: bool,
+    jobs: int,
+    sample: Optional[list[int]] = None,
+    timeline_dir: Optional[str] = None,
+) -> bool:
+    if timeline_dir is not None and (backend not in ["pysim", "cocotb"] or sample is not None):
+        print("Pipeline timelines are supported only by the pysim and cocotb backends, without sampling")
+        return False
+
+    if sample is not None:
+        if backend != "pysim":
+            print("Sampled simulation is supported only by the pysim backend")
+            return False
+        return run_sampled_benchmarks_with_pysim(benchmarks, sample, verbose, jobs)
+
     if backend == "cocotb":
-        return run_benchmarks_with_cocotb(benchmarks, traces)
+        return run_benchmarks_with_cocotb(benchmarks, traces, False, timeline_dir)
+    elif backend == "cocotb-native":
+        return run_benchmarks_with_cocotb(benchmarks, traces, True, None)
     elif backend == "pysim":
-        return run_benchmarks_with_pysim(benchmarks, traces, verbose)
+        return run_benchmarks_with_pysim(benchmarks, traces, verbose, jobs, timeline_dir)
+    elif backend == "cxxrtl":
+        return run_benchmarks_with_cxxrtl(benchmarks, traces, verbose, jobs)
+    elif backend == "iss":
+        return run_benchmarks_in_process(benchmarks, lambda _: ISASimulation(verbose), verbose, jobs)
     return False
 
 
@@ -105,18 +196,51 @@ def main():
     parser.add_argument("-l", "--list", action="store_true", help="List all benchmarks")
     parser.add_argument("-t", "--trace", action="store_true", help="Dump waveforms")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
-    parser.add_argument("-b", "--backend", default="cocotb", choices=["cocotb", "pysim"], help="Simulation backend")
+    parser.add_argument(
+        "-b",
+        "--backend",
+        default="cocotb",
+        choices=["cocotb", "cocotb-native", "cxxrtl", "pysim", "iss"],
+        help="Simulation backend. The cocotb-native and cxxrtl backends serve memory requests from C++ code, "
+        + "which is fast enough to run all the benchmarks. The iss backend runs the functional simulator, "
+        + "which has no timing (one instruction per cycle).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=len(os.sched_getaffinity(0)),
+        help="Number of processes running benchmarks with the pysim and cxxrtl backends. Default: %(default)s",
+    )
     parser.add_argument(
         "-o",
         "--output",
         default="benchmark.json",
         help="Selects output file to write information to. Default: %(default)s",
     )
+    parser.add_argument(
+        "-s",
+        "--sample",
+        nargs=3,
+        type=int,
+        metavar=("SKIP", "WARMUP", "LENGTH"),
+        help="Measure LENGTH instructions of every benchmark in the pysim backend, after fast-forwarding SKIP "
+        + "instructions in the functional simulator and warming up the core with WARMUP instructions. "
+        + "This allows measuring the slow benchmarks.",
+    )
+    parser.add_argument(
+        "--timeline",
+        metavar="DIR",
+        help="Write the pipeline timelines of the benchmarks to the directory, in the O3PipeView format "
+        + "read by Konata (pysim and cocotb backends only)",
+    )
     parser.add_argument("benchmark_name", nargs="?")
 
     args = parser.parse_args()
 
-    benchmarks = load_benchmarks()
+    benchmarks = load_benchmarks(
+        include_slow=args.backend in ["cocotb-native", "cxxrtl", "iss"] or args.sample is not None
+    )
 
     if args.list:
         for name in benchmarks:
@@ -131,7 +255,7 @@ def main():
             print(f"Could not find benchmark '{args.benchmark_name}'")
             sys.exit(1)
 
-    success = run_benchmarks(benchmarks, args.backend, args.trace, args.verbose)
+    success = run_benchmarks(benchmarks, args.backend, args.trace, args.verbose, args.jobs, args.sample, args.timeline)
     if not success:
         print("Benchmark execution failed")
         sys.exit(1)
@@ -15,7 +15,7 @@ import test.regression.signature  # noqa: E402
 from test.regression.pysim import PySimulation  # noqa: E402
 
 
-def run_with_cocotb(test_name: str, traces: bool, output: str) -> bool:
+def run_with_cocotb(test_name: str, traces: bool, native_memory: bool, output: str) -> bool:
     arglist = [
         "make",
         "-C",
@@ -34,6 +34,9 @@ def run_with_cocotb(test_name: str, traces: bool, output: str) -> bool:
     if traces:
         arglist += ["TRACES=1"]
 
+    if native_memory:
+        arglist += ["NATIVE_MEMORY=1"]
+
     subprocess.run(arglist)
 
     return os.path.isfile(output)  # completed successfully if signature file was created
@@ -53,9 +56,13 @@ def run_with_pysim(test_name: str, traces: bool, verbose: bool, output: str) ->
     return True
 
 
-def run_test(test: str, backend: Literal["pysim", "cocotb"], traces: bool, verbose: bool, output: str) -> bool:
+def run_test(
+    test: str, backend: Literal["pysim", "cocotb", "cocotb-native"], traces: bool, verbose: bool, output: str
+) -> bool:
     if backend == "cocotb":
-        return run_with_cocotb(test, traces, output)
+        return run_with_cocotb(test, traces, False, output)
+    elif backend == "cocotb-native":
+        return run_with_cocotb(test, traces, True, output)
     elif backend == "pysim":
         return run_with_pysim(test, traces, verbose, output)
     return False
@@ -65,7 +72,9 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--trace", action="store_true", help="Dump waveforms")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
-    parser.add_argument("-b", "--backend", default="pysim", choices=["cocotb", "pysim"], help="Simulation backend")
+    parser.add_argument(
+        "-b", "--backend", default="pysim", choices=["cocotb", "cocotb-native", "pysim"], help="Simulation backend"
+    )
     parser.add_argument("-o", "--output", default=None, help="Selects output file to write test signature to")
     parser.add_argument("path")
 
@@ -7,14 +7,18 @@ import re
 import sys
 import os
 import subprocess
-from typing import Literal
+from typing import Callable, Literal, Optional
 from pathlib import Path
 
 topdir = Path(__file__).parent.parent
 sys.path.insert(0, str(topdir))
 
 import test.regression.test  # noqa: E402
+from test.regression.common import SimulationBackend, run_in_pool  # noqa: E402
 from test.regression.pysim import PySimulation  # noqa: E402
+from coreblocks.params.configurations import full_core_config  # noqa: E402
+from test.regression.cxxrtl import CXXRTLSimulation, build_model  # noqa: E402
+from test.regression.iss import ISASimulation  # noqa: E402
 
 REGRESSION_TESTS_PREFIX = "test.regression."
 
@@ -53,7 +57,9 @@ def load_regression_tests() -> list[str]:
     return list(all_tests - exclude)
 
 
-def run_regressions_with_cocotb(tests: list[str], traces: bool) -> bool:
+def run_regressions_with_cocotb(
+    tests: list[str], traces: bool, native_memory: bool, commit_log_dir: Optional[str], timeline_dir: Optional[str]
+) -> bool:
     cpu_count = len(os.sched_getaffinity(0))
     arglist = ["make", "-C", "test/regression/cocotb", "-f", "test.Makefile", f"-j{cpu_count}"]
 
@@ -63,20 +69,36 @@ def run_regressions_with_cocotb(tests: list[str], traces: bool) -> bool:
     if traces:
         arglist += ["TRACES=1"]
 
+    if native_memory:
+        arglist += ["NATIVE_MEMORY=1"]
+
+    if commit_log_dir is not None:
+        # The core has to be generated with the retirement trace port, see `gen_verilog.py --retirement-trace`.
+        arglist += [f"COMMIT_LOG_DIR={os.path.abspath(commit_log_dir)}"]
+
+    if timeline_dir is not None:
+        # The core has to be generated with the pipeline timeline, see `gen_verilog.py --pipeline-timeline`.
+        arglist += [f"TIMELINE_DIR={os.path.abspath(timeline_dir)}"]
+
     res = subprocess.run(arglist)
 
     return res.returncode == 0
 
 
-def run_regressions_with_pysim(tests: list[str], traces: bool, verbose: bool) -> bool:
+def run_regressions_in_process(
+    tests: list[str], make_backend: Callable[[str], SimulationBackend], verbose: bool, jobs: int
+) -> bool:
+    def run_program(test_name: str):
+        asyncio.run(test.regression.test.run_test(make_backend(test_name), test_name))
+
+    if jobs > 1:
+        return run_in_pool(tests, run_program, jobs)
+
     suite = unittest.TestSuite()
 
     def _gen_test(test_name: str):
         def test_fn():
-            traces_file = None
-            if traces:
-                traces_file = REGRESSION_TESTS_PREFIX + test_name
-            asyncio.run(test.regression.test.run_test(PySimulation(verbose, traces_file=traces_file), test_name))
+            run_program(test_name)
 
         test_fn.__name__ = test_name
         test_fn.__qualname__ = test_name
@@ -92,11 +114,76 @@ def run_regressions_with_pysim(tests: list[str], traces: bool, verbose: bool) ->
     return result.wasSuccessful()
 
 
-def run_regression_tests(tests: list[str], backend: Literal["pysim", "cocotb"], traces: bool, verbose: bool) -> bool:
+def run_regressions_with_pysim(
+    tests: list[str],
+    traces: bool,
+    verbose: bool,
+    jobs: int,
+    commit_log_dir: Optional[str],
+    timeline_dir: Optional[str],
+) -> bool:
+    def output_file(directory: Optional[str], test_name: str, suffix: str) -> Optional[str]:
+        if directory is None:
+            return None
+        return os.path.join(directory, test_name + suffix)
+
+    # The simulator is elaborated once and reset for each program, unless traces are dumped.
+    config = full_core_config.replace(
+        retirement_trace=commit_log_dir is not None, pipeline_timeline=timeline_dir is not None
+    )
+    backend = PySimulation(verbose, config=config)
+
+    def make_backend(test_name: str):
+        commit_log_file = output_file(commit_log_dir, test_name, ".commitlog")
+        timeline_file = output_file(timeline_dir, test_name, ".pipeview")
+        if traces:
+            return PySimulation(
+                verbose,
+                traces_file=REGRESSION_TESTS_PREFIX + test_name,
+                commit_log_file=commit_log_file,
+                timeline_file=timeline_file,
+            )
+        backend.commit_log_file = commit_log_file
+        backend.timeline_file = timeline_file
+        return backend
+
+    return run_regressions_in_process(tests, make_backend, verbose, jobs)
+
+
+def run_regressions_with_cxxrtl(tests: list[str], traces: bool, verbose: bool, jobs: int) -> bool:
+    if traces:
+        print("Dumping waveforms is not supported by the CXXRTL backend")
+
+    if not build_model():
+        print("Couldn't build the CXXRTL model")
+        return False
+
+    return run_regressions_in_process(tests, lambda _: CXXRTLSimulation(verbose), verbose, jobs)
+
+
+def run_regression_tests(
+    tests: list[str],
+    backend: Literal["pysim", "cocotb", "cocotb-native", "cxxrtl", "iss"],
+    traces: bool,
+    verbose: bool,
+    jobs: int,
+    commit_log_dir: Optional[str] = None,
+    timeline_dir: Optional[str] = None,
+) -> bool:
+    if (commit_log_dir is not None or timeline_dir is not None) and backend not in ["pysim", "cocotb"]:
+        print(f"Commit logs and pipeline timelines are not supported by the {backend} backend")
+        return False
+
     if backend == "cocotb":
-        return run_regressions_with_cocotb(tests, traces)
+        return run_regressions_with_cocotb(tests, traces, False, commit_log_dir, timeline_dir)
+    elif backend == "cocotb-native":
+        return run_regressions_with_cocotb(tests, traces, True, None, None)
     elif backend == "pysim":
-        return run_regressions_with_pysim(tests, traces, verbose)
+        return run_regressions_with_pysim(tests, traces, verbose, jobs, commit_log_dir, timeline_dir)
+    elif backend == "cxxrtl":
+        return run_regressions_with_cxxrtl(tests, traces, verbose, jobs)
+    elif backend == "iss":
+        return run_regressions_in_process(tests, lambda _: ISASimulation(verbose), verbose, jobs)
     return False
 
 
@@ -107,7 +194,29 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     parser.add_argument("-a", "--all", action="store_true", default=False, help="Run all tests")
     parser.add_argument(
-        "-b", "--backend", default="cocotb", choices=["cocotb", "pysim"], help="Simulation backend for regression tests"
+        "-b",
+        "--backend",
+        default="cocotb",
+        choices=["cocotb", "cocotb-native", "cxxrtl", "pysim", "iss"],
+        help="Simulation backend for regression tests",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=len(os.sched_getaffinity(0)),
+        help="Number of processes running regression tests with the pysim and cxxrtl backends. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--commit-log",
+        metavar="DIR",
+        help="Write the commit logs of the regression tests to the directory (pysim and cocotb backends only)",
+    )
+    parser.add_argument(
+        "--timeline",
+        metavar="DIR",
+        help="Write the pipeline timelines of the regression tests to the directory, in the O3PipeView format "
+        + "read by Konata (pysim and cocotb backends only)",
     )
     parser.add_argument("-c", "--count", type=int, help="Start `c` first tests which match regexp")
     parser.add_argument("test_name", nargs="?")
@@ -144,7 +253,9 @@ def main():
 
     regression_tests_success = True
     if regression_tests:
-        regression_tests_success = run_regression_tests(regression_tests, args.backend, args.trace, args.verbose)
+        regression_tests_success = run_regression_tests(
+            regression_tests, args.backend, args.trace, args.verbose, args.jobs, args.commit_log, args.timeline
+        )
 
     sys.exit(not (unit_tests_success and regression_tests_success))
 
@@ -24,7 +24,8 @@ from coreblocks.fu.shift_unit import ShiftUnitComponent
 from coreblocks.fu.zbc import ZbcComponent
 from coreblocks.fu.zbs import ZbsComponent
 from transactron import TransactionModule
-from transactron.lib import AdapterBase, AdapterTrans
+from transactron.lib import AdapterBase, AdapterTrans, FIFO, Forwarder, Pipe
+from transactron.core import MethodLayout
 from coreblocks.peripherals.wishbone import WishboneArbiter, WishboneBus
 from constants.ecp5_platforms import (
     ResourceBuilder,
@@ -122,6 +123,22 @@ def unit_fu(unit_params: FunctionalComponentParams):
     return unit
 
 
+def unit_connector(connector_class: Callable[[MethodLayout], Elaboratable]):
+    def unit(gen_params: GenParams):
+        connector = connector_class([("data", gen_params.isa.xlen)])
+
+        write_connector, write_resources = AdapterConnector.with_resources(AdapterTrans(connector.write), 0)
+        read_connector, read_resources = AdapterConnector.with_resources(AdapterTrans(connector.read), 1)
+
+        resources = append_resources(write_resources, read_resources)
+
+        module = ModuleConnector(connector=connector, write_connector=write_connector, read_connector=read_connector)
+
+        return resources, TransactionModule(module)
+
+    return unit
+
+
 core_units = {
     "core": unit_core,
     "alu_basic": unit_fu(ALUComponent(False, False)),
@@ -134,6 +151,9 @@ core_units = {
     "shift_full": unit_fu(ShiftUnitComponent(True)),
     "zbs": unit_fu(ZbsComponent()),
     "zbc": unit_fu(ZbcComponent()),
+    "fifo": unit_connector(lambda layout: FIFO(layout, 2)),
+    "forwarder": unit_connector(Forwarder),
+    "pipe": unit_connector(Pipe),
 }
 
 
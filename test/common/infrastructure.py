@@ -3,7 +3,7 @@ import random
 import unittest
 import functools
 from contextlib import contextmanager, nullcontext
-from typing import TypeVar, Generic, Type, TypeGuard, Any, Union, Callable, cast
+from typing import TypeVar, Generic, Type, TypeGuard, Any, Union, Callable, Optional, cast
 from amaranth import *
 from amaranth.sim import *
 from .testbenchio import TestbenchIO
@@ -105,8 +105,8 @@ class PysimSimulator(Simulator):
         tested_module = test_module.tested_module
         super().__init__(test_module)
 
-        clk_period = 1e-6
-        self.add_clock(clk_period)
+        self.clk_period = 1e-6
+        self.add_clock(self.clk_period)
 
         if isinstance(tested_module, HasDebugSignals):
             extra_signals = tested_module.debug_signals
@@ -131,11 +131,24 @@ class PysimSimulator(Simulator):
         else:
             self.ctx = nullcontext()
 
-        self.deadline = clk_period * max_cycles
+        self.deadline = self.clk_period * max_cycles
 
-    def run(self) -> bool:
+    def run(self, max_cycles: Optional[float] = None) -> bool:
+        """Runs the simulation until all active processes finish.
+
+        Parameters
+        ----------
+        max_cycles: float, optional
+            Time limit in clock cycles. Overrides the limit given in the constructor.
+
+        Returns
+        -------
+        bool
+            False if the time limit was exceeded.
+        """
+        deadline = self.deadline if max_cycles is None else self.clk_period * max_cycles
         with self.ctx:
-            self.run_until(self.deadline)
+            self.run_until(deadline)
 
         return not self.advance()
 
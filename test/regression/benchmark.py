@@ -45,6 +45,14 @@ def get_all_benchmark_names():
     return os.listdir(embench_dir) if os.path.exists(embench_dir) else []
 
 
+def write_results(benchmark_name: str, cycles: int, instrs: int):
+    results = {"cycle": cycles, "instr": instrs}
+
+    os.makedirs(str(results_dir), exist_ok=True)
+    with open(f"{str(results_dir)}/{benchmark_name}.json", "w") as outfile:
+        json.dump(results, outfile)
+
+
 async def run_benchmark(sim_backend: SimulationBackend, benchmark_name: str):
     mmio = MMIO(lambda: sim_backend.stop())
 
@@ -62,8 +70,4 @@ async def run_benchmark(sim_backend: SimulationBackend, benchmark_name: str):
     if mmio.return_code() != 0:
         raise RuntimeError("The benchmark exited with a non-zero return code: %d" % mmio.return_code())
 
-    results = {"cycle": mmio.cycle_cnt(), "instr": mmio.instr_cnt()}
-
-    os.makedirs(str(results_dir), exist_ok=True)
-    with open(f"{str(results_dir)}/{benchmark_name}.json", "w") as outfile:
-        json.dump(results, outfile)
+    write_results(benchmark_name, mmio.cycle_cnt(), mmio.instr_cnt())
@@ -0,0 +1,118 @@
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from .memory import *
+from .iss import ISASimulator
+from .encoding import i_type, j_type, u_type
+
+from coreblocks.params.isa import Funct3, Opcode
+from coreblocks.structs_common.csr_generic import CSRAddress
+
+__all__ = ["Checkpoint", "BOOT_ADDRESS"]
+
+# The boot stub is placed just below the wrap-around of the address space,
+# where its final jump reaches the first megabyte of memory.
+BOOT_ADDRESS = 0xFFFFF000
+_BOOT_SEGMENT_SIZE = 0x1000
+
+# Checkpoint file header: magic, pc, mcause, integer registers.
+_header = struct.Struct("<4sII32I")
+_magic = b"CBCP"
+
+
+def _load_immediate(rd: int, value: int) -> list[int]:
+    lo = (value & 0xFFF) - ((value & 0x800) << 1)
+    hi = (value - lo) & 0xFFFFF000
+    return [u_type(Opcode.LUI, rd, hi), i_type(Opcode.OP_IMM, rd, Funct3.ADD, rd, lo)]
+
+
+@dataclass
+class Checkpoint:
+    """Architectural state of a program, for starting a simulation mid-program.
+
+    The state is injected into the core by a boot stub, which the core runs
+    from reset: it loads `mcause` and the integer registers with immediates,
+    and then jumps to `pc`. The stub runs from a separate segment, so the core
+    has to be configured with its address as `start_pc`.
+
+    The `cycle`, `time` and `instret` counters are read-only in the core, so
+    they restart from zero. The caches and branch predictors are cold after
+    the stub, so the instructions right after the checkpoint should be used
+    for warming them up, and not measured.
+
+    Attributes
+    ----------
+    pc: int
+        Address of the next instruction.
+    regs: list[int]
+        Values of the integer registers.
+    mcause: int
+        Value of the `mcause` register.
+    segments: list[RandomAccessMemory]
+        Contents of the memory.
+    """
+
+    pc: int
+    regs: list[int]
+    mcause: int
+    segments: list[RandomAccessMemory]
+
+    @staticmethod
+    def from_simulator(sim: ISASimulator) -> "Checkpoint":
+        """Takes a checkpoint of a functional simulation, copying the plain RAM segments of its memory."""
+        segments = [
+            RandomAccessMemory(seg.address_range, seg.flags, seg.data)
+            for seg in plain_ram_segments(sim.mem_model.segments)
+        ]
+        return Checkpoint(pc=sim.pc, regs=list(sim.regs), mcause=sim.mcause, segments=segments)
+
+    def save(self, file: BinaryIO):
+        """Writes the checkpoint: a header with the registers, followed by a memory image."""
+        file.write(_header.pack(_magic, self.pc, self.mcause, *self.regs))
+        write_memory_image(file, self.segments)
+
+    @staticmethod
+    def load(file: BinaryIO) -> "Checkpoint":
+        """Reads a checkpoint written by `save`."""
+        magic, pc, mcause, *regs = _header.unpack(file.read(_header.size))
+        if magic != _magic:
+            raise ValueError("Not a checkpoint file")
+        return Checkpoint(pc=pc, regs=regs, mcause=mcause, segments=load_memory_image(file))
+
+    def boot_stub(self, address: int = BOOT_ADDRESS) -> bytes:
+        """Encodes the boot stub, to be placed at the given address.
+
+        Every register is loaded with a `lui` and `addi` pair, so the length
+        of the stub doesn't depend on the state.
+        """
+        instrs = _load_immediate(1, self.mcause)
+        instrs.append(i_type(Opcode.SYSTEM, 0, Funct3.CSRRW, 1, CSRAddress.MCAUSE))
+        for reg in range(1, 32):
+            instrs += _load_immediate(reg, self.regs[reg])
+
+        jump_addr = address + 4 * len(instrs)
+        offset = (self.pc - jump_addr + 2**31) % 2**32 - 2**31
+        if not -(2**20) <= offset < 2**20:
+            raise ValueError(f"Checkpoint pc 0x{self.pc:x} is out of the jump range of the boot stub at 0x{address:x}")
+        instrs.append(j_type(0, offset))
+
+        return b"".join(instr.to_bytes(4, "little") for instr in instrs)
+
+    def memory_model(self, extra_segments: list[MemorySegment], address: int = BOOT_ADDRESS) -> CoreMemoryModel:
+        """Creates the memory for resuming the program, with copies of the segments and the boot stub.
+
+        Parameters
+        ----------
+        extra_segments: list[MemorySegment]
+            Segments not stored in the checkpoint, e.g. MMIO.
+        address: int
+            Address of the boot stub, which is the `start_pc` of the core.
+        """
+        stub = self.boot_stub(address).ljust(_BOOT_SEGMENT_SIZE, b"\0")
+        segments: list[MemorySegment] = [
+            RandomAccessMemory(seg.address_range, seg.flags, seg.data) for seg in self.segments
+        ]
+        boot_range = range(address, address + _BOOT_SEGMENT_SIZE)
+        segments.append(RandomAccessMemory(boot_range, SegmentFlags.READ | SegmentFlags.EXECUTABLE, stub))
+        return CoreMemoryModel(segments + extra_segments)
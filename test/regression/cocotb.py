@@ -1,17 +1,22 @@
+import contextlib
 from decimal import Decimal
 import inspect
-from typing import Any
+import os
+import tempfile
+from typing import Any, BinaryIO, Optional
 from collections.abc import Coroutine
 from dataclasses import dataclass
 
 import cocotb
 from cocotb.clock import Clock, Timer
 from cocotb.handle import ModifiableObject
-from cocotb.triggers import FallingEdge, Event, with_timeout
+from cocotb.triggers import FallingEdge, First, RisingEdge, Event, with_timeout
 from cocotb_bus.bus import Bus
 
 from .memory import *
 from .common import SimulationBackend
+from .commit_log import CommitRecord, write_commit_record
+from .pipeline_timeline import O3PipeViewWriter
 
 
 @dataclass
@@ -68,12 +73,17 @@ class WishboneSlave:
         self.bus = WishboneBus(entity, name)
         self.bus.drive(WishboneSlaveSignals())
 
+    async def _wait_for_request(self, clock_edge_event: FallingEdge):
+        # Sleep until a request starts instead of checking the bus every cycle.
+        while not (self.bus.stb.value and self.bus.cyc.value):
+            await First(RisingEdge(self.bus.stb), RisingEdge(self.bus.cyc))  # type: ignore
+            await clock_edge_event  # type: ignore
+
     async def start(self):
         clock_edge_event = FallingEdge(self.clock)
 
         while True:
-            while not (self.bus.stb.value and self.bus.cyc.value):
-                await clock_edge_event  # type: ignore
+            await self._wait_for_request(clock_edge_event)
 
             sig_m = WishboneMasterSignals()
             self.bus.sample(sig_m)
@@ -131,9 +141,64 @@ class WishboneSlave:
             self.bus.drive(WishboneSlaveSignals())
 
 
+class RetirementTraceMonitor:
+    """Writes the instructions reported on the retirement trace port to a commit log and a pipeline timeline.
+
+    Requires the core to be generated with the `retirement_trace` option,
+    and with `pipeline_timeline` for writing the timeline.
+    """
+
+    def __init__(self, entity, clock, file: Optional[BinaryIO], timeline: Optional[O3PipeViewWriter] = None):
+        if not hasattr(entity, "retirement_trace__valid"):
+            raise ValueError("The toplevel has no retirement trace port, generate it with --retirement-trace")
+        if timeline is not None and not hasattr(entity, "retirement_trace__timeline__retire"):
+            raise ValueError("The toplevel has no pipeline timeline, generate it with --pipeline-timeline")
+        self.entity = entity
+        self.clock = clock
+        self.file = file
+        self.timeline = timeline
+
+    def _signal(self, name: str) -> int:
+        return int(getattr(self.entity, "retirement_trace__" + name).value)
+
+    async def start(self):
+        valid = self.entity.retirement_trace__valid
+        clock_edge_event = FallingEdge(self.clock)
+
+        while True:
+            # Sleep while no instructions retire.
+            if not valid.value:
+                await RisingEdge(valid)  # type: ignore
+            await clock_edge_event  # type: ignore
+
+            if valid.value and self.file is not None:
+                record = CommitRecord(
+                    pc=self._signal("pc"),
+                    instr=self._signal("instr"),
+                    rd=self._signal("rl_dst"),
+                    rd_data=self._signal("rd_data"),
+                    mem_addr=self._signal("mem_addr"),
+                    mem_rmask=self._signal("mem_rmask"),
+                    mem_wmask=self._signal("mem_wmask"),
+                    mem_data=self._signal("mem_data"),
+                    exception=bool(self._signal("exception")),
+                )
+                write_commit_record(self.file, record)
+
+            if valid.value and self.timeline is not None:
+                self.timeline.write(
+                    pc=self._signal("pc"),
+                    instr=self._signal("instr"),
+                    timeline={stage: self._signal("timeline__" + stage) for stage in self.timeline.stage_names},
+                    store=self._signal("mem_wmask") != 0,
+                )
+
+
 class CocotbSimulation(SimulationBackend):
-    def __init__(self, dut):
+    def __init__(self, dut, commit_log_file: Optional[str] = None, timeline_file: Optional[str] = None):
         self.dut = dut
+        self.commit_log_file = commit_log_file
+        self.timeline_file = timeline_file
         self.finish_event = Event()
 
     async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
@@ -150,7 +215,21 @@ class CocotbSimulation(SimulationBackend):
         data_wb = WishboneSlave(self.dut, "wb_data", self.dut.clk, mem_model, is_instr_bus=False)
         cocotb.start_soon(data_wb.start())
 
-        res = await with_timeout(self.finish_event.wait(), timeout_cycles, "ns")
+        if self.commit_log_file is None and self.timeline_file is None:
+            res = await with_timeout(self.finish_event.wait(), timeout_cycles, "ns")
+        else:
+            with contextlib.ExitStack() as stack:
+                commit_log = None
+                if self.commit_log_file is not None:
+                    commit_log = stack.enter_context(open(self.commit_log_file, "wb"))
+                timeline = None
+                if self.timeline_file is not None:
+                    timeline = O3PipeViewWriter(stack.enter_context(open(self.timeline_file, "w")))
+
+                monitor = RetirementTraceMonitor(self.dut, self.dut.clk, commit_log, timeline)
+                monitor_task = cocotb.start_soon(monitor.start())
+                res = await with_timeout(self.finish_event.wait(), timeout_cycles, "ns")
+                monitor_task.kill()
 
         return res is not None
 
@@ -158,6 +237,79 @@ class CocotbSimulation(SimulationBackend):
         self.finish_event.set()
 
 
+class NativeMemorySimulation(CocotbSimulation):
+    """Verilator simulation with a native memory model.
+
+    Requires the `native_top` toplevel (see `cocotb/native_top.sv`), which
+    serves bus requests to `RandomAccessMemory` segments in C++ code without
+    waking up Python. The remaining requests, e.g. MMIO accesses, are forwarded
+    to the memory model in Python. The contents of the `RandomAccessMemory`
+    segments are copied to the simulator before the simulation starts, and
+    back after it finishes.
+    """
+
+    async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
+        native_segments = plain_ram_segments(mem_model.segments)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = os.path.join(tmpdir, "memory.img")
+            os.environ["COREBLOCKS_MEMORY_IMAGE"] = image_path
+
+            with open(image_path, "wb") as f:
+                write_memory_image(f, native_segments)
+
+            clk = Clock(self.dut.clk, 1, "ns")
+            cocotb.start_soon(clk.start())
+
+            self.dut.rst.value = 1
+            self.dut.mem_store.value = 0
+            self.dut.mem_load.value = 1
+            await RisingEdge(self.dut.clk)
+            await FallingEdge(self.dut.clk)
+            self.dut.mem_load.value = 0
+            self.dut.rst.value = 0
+
+            instr_wb = WishboneSlave(self.dut, "wb_instr_ext", self.dut.clk, mem_model, is_instr_bus=True)
+            cocotb.start_soon(instr_wb.start())
+
+            data_wb = WishboneSlave(self.dut, "wb_data_ext", self.dut.clk, mem_model, is_instr_bus=False)
+            cocotb.start_soon(data_wb.start())
+
+            res = await with_timeout(self.finish_event.wait(), timeout_cycles, "ns")
+
+            self.dut.mem_store.value = 1
+            await RisingEdge(self.dut.clk)
+            await FallingEdge(self.dut.clk)
+            self.dut.mem_store.value = 0
+
+            with open(image_path, "rb") as f:
+                read_memory_image(f, native_segments)
+
+        return res is not None
+
+
+def create_simulation(dut, name: str) -> CocotbSimulation:
+    """Creates the simulation backend for the toplevel selected by the Makefile.
+
+    If the `COMMIT_LOG_DIR` environment variable is set, the commit log of
+    the program is written to `<name>.commitlog` in that directory. Similarly,
+    `TIMELINE_DIR` selects the directory for the pipeline timeline, written
+    to `<name>.pipeview`.
+    """
+    if os.environ.get("NATIVE_MEMORY") == "1":
+        if "COMMIT_LOG_DIR" in os.environ or "TIMELINE_DIR" in os.environ:
+            raise ValueError("Retirement traces are not supported with the native memory toplevel")
+        return NativeMemorySimulation(dut)
+
+    commit_log_file = None
+    if "COMMIT_LOG_DIR" in os.environ:
+        commit_log_file = os.path.join(os.environ["COMMIT_LOG_DIR"], f"{name}.commitlog")
+    timeline_file = None
+    if "TIMELINE_DIR" in os.environ:
+        timeline_file = os.path.join(os.environ["TIMELINE_DIR"], f"{name}.pipeview")
+    return CocotbSimulation(dut, commit_log_file, timeline_file)
+
+
 def _create_test(function, name, mod, *args, **kwargs):
     async def _my_test(dut):
         await function(dut, *args, **kwargs)
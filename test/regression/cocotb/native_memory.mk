@@ -0,0 +1,14 @@
+# Native memory model (NATIVE_MEMORY=1): bus requests to RAM are served by
+# C++ code in the simulator, only the other requests (e.g. MMIO) reach Python.
+NATIVE_MEMORY ?= 0
+export NATIVE_MEMORY
+
+ifeq ($(NATIVE_MEMORY),1)
+  ifneq ($(SIM),verilator)
+    $(error The native memory model requires Verilator)
+  endif
+  VERILOG_SOURCES += $(PWD)/wishbone_memory.sv $(PWD)/native_top.sv
+  EXTRA_ARGS += $(PWD)/wishbone_memory.cpp
+  TOPLEVEL = native_top
+  SIM_BUILD := $(SIM_BUILD)_native
+endif
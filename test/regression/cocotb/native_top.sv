@@ -0,0 +1,136 @@
+// Simulation toplevel connecting the core (module `top` from core.v) to the
+// native memory model. Only the requests forwarded by the `wishbone_memory`
+// instances are visible on the `*_ext__*` buses, which are handled in Python.
+// The memory contents are exchanged with Python on `mem_load` and `mem_store`.
+
+module native_top (
+    input logic clk,
+    input logic rst,
+    input logic mem_load,
+    input logic mem_store,
+
+    input logic [31:0] wb_instr_ext__dat_r,
+    input logic wb_instr_ext__ack,
+    input logic wb_instr_ext__err,
+    input logic wb_instr_ext__rty,
+    output logic [31:0] wb_instr_ext__dat_w,
+    output logic [29:0] wb_instr_ext__adr,
+    output logic [3:0] wb_instr_ext__sel,
+    output logic wb_instr_ext__cyc,
+    output logic wb_instr_ext__stb,
+    output logic wb_instr_ext__we,
+
+    input logic [31:0] wb_data_ext__dat_r,
+    input logic wb_data_ext__ack,
+    input logic wb_data_ext__err,
+    input logic wb_data_ext__rty,
+    output logic [31:0] wb_data_ext__dat_w,
+    output logic [29:0] wb_data_ext__adr,
+    output logic [3:0] wb_data_ext__sel,
+    output logic wb_data_ext__cyc,
+    output logic wb_data_ext__stb,
+    output logic wb_data_ext__we
+);
+    import "DPI-C" function void wb_memory_load();
+    import "DPI-C" function void wb_memory_store();
+
+    always @(posedge clk) begin
+        if (mem_load)
+            wb_memory_load();
+        if (mem_store)
+            wb_memory_store();
+    end
+
+    logic [31:0] wb_instr_dat_r;
+    logic [31:0] wb_instr_dat_w;
+    logic [29:0] wb_instr_adr;
+    logic [3:0] wb_instr_sel;
+    logic wb_instr_cyc, wb_instr_stb, wb_instr_we, wb_instr_ack, wb_instr_err, wb_instr_rty;
+
+    wishbone_memory #(.EXEC(1)) wb_instr_memory (
+        .clk(clk),
+        .rst(rst),
+        .cyc(wb_instr_cyc),
+        .stb(wb_instr_stb),
+        .we(wb_instr_we),
+        .adr(wb_instr_adr),
+        .dat_w(wb_instr_dat_w),
+        .sel(wb_instr_sel),
+        .dat_r(wb_instr_dat_r),
+        .ack(wb_instr_ack),
+        .err(wb_instr_err),
+        .rty(wb_instr_rty),
+        .ext_cyc(wb_instr_ext__cyc),
+        .ext_stb(wb_instr_ext__stb),
+        .ext_we(wb_instr_ext__we),
+        .ext_adr(wb_instr_ext__adr),
+        .ext_dat_w(wb_instr_ext__dat_w),
+        .ext_sel(wb_instr_ext__sel),
+        .ext_dat_r(wb_instr_ext__dat_r),
+        .ext_ack(wb_instr_ext__ack),
+        .ext_err(wb_instr_ext__err),
+        .ext_rty(wb_instr_ext__rty)
+    );
+
+    logic [31:0] wb_data_dat_r;
+    logic [31:0] wb_data_dat_w;
+    logic [29:0] wb_data_adr;
+    logic [3:0] wb_data_sel;
+    logic wb_data_cyc, wb_data_stb, wb_data_we, wb_data_ack, wb_data_err, wb_data_rty;
+
+    wishbone_memory #(.EXEC(0)) wb_data_memory (
+        .clk(clk),
+        .rst(rst),
+        .cyc(wb_data_cyc),
+        .stb(wb_data_stb),
+        .we(wb_data_we),
+        .adr(wb_data_adr),
+        .dat_w(wb_data_dat_w),
+        .sel(wb_data_sel),
+        .dat_r(wb_data_dat_r),
+        .ack(wb_data_ack),
+        .err(wb_data_err),
+        .rty(wb_data_rty),
+        .ext_cyc(wb_data_ext__cyc),
+        .ext_stb(wb_data_ext__stb),
+        .ext_we(wb_data_ext__we),
+        .ext_adr(wb_data_ext__adr),
+        .ext_dat_w(wb_data_ext__dat_w),
+        .ext_sel(wb_data_ext__sel),
+        .ext_dat_r(wb_data_ext__dat_r),
+        .ext_ack(wb_data_ext__ack),
+        .ext_err(wb_data_ext__err),
+        .ext_rty(wb_data_ext__rty)
+    );
+
+    top core (
+        .clk(clk),
+        .rst(rst),
+        .wb_instr__dat_r(wb_instr_dat_r),
+        .wb_instr__dat_w(wb_instr_dat_w),
+        .wb_instr__rst(),
+        .wb_instr__ack(wb_instr_ack),
+        .wb_instr__adr(wb_instr_adr),
+        .wb_instr__cyc(wb_instr_cyc),
+        .wb_instr__stall(1'b0),
+        .wb_instr__err(wb_instr_err),
+        .wb_instr__lock(),
+        .wb_instr__rty(wb_instr_rty),
+        .wb_instr__sel(wb_instr_sel),
+        .wb_instr__stb(wb_instr_stb),
+        .wb_instr__we(wb_instr_we),
+        .wb_data__dat_r(wb_data_dat_r),
+        .wb_data__dat_w(wb_data_dat_w),
+        .wb_data__rst(),
+        .wb_data__ack(wb_data_ack),
+        .wb_data__adr(wb_data_adr),
+        .wb_data__cyc(wb_data_cyc),
+        .wb_data__stall(1'b0),
+        .wb_data__err(wb_data_err),
+        .wb_data__lock(),
+        .wb_data__rty(wb_data_rty),
+        .wb_data__sel(wb_data_sel),
+        .wb_data__stb(wb_data_stb),
+        .wb_data__we(wb_data_we)
+    );
+endmodule
@@ -6,7 +6,7 @@ from pathlib import Path
 top_dir = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(top_dir))
 
-from test.regression.cocotb import CocotbSimulation  # noqa: E402
+from test.regression.cocotb import create_simulation  # noqa: E402
 from test.regression.signature import run_test  # noqa: E402
 
 
@@ -22,4 +22,4 @@ async def do_test(dut):
     if output is None:
         output = test_name + ".signature"
 
-    await run_test(CocotbSimulation(dut), test_name, output)
+    await run_test(create_simulation(dut, test_name), test_name, output)
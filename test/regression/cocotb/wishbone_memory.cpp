@@ -0,0 +1,136 @@
+// Native memory model for the Verilator simulation (see wishbone_memory.sv).
+//
+// The memory is shared by all the `wishbone_memory` instances. Its contents
+// are exchanged with Python through an image file, whose path is given by the
+// COREBLOCKS_MEMORY_IMAGE environment variable. The image is a sequence of
+// segments, each consisting of a header of three little-endian 32-bit words
+// (start address, length in bytes, flags) followed by the segment data.
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+
+#include "svdpi.h"
+
+namespace {
+
+enum SegmentFlags : uint32_t {
+    READ = 1,
+    WRITE = 2,
+    EXECUTABLE = 4,
+};
+
+// Keep in sync with wishbone_memory.sv
+enum Status : int {
+    OK = 0,
+    FORWARD = 1,
+};
+
+struct Segment {
+    uint32_t start;
+    uint32_t flags;
+    std::vector<uint8_t> data;
+};
+
+std::vector<Segment> segments;
+
+const char *image_path() {
+    const char *path = std::getenv("COREBLOCKS_MEMORY_IMAGE");
+    if (path == nullptr) {
+        std::fprintf(stderr, "wishbone_memory: COREBLOCKS_MEMORY_IMAGE is not set\n");
+        std::abort();
+    }
+    return path;
+}
+
+bool read_word(std::FILE *file, uint32_t &word) {
+    uint8_t bytes[4];
+    if (std::fread(bytes, 1, 4, file) != 4)
+        return false;
+    word = bytes[0] | bytes[1] << 8 | bytes[2] << 16 | uint32_t(bytes[3]) << 24;
+    return true;
+}
+
+void write_word(std::FILE *file, uint32_t word) {
+    uint8_t bytes[4] = {uint8_t(word), uint8_t(word >> 8), uint8_t(word >> 16), uint8_t(word >> 24)};
+    std::fwrite(bytes, 1, 4, file);
+}
+
+Segment *find_segment(uint32_t addr) {
+    for (auto &segment : segments)
+        if (addr - segment.start < segment.data.size())
+            return &segment;
+    return nullptr;
+}
+
+} // namespace
+
+extern "C" void wb_memory_load() {
+    std::FILE *file = std::fopen(image_path(), "rb");
+    if (file == nullptr) {
+        std::perror("wishbone_memory: cannot open memory image");
+        std::abort();
+    }
+
+    segments.clear();
+    uint32_t start, length, flags;
+    while (read_word(file, start)) {
+        if (!read_word(file, length) || !read_word(file, flags)) {
+            std::fprintf(stderr, "wishbone_memory: truncated memory image\n");
+            std::abort();
+        }
+        Segment segment{start, flags, std::vector<uint8_t>(length)};
+        if (std::fread(segment.data.data(), 1, length, file) != length) {
+            std::fprintf(stderr, "wishbone_memory: truncated memory image\n");
+            std::abort();
+        }
+        segments.push_back(std::move(segment));
+    }
+
+    std::fclose(file);
+}
+
+extern "C" void wb_memory_store() {
+    std::FILE *file = std::fopen(image_path(), "wb");
+    if (file == nullptr) {
+        std::perror("wishbone_memory: cannot open memory image");
+        std::abort();
+    }
+
+    for (const auto &segment : segments) {
+        write_word(file, segment.start);
+        write_word(file, segment.data.size());
+        write_word(file, segment.flags);
+        std::fwrite(segment.data.data(), 1, segment.data.size(), file);
+    }
+
+    std::fclose(file);
+}
+
+// Accesses which cannot be served natively (unmapped addresses and permission
+// violations) are forwarded to the Python memory model.
+
+extern "C" int wb_memory_read(unsigned int addr, svBit exec, unsigned int *data) {
+    Segment *segment = find_segment(addr);
+    if (segment == nullptr || !(segment->flags & READ) || (exec && !(segment->flags & EXECUTABLE)))
+        return FORWARD;
+
+    uint32_t offset = addr - segment->start;
+    *data = 0;
+    for (uint32_t i = 0; i < 4 && offset + i < segment->data.size(); i++)
+        *data |= uint32_t(segment->data[offset + i]) << (8 * i);
+    return OK;
+}
+
+extern "C" int wb_memory_write(unsigned int addr, unsigned int data, unsigned int sel) {
+    Segment *segment = find_segment(addr);
+    if (segment == nullptr || !(segment->flags & WRITE))
+        return FORWARD;
+
+    uint32_t offset = addr - segment->start;
+    for (uint32_t i = 0; i < 4 && offset + i < segment->data.size(); i++)
+        if (sel & (1 << i))
+            segment->data[offset + i] = data >> (8 * i);
+    return OK;
+}
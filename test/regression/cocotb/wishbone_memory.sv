@@ -0,0 +1,81 @@
+// Wishbone slave backed by the native memory model (see wishbone_memory.cpp).
+//
+// Requests are served with one cycle of latency, like the Python slave in
+// cocotb.py. Requests which the native memory cannot serve are forwarded to
+// the `ext_*` bus, which is handled by the Python memory model.
+
+module wishbone_memory #(
+    parameter bit EXEC = 0
+) (
+    input logic clk,
+    input logic rst,
+
+    input logic cyc,
+    input logic stb,
+    input logic we,
+    input logic [29:0] adr,
+    input logic [31:0] dat_w,
+    input logic [3:0] sel,
+    output logic [31:0] dat_r,
+    output logic ack,
+    output logic err,
+    output logic rty,
+
+    output logic ext_cyc,
+    output logic ext_stb,
+    output logic ext_we,
+    output logic [29:0] ext_adr,
+    output logic [31:0] ext_dat_w,
+    output logic [3:0] ext_sel,
+    input logic [31:0] ext_dat_r,
+    input logic ext_ack,
+    input logic ext_err,
+    input logic ext_rty
+);
+    import "DPI-C" function int wb_memory_read(input int unsigned addr, input bit exec, output int unsigned data);
+    import "DPI-C" function int wb_memory_write(input int unsigned addr, input int unsigned data, input int unsigned sel);
+
+    // Keep in sync with wishbone_memory.cpp
+    localparam int STATUS_OK = 0;
+
+    int status;
+    int unsigned data;
+
+    always @(posedge clk) begin
+        ack <= 0;
+        err <= 0;
+        rty <= 0;
+
+        if (rst) begin
+            ext_cyc <= 0;
+            ext_stb <= 0;
+        end else if (ext_stb) begin
+            if (ext_ack || ext_err || ext_rty) begin
+                ext_cyc <= 0;
+                ext_stb <= 0;
+                dat_r <= ext_dat_r;
+                ack <= ext_ack;
+                err <= ext_err;
+                rty <= ext_rty;
+            end
+        end else if (cyc && stb && !ack && !err && !rty) begin
+            data = 0;
+            if (we)
+                status = wb_memory_write({adr, 2'b00}, dat_w, {28'b0, sel});
+            else
+                status = wb_memory_read({adr, 2'b00}, EXEC, data);
+
+            if (status == STATUS_OK) begin
+                dat_r <= data;
+                ack <= 1;
+            end else begin
+                ext_cyc <= 1;
+                ext_stb <= 1;
+                ext_we <= we;
+                ext_adr <= adr;
+                ext_dat_w <= dat_w;
+                ext_sel <= sel;
+            end
+        end
+    end
+endmodule
@@ -0,0 +1,119 @@
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from .iss import ISASimulator, Trap
+
+__all__ = ["CommitRecord", "write_commit_record", "read_commit_log", "compare_commit_log"]
+
+# pc, instr, rd, flags, mem_rmask, mem_wmask, rd_data, mem_addr, mem_data
+_record = struct.Struct("<IIBBBBIII")
+_FLAG_EXCEPTION = 1
+
+
+@dataclass(frozen=True)
+class CommitRecord:
+    """An instruction retired by the core, as reported by the `RetirementTrace` port.
+
+    Attributes
+    ----------
+    pc: int
+        Address of the instruction.
+    instr: int
+        The instruction, after the expansion of compressed instructions.
+    rd: int
+        Destination register, 0 if the instruction doesn't write a register.
+    rd_data: int
+        Value written to the destination register.
+    mem_addr: int
+        Word-aligned address of the memory access.
+    mem_rmask: int
+        Bytes of the word read, 0 if the instruction doesn't load.
+    mem_wmask: int
+        Bytes of the word written, 0 if the instruction doesn't store.
+    mem_data: int
+        Word read from or written to the memory.
+    exception: bool
+        The instruction raised an exception.
+    """
+
+    pc: int
+    instr: int
+    rd: int
+    rd_data: int
+    mem_addr: int = 0
+    mem_rmask: int = 0
+    mem_wmask: int = 0
+    mem_data: int = 0
+    exception: bool = False
+
+
+def write_commit_record(file: BinaryIO, record: CommitRecord):
+    flags = _FLAG_EXCEPTION if record.exception else 0
+    file.write(
+        _record.pack(
+            record.pc,
+            record.instr,
+            record.rd,
+            flags,
+            record.mem_rmask,
+            record.mem_wmask,
+            record.rd_data,
+            record.mem_addr,
+            record.mem_data,
+        )
+    )
+
+
+def read_commit_log(file: BinaryIO) -> Iterator[CommitRecord]:
+    """Reads the records written by `write_commit_record`, until the end of the file."""
+    while data := file.read(_record.size):
+        pc, instr, rd, flags, mem_rmask, mem_wmask, rd_data, mem_addr, mem_data = _record.unpack(data)
+        yield CommitRecord(
+            pc=pc,
+            instr=instr,
+            rd=rd,
+            rd_data=rd_data,
+            mem_addr=mem_addr,
+            mem_rmask=mem_rmask,
+            mem_wmask=mem_wmask,
+            mem_data=mem_data,
+            exception=bool(flags & _FLAG_EXCEPTION),
+        )
+
+
+def compare_commit_log(records: Iterable[CommitRecord], sim: ISASimulator) -> Optional[str]:
+    """Replays a commit log on the functional simulator.
+
+    The simulator has to start in the same state as the core, e.g. with a
+    fresh copy of the memory of the program. The memory accesses aren't
+    compared, the loaded values are checked through the destination
+    registers, and the stored ones through the following loads.
+
+    Returns
+    -------
+    str, optional
+        Description of the first retired instruction which differs from the
+        simulator, or None if the whole log matches.
+    """
+    for index, record in enumerate(records):
+        try:
+            expected = sim.step()
+        except Trap as trap:
+            if record.exception and record.pc == trap.pc:
+                # The core doesn't handle traps, so the program can't continue.
+                return None
+            return f"Instruction {index} at pc=0x{record.pc:x}: expected {trap}"
+
+        if record.exception:
+            return f"Instruction {index} at pc=0x{record.pc:x}: unexpected exception"
+
+        if (record.pc, record.rd, record.rd_data) != (expected.pc, expected.rd, expected.rd_data):
+            return (
+                f"Instruction {index} at pc=0x{record.pc:x} (0x{record.instr:08x}): "
+                f"x{record.rd}=0x{record.rd_data:x}, expected pc=0x{expected.pc:x} "
+                f"x{expected.rd}=0x{expected.rd_data:x}"
+            )
+
+    return None
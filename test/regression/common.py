@@ -1,4 +1,7 @@
+import multiprocessing
+import traceback
 from abc import ABC, abstractmethod
+from typing import Callable, Optional
 
 from .memory import CoreMemoryModel
 
@@ -11,3 +14,60 @@ class SimulationBackend(ABC):
     @abstractmethod
     def stop(self):
         raise NotImplementedError
+
+
+_pool_run_program: Optional[Callable[[str], None]] = None
+
+
+def _init_pool_worker(run_program: Callable[[str], None]):
+    global _pool_run_program
+    _pool_run_program = run_program
+
+
+def _run_in_pool_worker(name: str) -> tuple[str, Optional[str]]:
+    assert _pool_run_program is not None
+    try:
+        _pool_run_program(name)
+    except Exception:
+        return name, traceback.format_exc()
+    return name, None
+
+
+def run_in_pool(names: list[str], run_program: Callable[[str], None], jobs: int) -> bool:
+    """Runs programs in a pool of worker processes.
+
+    The workers are forked, so `run_program` doesn't need to be picklable,
+    and the state it captures (e.g. a simulation backend) is reused by all
+    the programs run by a worker.
+
+    Parameters
+    ----------
+    names: list[str]
+        Names of the programs to run.
+    run_program: Callable[[str], None]
+        Runs the program with the given name. Fails by raising an exception.
+    jobs: int
+        Number of worker processes.
+
+    Returns
+    -------
+    bool
+        True if all the programs succeeded.
+    """
+    failures = []
+    context = multiprocessing.get_context("fork")
+    with context.Pool(max(1, min(jobs, len(names))), initializer=_init_pool_worker, initargs=(run_program,)) as pool:
+        for name, error in pool.imap_unordered(_run_in_pool_worker, names):
+            print(f"{name} ... {'ok' if error is None else 'FAIL'}", flush=True)
+            if error is not None:
+                failures.append((name, error))
+
+    for name, error in failures:
+        print("=" * 70)
+        print(f"FAIL: {name}")
+        print("-" * 70)
+        print(error)
+
+    print(f"Ran {len(names)} programs, {len(failures)} failed")
+
+    return not failures
@@ -0,0 +1,139 @@
+import ctypes
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from .memory import *
+from .common import SimulationBackend
+
+model_dir = Path(__file__).parent.joinpath("cxxrtl")
+
+
+def model_library(config: str = "full") -> Path:
+    """Path to the model of the core in the given configuration, built by `build_model`."""
+    return model_dir.joinpath(f"build/libcore-{config}.so")
+
+
+class _Request(ctypes.Structure):
+    # Keep in sync with cxxrtl/driver.cc
+    _fields_ = [
+        ("bus", ctypes.c_uint32),
+        ("we", ctypes.c_uint32),
+        ("addr", ctypes.c_uint32),
+        ("data", ctypes.c_uint32),
+        ("sel", ctypes.c_uint32),
+    ]
+
+
+# Keep in sync with cxxrtl/driver.cc
+_reply_status = {ReplyStatus.OK: 0, ReplyStatus.ERROR: 1, ReplyStatus.RETRY: 2}
+
+_libraries: dict[Path, ctypes.CDLL] = {}
+
+
+def build_model(config: str = "full") -> bool:
+    """Builds the CXXRTL model of the core using `cxxrtl/Makefile`.
+
+    The model is rebuilt when the sources of the core have changed.
+    """
+    res = subprocess.run(["make", "-C", str(model_dir), f"CONFIG={config}"])
+    return res.returncode == 0
+
+
+def _load_library(path: Path) -> ctypes.CDLL:
+    if path not in _libraries:
+        lib = ctypes.CDLL(str(path))
+        lib.sim_create.restype = ctypes.c_void_p
+        lib.sim_destroy.argtypes = [ctypes.c_void_p]
+        lib.sim_add_segment.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_uint32,
+            ctypes.c_uint32,
+            ctypes.c_uint32,
+            ctypes.POINTER(ctypes.c_uint8),
+        ]
+        lib.sim_reset.argtypes = [ctypes.c_void_p]
+        lib.sim_cycles.argtypes = [ctypes.c_void_p]
+        lib.sim_cycles.restype = ctypes.c_uint64
+        lib.sim_run.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.POINTER(_Request)]
+        lib.sim_respond.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int]
+        _libraries[path] = lib
+    return _libraries[path]
+
+
+class CXXRTLSimulation(SimulationBackend):
+    """Simulation backend using the CXXRTL model of the core.
+
+    The model is built by `build_model`. The simulation runs in batches of
+    cycles in native code, which serves the requests to `RandomAccessMemory`
+    segments directly from their buffers, shared with Python. Python is called
+    only for the remaining requests, e.g. MMIO accesses. Assumes 32-bit
+    Wishbone buses.
+    """
+
+    def __init__(self, verbose: bool, library: Optional[Path] = None):
+        """
+        Parameters
+        ----------
+        verbose: bool
+            Print the requests served by Python and the simulation time.
+        library: Path, optional
+            Path to the compiled model. By default, the model of the full configuration built by
+            `build_model` is used.
+        """
+        self.verbose = verbose
+        self.library = library if library is not None else model_library()
+        self.running = False
+
+    def _serve(self, lib: ctypes.CDLL, sim: int, mem_model: CoreMemoryModel, request: _Request):
+        bus_name = "instr" if request.bus == 0 else "data"
+
+        if request.we:
+            if self.verbose:
+                print(
+                    f"Wishbone '{bus_name}' bus write request: "
+                    f"addr=0x{request.addr:x} data={request.data:x} sel={request.sel:b}"
+                )
+            resp = mem_model.write(
+                WriteRequest(addr=request.addr, data=request.data, byte_count=4, byte_sel=request.sel)
+            )
+            data = 0
+        else:
+            if self.verbose:
+                print(f"Wishbone '{bus_name}' bus read request: addr=0x{request.addr:x} sel={request.sel:b}")
+            resp = mem_model.read(
+                ReadRequest(addr=request.addr, byte_count=4, byte_sel=request.sel, exec=request.bus == 0)
+            )
+            data = resp.data
+
+        lib.sim_respond(sim, data, _reply_status[resp.status])
+
+    async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
+        lib = _load_library(self.library)
+        sim = lib.sim_create()
+
+        try:
+            buffers = []
+            for seg in plain_ram_segments(mem_model.segments):
+                if not seg.data:
+                    continue
+                buffer = (ctypes.c_uint8 * len(seg.data)).from_buffer(seg.data)
+                buffers.append(buffer)
+                lib.sim_add_segment(sim, seg.address_range.start, len(seg.data), seg.flags, buffer)
+
+            lib.sim_reset(sim)
+
+            self.running = True
+            request = _Request()
+            while self.running and lib.sim_run(sim, timeout_cycles, ctypes.byref(request)):
+                self._serve(lib, sim, mem_model, request)
+
+            if self.verbose:
+                print(f"Simulation finished in {lib.sim_cycles(sim)} cycles")
+        finally:
+            lib.sim_destroy(sim)
+
+        return not self.running
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,203 @@
+// Driver for the CXXRTL model of the core, used by test/regression/cxxrtl.py.
+//
+// The model is stepped in batches by `sim_run`, which serves the Wishbone
+// requests to RAM segments directly from buffers shared with Python. It returns
+// to Python only when a request cannot be served natively (e.g. MMIO accesses
+// or permission violations), or when the cycle limit is reached.
+
+#include <cstdint>
+#include <vector>
+
+// generated by `write_cxxrtl` from the RTLIL produced by scripts/gen_verilog.py,
+// the file name depends on the core configuration and is passed by the Makefile
+#include CORE_CC
+
+namespace {
+
+using design = cxxrtl_design::p_top;
+
+// Keep in sync with SegmentFlags in test/regression/memory.py
+enum SegmentFlags : uint32_t {
+    READ = 1,
+    WRITE = 2,
+    EXECUTABLE = 4,
+};
+
+// Keep in sync with test/regression/cxxrtl.py
+enum Status : int {
+    OK = 0,
+    ERROR = 1,
+    RETRY = 2,
+};
+
+struct Port {
+    uint32_t (*get)(design &);
+    void (*set)(design &, uint32_t);
+};
+
+#define PORT(member)                                                                                                   \
+    Port {                                                                                                             \
+        [](design &top) { return top.member.template get<uint32_t>(); },                                               \
+            [](design &top, uint32_t value) { top.member.template set<uint32_t>(value); }                              \
+    }
+
+#define BUS(name, exec)                                                                                                \
+    Bus {                                                                                                              \
+        PORT(p_##name##____cyc), PORT(p_##name##____stb), PORT(p_##name##____we), PORT(p_##name##____adr),             \
+            PORT(p_##name##____dat__w), PORT(p_##name##____sel), PORT(p_##name##____dat__r),                           \
+            PORT(p_##name##____ack), PORT(p_##name##____err), PORT(p_##name##____rty), exec, false                     \
+    }
+
+struct Bus {
+    Port cyc, stb, we, adr, dat_w, sel, dat_r, ack, err, rty;
+    bool exec;
+    bool responded;
+};
+
+struct Segment {
+    uint32_t start;
+    uint32_t size;
+    uint32_t flags;
+    uint8_t *data;
+};
+
+} // namespace
+
+// Keep in sync with test/regression/cxxrtl.py
+struct Request {
+    uint32_t bus;
+    uint32_t we;
+    uint32_t addr;
+    uint32_t data;
+    uint32_t sel;
+};
+
+struct Simulation {
+    design top;
+    Bus buses[2] = {BUS(wb__instr, true), BUS(wb__data, false)};
+    std::vector<Segment> segments;
+    uint64_t cycles = 0;
+    // Bus to be checked in the current cycle, or -1 at the start of a cycle.
+    int next_bus = -1;
+};
+
+namespace {
+
+Segment *find_segment(Simulation *sim, uint32_t addr) {
+    for (auto &segment : sim->segments)
+        if (addr - segment.start < segment.size)
+            return &segment;
+    return nullptr;
+}
+
+void respond(Simulation *sim, Bus &bus, uint32_t data, int status) {
+    bus.dat_r.set(sim->top, data);
+    bus.ack.set(sim->top, status == OK);
+    bus.err.set(sim->top, status == ERROR);
+    bus.rty.set(sim->top, status == RETRY);
+    bus.responded = true;
+}
+
+// Checks the bus on the falling clock edge, like the Python Wishbone slaves.
+// Returns false if the request must be served by Python.
+bool serve(Simulation *sim, Bus &bus, Request *request) {
+    design &top = sim->top;
+
+    if (bus.responded) {
+        bus.dat_r.set(top, 0);
+        bus.ack.set(top, 0);
+        bus.err.set(top, 0);
+        bus.rty.set(top, 0);
+        bus.responded = false;
+    }
+
+    if (!(bus.cyc.get(top) && bus.stb.get(top)))
+        return true;
+
+    uint32_t addr = bus.adr.get(top) << 2;
+    uint32_t we = bus.we.get(top);
+    uint32_t sel = bus.sel.get(top);
+    Segment *segment = find_segment(sim, addr);
+
+    if (we && segment && (segment->flags & WRITE)) {
+        uint32_t data = bus.dat_w.get(top);
+        for (uint32_t i = 0; i < 4 && addr - segment->start + i < segment->size; i++)
+            if (sel & (1 << i))
+                segment->data[addr - segment->start + i] = data >> (8 * i);
+        respond(sim, bus, 0, OK);
+        return true;
+    }
+
+    if (!we && segment && (segment->flags & READ) && (!bus.exec || (segment->flags & EXECUTABLE))) {
+        uint32_t data = 0;
+        for (uint32_t i = 0; i < 4 && addr - segment->start + i < segment->size; i++)
+            data |= uint32_t(segment->data[addr - segment->start + i]) << (8 * i);
+        respond(sim, bus, data, OK);
+        return true;
+    }
+
+    request->we = we;
+    request->addr = addr;
+    request->data = bus.dat_w.get(top);
+    request->sel = sel;
+    return false;
+}
+
+void clock(Simulation *sim, bool value) {
+    sim->top.p_clk.set<bool>(value);
+    sim->top.step();
+}
+
+} // namespace
+
+extern "C" {
+
+Simulation *sim_create() { return new Simulation; }
+
+void sim_destroy(Simulation *sim) { delete sim; }
+
+void sim_add_segment(Simulation *sim, uint32_t start, uint32_t size, uint32_t flags, uint8_t *data) {
+    sim->segments.push_back(Segment{start, size, flags, data});
+}
+
+void sim_reset(Simulation *sim) {
+    sim->top.p_rst.set<bool>(true);
+    clock(sim, false);
+    clock(sim, true);
+    sim->top.p_rst.set<bool>(false);
+}
+
+uint64_t sim_cycles(Simulation *sim) { return sim->cycles; }
+
+// Runs the simulation until `cycles` clock cycles have elapsed since the reset
+// (returns 0), or until a request must be served by Python (returns 1). In the
+// latter case, the request is described by `request` and the simulation can be
+// continued after responding to it with `sim_respond`.
+int sim_run(Simulation *sim, uint64_t cycles, Request *request) {
+    while (true) {
+        if (sim->next_bus < 0) {
+            if (sim->cycles >= cycles)
+                return 0;
+            clock(sim, false);
+            sim->next_bus = 0;
+        }
+
+        for (; sim->next_bus < 2; sim->next_bus++) {
+            if (!serve(sim, sim->buses[sim->next_bus], request)) {
+                request->bus = sim->next_bus;
+                return 1;
+            }
+        }
+
+        clock(sim, true);
+        sim->cycles++;
+        sim->next_bus = -1;
+    }
+}
+
+void sim_respond(Simulation *sim, uint32_t data, int status) {
+    respond(sim, sim->buses[sim->next_bus], data, status);
+    sim->next_bus++;
+}
+
+} // extern "C"
@@ -0,0 +1,54 @@
+from coreblocks.params.isa import Opcode
+
+__all__ = ["encode_opcode", "r_type", "i_type", "s_type", "b_type", "u_type", "j_type"]
+
+
+def encode_opcode(opcode: Opcode) -> int:
+    """Encodes the opcode field of a 32-bit instruction."""
+    return opcode << 2 | 0b11
+
+
+def r_type(opcode: Opcode, rd: int, funct3: int, rs1: int, rs2: int, funct7: int = 0) -> int:
+    """Encodes an R-type instruction."""
+    return funct7 << 25 | rs2 << 20 | rs1 << 15 | funct3 << 12 | rd << 7 | encode_opcode(opcode)
+
+
+def i_type(opcode: Opcode, rd: int, funct3: int, rs1: int, imm: int) -> int:
+    """Encodes an I-type instruction. Only the low 12 bits of `imm` are used."""
+    return (imm & 0xFFF) << 20 | rs1 << 15 | funct3 << 12 | rd << 7 | encode_opcode(opcode)
+
+
+def s_type(opcode: Opcode, funct3: int, rs1: int, rs2: int, imm: int) -> int:
+    """Encodes an S-type instruction."""
+    return (imm >> 5 & 0x7F) << 25 | rs2 << 20 | rs1 << 15 | funct3 << 12 | (imm & 0x1F) << 7 | encode_opcode(opcode)
+
+
+def b_type(funct3: int, rs1: int, rs2: int, imm: int) -> int:
+    """Encodes a conditional branch with the byte offset `imm`."""
+    return (
+        (imm >> 12 & 1) << 31
+        | (imm >> 5 & 0x3F) << 25
+        | rs2 << 20
+        | rs1 << 15
+        | funct3 << 12
+        | (imm >> 1 & 0xF) << 8
+        | (imm >> 11 & 1) << 7
+        | encode_opcode(Opcode.BRANCH)
+    )
+
+
+def u_type(opcode: Opcode, rd: int, imm: int) -> int:
+    """Encodes a U-type instruction. The low 12 bits of `imm` are dropped."""
+    return imm & 0xFFFFF000 | rd << 7 | encode_opcode(opcode)
+
+
+def j_type(rd: int, imm: int) -> int:
+    """Encodes a JAL with the byte offset `imm`."""
+    return (
+        (imm >> 20 & 1) << 31
+        | (imm >> 1 & 0x3FF) << 21
+        | (imm >> 11 & 1) << 20
+        | (imm >> 12 & 0xFF) << 12
+        | rd << 7
+        | encode_opcode(Opcode.JAL)
+    )
@@ -0,0 +1,725 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .memory import *
+from .common import SimulationBackend
+from .encoding import r_type, i_type, s_type, b_type, u_type, j_type
+
+from coreblocks.params.isa import ExceptionCause, Funct3, Funct7, Funct12, Opcode
+from coreblocks.structs_common.csr_generic import CSRAddress
+
+__all__ = ["Trap", "RetiredInstr", "ISASimulator", "ISASimulation"]
+
+_MASK = 0xFFFFFFFF
+
+
+class Trap(Exception):
+    """Raised when an instruction causes an exception.
+
+    The simulated core has no trap handling, so the simulator stops at the
+    faulting instruction, with `mcause` set like in the core.
+    """
+
+    def __init__(self, cause: ExceptionCause, pc: int):
+        super().__init__(f"{cause.name} at pc=0x{pc:x}")
+        self.cause = cause
+        self.pc = pc
+
+
+@dataclass
+class RetiredInstr:
+    """Result of an instruction, for comparing with the core in lockstep.
+
+    Attributes
+    ----------
+    pc: int
+        Address of the instruction.
+    rd: int
+        Destination register, 0 if the instruction doesn't write a register.
+    rd_data: int
+        Value written to the destination register.
+    next_pc: int
+        Address of the next instruction.
+    """
+
+    pc: int
+    rd: int
+    rd_data: int
+    next_pc: int
+
+
+def _sext(value: int, bits: int) -> int:
+    sign = 1 << (bits - 1)
+    return (value & (sign - 1)) - (value & sign)
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+def _clmul(a: int, b: int) -> int:
+    res = 0
+    while b:
+        if b & 1:
+            res ^= a
+        a <<= 1
+        b >>= 1
+    return res
+
+
+def _div(a: int, b: int) -> int:
+    if b == 0:
+        return _MASK
+    sa, sb = _signed(a), _signed(b)
+    q = abs(sa) // abs(sb)
+    return (-q if (sa < 0) != (sb < 0) else q) & _MASK
+
+
+def _rem(a: int, b: int) -> int:
+    if b == 0:
+        return a
+    sa, sb = _signed(a), _signed(b)
+    r = abs(sa) % abs(sb)
+    return (-r if sa < 0 else r) & _MASK
+
+
+def _orc_b(a: int) -> int:
+    return sum(0xFF << i for i in range(0, 32, 8) if a & (0xFF << i))
+
+
+# Register-register operations, keyed by (funct3, funct7).
+_op_functions: dict[tuple[int, int], Callable[[int, int], int]] = {
+    (Funct3.ADD, Funct7.ADD): lambda a, b: (a + b) & _MASK,
+    (Funct3.SUB, Funct7.SUB): lambda a, b: (a - b) & _MASK,
+    (Funct3.SLL, Funct7.SL): lambda a, b: (a << (b & 31)) & _MASK,
+    (Funct3.SLT, Funct7.SLT): lambda a, b: int(_signed(a) < _signed(b)),
+    (Funct3.SLTU, Funct7.SLT): lambda a, b: int(a < b),
+    (Funct3.XOR, Funct7.XOR): lambda a, b: a ^ b,
+    (Funct3.SR, Funct7.SL): lambda a, b: a >> (b & 31),
+    (Funct3.SR, Funct7.SA): lambda a, b: (_signed(a) >> (b & 31)) & _MASK,
+    (Funct3.OR, Funct7.OR): lambda a, b: a | b,
+    (Funct3.AND, Funct7.AND): lambda a, b: a & b,
+    # M
+    (Funct3.MUL, Funct7.MULDIV): lambda a, b: (a * b) & _MASK,
+    (Funct3.MULH, Funct7.MULDIV): lambda a, b: ((_signed(a) * _signed(b)) >> 32) & _MASK,
+    (Funct3.MULHSU, Funct7.MULDIV): lambda a, b: ((_signed(a) * b) >> 32) & _MASK,
+    (Funct3.MULHU, Funct7.MULDIV): lambda a, b: (a * b) >> 32,
+    (Funct3.DIV, Funct7.MULDIV): _div,
+    (Funct3.DIVU, Funct7.MULDIV): lambda a, b: a // b if b else _MASK,
+    (Funct3.REM, Funct7.MULDIV): _rem,
+    (Funct3.REMU, Funct7.MULDIV): lambda a, b: a % b if b else a,
+    # Zba
+    (Funct3.SH1ADD, Funct7.SH1ADD): lambda a, b: ((a << 1) + b) & _MASK,
+    (Funct3.SH2ADD, Funct7.SH2ADD): lambda a, b: ((a << 2) + b) & _MASK,
+    (Funct3.SH3ADD, Funct7.SH3ADD): lambda a, b: ((a << 3) + b) & _MASK,
+    # Zbb
+    (Funct3.ANDN, Funct7.ANDN): lambda a, b: a & ~b & _MASK,
+    (Funct3.ORN, Funct7.ORN): lambda a, b: (a | ~b) & _MASK,
+    (Funct3.XNOR, Funct7.XNOR): lambda a, b: ~(a ^ b) & _MASK,
+    (Funct3.MAX, Funct7.MAX): lambda a, b: a if _signed(a) > _signed(b) else b,
+    (Funct3.MAXU, Funct7.MAX): max,
+    (Funct3.MIN, Funct7.MIN): lambda a, b: a if _signed(a) < _signed(b) else b,
+    (Funct3.MINU, Funct7.MIN): min,
+    (Funct3.ROL, Funct7.ROL): lambda a, b: ((a << (b & 31)) | (a >> (-b & 31))) & _MASK,
+    (Funct3.ROR, Funct7.ROR): lambda a, b: ((a >> (b & 31)) | (a << (-b & 31))) & _MASK,
+    # Zbc
+    (Funct3.CLMUL, Funct7.CLMUL): lambda a, b: _clmul(a, b) & _MASK,
+    (Funct3.CLMULH, Funct7.CLMUL): lambda a, b: _clmul(a, b) >> 32,
+    (Funct3.CLMULR, Funct7.CLMUL): lambda a, b: (_clmul(a, b) >> 31) & _MASK,
+    # Zbs
+    (Funct3.BCLR, Funct7.BCLR): lambda a, b: a & ~(1 << (b & 31)) & _MASK,
+    (Funct3.BEXT, Funct7.BEXT): lambda a, b: (a >> (b & 31)) & 1,
+    (Funct3.BINV, Funct7.BINV): lambda a, b: a ^ (1 << (b & 31)),
+    (Funct3.BSET, Funct7.BSET): lambda a, b: a | (1 << (b & 31)),
+}
+
+# Register-immediate operations with a shift amount or a funct7, keyed by (funct3, imm[11:5]).
+_shift_imm_functions: dict[tuple[int, int], Callable[[int, int], int]] = {
+    (Funct3.SLL, Funct7.SL): _op_functions[(Funct3.SLL, Funct7.SL)],
+    (Funct3.SR, Funct7.SL): _op_functions[(Funct3.SR, Funct7.SL)],
+    (Funct3.SR, Funct7.SA): _op_functions[(Funct3.SR, Funct7.SA)],
+    (Funct3.ROR, Funct7.ROR): _op_functions[(Funct3.ROR, Funct7.ROR)],
+    (Funct3.BCLR, Funct7.BCLR): _op_functions[(Funct3.BCLR, Funct7.BCLR)],
+    (Funct3.BEXT, Funct7.BEXT): _op_functions[(Funct3.BEXT, Funct7.BEXT)],
+    (Funct3.BINV, Funct7.BINV): _op_functions[(Funct3.BINV, Funct7.BINV)],
+    (Funct3.BSET, Funct7.BSET): _op_functions[(Funct3.BSET, Funct7.BSET)],
+}
+
+# Unary operations, keyed by imm[11:0] with the source register in imm[4:0] where applicable.
+_unary_functions: dict[tuple[int, int], Callable[[int], int]] = {
+    (Funct3.CLZ, 0x600): lambda a: 32 - a.bit_length(),
+    (Funct3.CTZ, 0x601): lambda a: (a & -a).bit_length() - 1 if a else 32,
+    (Funct3.CPOP, 0x602): lambda a: a.bit_count(),
+    (Funct3.SEXTB, 0x604): lambda a: _sext(a, 8) & _MASK,
+    (Funct3.SEXTH, 0x605): lambda a: _sext(a, 16) & _MASK,
+    (Funct3.ORCB, 0x287): _orc_b,
+    (Funct3.REV8, 0x698): lambda a: int.from_bytes(a.to_bytes(4, "little"), "big"),
+}
+
+_branch_conditions: dict[int, Callable[[int, int], bool]] = {
+    Funct3.BEQ: lambda a, b: a == b,
+    Funct3.BNE: lambda a, b: a != b,
+    Funct3.BLT: lambda a, b: _signed(a) < _signed(b),
+    Funct3.BGE: lambda a, b: _signed(a) >= _signed(b),
+    Funct3.BLTU: lambda a, b: a < b,
+    Funct3.BGEU: lambda a, b: a >= b,
+}
+
+# Access size and sign extension of loads.
+_load_types: dict[int, tuple[int, bool]] = {
+    Funct3.B: (1, True),
+    Funct3.H: (2, True),
+    Funct3.W: (4, False),
+    Funct3.BU: (1, False),
+    Funct3.HU: (2, False),
+}
+
+_store_sizes: dict[int, int] = {Funct3.B: 1, Funct3.H: 2, Funct3.W: 4}
+
+
+def _bits(value: int, *fields: tuple[int, int, int]) -> int:
+    """Gathers scattered immediate bits. Each field is (high bit, low bit, position in the result)."""
+    res = 0
+    for hi, lo, pos in fields:
+        res |= (value >> lo & ((1 << (hi - lo + 1)) - 1)) << pos
+    return res
+
+
+def expand_compressed(instr: int) -> Optional[int]:
+    """Expands an RV32C instruction to the equivalent 32-bit instruction.
+
+    Returns None for illegal and reserved encodings.
+    """
+    quadrant = instr & 0b11
+    funct3 = instr >> 13 & 0b111
+    bit12 = instr >> 12 & 1
+    rd = instr >> 7 & 0x1F
+    rs2 = instr >> 2 & 0x1F
+    rd_p = (instr >> 2 & 0b111) + 8
+    rs1_p = (instr >> 7 & 0b111) + 8
+    imm6 = _sext(bit12 << 5 | rs2, 6)
+
+    if instr == 0:
+        return None
+
+    if quadrant == 0b00:
+        uimm = _bits(instr, (12, 10, 3), (6, 6, 2), (5, 5, 6))
+        if funct3 == 0b000:  # C.ADDI4SPN
+            nzuimm = _bits(instr, (12, 11, 4), (10, 7, 6), (6, 6, 2), (5, 5, 3))
+            if nzuimm == 0:
+                return None
+            return i_type(Opcode.OP_IMM, rd_p, Funct3.ADD, 2, nzuimm)
+        if funct3 == 0b010:  # C.LW
+            return i_type(Opcode.LOAD, rd_p, Funct3.W, rs1_p, uimm)
+        if funct3 == 0b110:  # C.SW
+            return s_type(Opcode.STORE, Funct3.W, rs1_p, rd_p, uimm)
+        return None
+
+    if quadrant == 0b01:
+        j_imm = _sext(
+            _bits(instr, (12, 12, 11), (11, 11, 4), (10, 9, 8), (8, 8, 10), (7, 7, 6), (6, 6, 7), (5, 3, 1), (2, 2, 5)),
+            12,
+        )
+        b_imm = _sext(_bits(instr, (12, 12, 8), (11, 10, 3), (6, 5, 6), (4, 3, 1), (2, 2, 5)), 9)
+        match funct3:
+            case 0b000:  # C.ADDI
+                return i_type(Opcode.OP_IMM, rd, Funct3.ADD, rd, imm6)
+            case 0b001:  # C.JAL
+                return j_type(1, j_imm)
+            case 0b010:  # C.LI
+                return i_type(Opcode.OP_IMM, rd, Funct3.ADD, 0, imm6)
+            case 0b011:
+                if rd == 2:  # C.ADDI16SP
+                    nzimm = _sext(_bits(instr, (12, 12, 9), (6, 6, 4), (5, 5, 6), (4, 3, 7), (2, 2, 5)), 10)
+                    if nzimm == 0:
+                        return None
+                    return i_type(Opcode.OP_IMM, 2, Funct3.ADD, 2, nzimm)
+                # C.LUI
+                if imm6 == 0:
+                    return None
+                return u_type(Opcode.LUI, rd, imm6 << 12)
+            case 0b100:
+                funct2 = instr >> 10 & 0b11
+                if funct2 == 0b00 or funct2 == 0b01:  # C.SRLI, C.SRAI
+                    if bit12:
+                        return None
+                    funct7 = Funct7.SA if funct2 == 0b01 else Funct7.SL
+                    return r_type(Opcode.OP_IMM, rs1_p, Funct3.SR, rs1_p, rs2, funct7)
+                if funct2 == 0b10:  # C.ANDI
+                    return i_type(Opcode.OP_IMM, rs1_p, Funct3.AND, rs1_p, imm6)
+                if bit12:
+                    return None
+                funct3, funct7 = [
+                    (Funct3.SUB, Funct7.SUB),
+                    (Funct3.XOR, Funct7.XOR),
+                    (Funct3.OR, Funct7.OR),
+                    (Funct3.AND, Funct7.AND),
+                ][instr >> 5 & 0b11]
+                return r_type(Opcode.OP, rs1_p, funct3, rs1_p, rd_p, funct7)
+            case 0b101:  # C.J
+                return j_type(0, j_imm)
+            case 0b110:  # C.BEQZ
+                return b_type(Funct3.BEQ, rs1_p, 0, b_imm)
+            case _:  # C.BNEZ
+                return b_type(Funct3.BNE, rs1_p, 0, b_imm)
+
+    if quadrant == 0b10:
+        if funct3 == 0b000:  # C.SLLI
+            if bit12:
+                return None
+            return r_type(Opcode.OP_IMM, rd, Funct3.SLL, rd, rs2, Funct7.SL)
+        if funct3 == 0b010:  # C.LWSP
+            if rd == 0:
+                return None
+            return i_type(Opcode.LOAD, rd, Funct3.W, 2, _bits(instr, (12, 12, 5), (6, 4, 2), (3, 2, 6)))
+        if funct3 == 0b100:
+            if not bit12:
+                if rs2 == 0:  # C.JR
+                    if rd == 0:
+                        return None
+                    return i_type(Opcode.JALR, 0, Funct3.JALR, rd, 0)
+                # C.MV
+                return r_type(Opcode.OP, rd, Funct3.ADD, 0, rs2, Funct7.ADD)
+            if rs2 == 0:
+                if rd == 0:  # C.EBREAK
+                    return i_type(Opcode.SYSTEM, 0, Funct3.PRIV, 0, Funct12.EBREAK)
+                # C.JALR
+                return i_type(Opcode.JALR, 1, Funct3.JALR, rd, 0)
+            # C.ADD
+            return r_type(Opcode.OP, rd, Funct3.ADD, rd, rs2, Funct7.ADD)
+        if funct3 == 0b110:  # C.SWSP
+            return s_type(Opcode.STORE, Funct3.W, 2, rs2, _bits(instr, (12, 9, 2), (8, 7, 6)))
+        return None
+
+    return None
+
+
+class ISASimulator:
+    """Functional simulator of the RV32IMC_Zba_Zbb_Zbc_Zbs_Zicsr instruction set.
+
+    The simulator serves as a golden model of the core: it executes programs
+    instruction by instruction, on the same `CoreMemoryModel` as the
+    cycle-accurate simulations. Use `step` to compare the results of the
+    retired instructions with the core, and `run` to fast-forward a program,
+    e.g. to a region of interest of a benchmark.
+
+    Instructions are decoded on the first execution into Python closures,
+    which are cached by address. Stores invalidate the cached instructions
+    they overwrite. The CSRs available are the ones implemented in the core.
+    The `cycle` and `time` counters are equal to `instret`.
+
+    Attributes
+    ----------
+    regs: list[int]
+        Values of the integer registers.
+    pc: int
+        Address of the next instruction.
+    instret: int
+        Number of the retired instructions.
+    mcause: int
+        Value of the `mcause` register, set when a `Trap` is raised.
+    """
+
+    def __init__(self, mem_model: CoreMemoryModel, pc: int = 0):
+        """
+        Parameters
+        ----------
+        mem_model: CoreMemoryModel
+            Memory of the simulated program.
+        pc: int
+            Address of the first instruction.
+        """
+        self.mem_model = mem_model
+        self.regs = [0] * 32
+        self.pc = pc
+        self.instret = 0
+        self.mcause = 0
+        self._decoded: dict[int, tuple[Callable[[int], int], int]] = {}
+
+    def step(self) -> RetiredInstr:
+        """Executes a single instruction."""
+        pc = self.pc
+        decoded = self._decoded.get(pc)
+        if decoded is None:
+            decoded = self._decode(pc)
+        fn, rd = decoded
+        self.pc = fn(pc)
+        self.instret += 1
+        return RetiredInstr(pc=pc, rd=rd, rd_data=self.regs[rd], next_pc=self.pc)
+
+    def run(self, max_instrs: int, *, stop_pc: Optional[int] = None, running: Callable[[], bool] = lambda: True) -> int:
+        """Executes instructions until a limit is reached.
+
+        Parameters
+        ----------
+        max_instrs: int
+            Maximum number of instructions to execute.
+        stop_pc: int, optional
+            Stop before executing the instruction at this address.
+        running: Callable[[], bool]
+            Checked after every instruction, the simulation stops when it returns False.
+
+        Returns
+        -------
+        int
+            The number of executed instructions.
+        """
+        decoded = self._decoded
+        decode = self._decode
+        pc = self.pc
+        count = 0
+        try:
+            while count < max_instrs and pc != stop_pc:
+                fn = decoded.get(pc)
+                pc = (fn or decode(pc))[0](pc)
+                # Kept up to date for reading the counter CSRs.
+                self.instret += 1
+                count += 1
+                if not running():
+                    break
+        finally:
+            self.pc = pc
+        return count
+
+    def _trap(self, cause: ExceptionCause, pc: int) -> Trap:
+        self.mcause = cause | 1 << 31
+        return Trap(cause, pc)
+
+    def _fetch(self, addr: int) -> int:
+        reply = self.mem_model.read(ReadRequest(addr=addr & ~3, byte_count=4, byte_sel=0xF, exec=True))
+        if reply.status != ReplyStatus.OK:
+            raise self._trap(ExceptionCause.INSTRUCTION_ACCESS_FAULT, addr)
+        return reply.data >> (8 * (addr & 3)) & 0xFFFF
+
+    def load(self, addr: int, size: int, signed: bool, pc: int) -> int:
+        if addr % size:
+            raise self._trap(ExceptionCause.LOAD_ADDRESS_MISALIGNED, pc)
+        shift = 8 * (addr & 3)
+        sel = ((1 << size) - 1) << (addr & 3)
+        reply = self.mem_model.read(ReadRequest(addr=addr & ~3, byte_count=4, byte_sel=sel, exec=False))
+        if reply.status != ReplyStatus.OK:
+            raise self._trap(ExceptionCause.LOAD_ACCESS_FAULT, pc)
+        value = reply.data >> shift & ((1 << (8 * size)) - 1)
+        return _sext(value, 8 * size) & _MASK if signed else value
+
+    def store(self, addr: int, data: int, size: int, pc: int):
+        if addr % size:
+            raise self._trap(ExceptionCause.STORE_ADDRESS_MISALIGNED, pc)
+        shift = 8 * (addr & 3)
+        sel = ((1 << size) - 1) << (addr & 3)
+        reply = self.mem_model.write(
+            WriteRequest(addr=addr & ~3, data=data << shift & _MASK, byte_count=4, byte_sel=sel)
+        )
+        if reply.status != ReplyStatus.OK:
+            raise self._trap(ExceptionCause.STORE_ACCESS_FAULT, pc)
+        # Self-modifying code: drop the instructions overlapping the written bytes.
+        if self._decoded:
+            for start in range((addr & ~1) - 2, addr + size, 2):
+                self._decoded.pop(start, None)
+
+    def _read_csr(self, csr: int, pc: int) -> int:
+        match csr:
+            case CSRAddress.MCAUSE:
+                return self.mcause
+            case CSRAddress.CYCLE | CSRAddress.TIME | CSRAddress.INSTRET:
+                return self.instret & _MASK
+            case CSRAddress.CYCLEH | CSRAddress.TIMEH | CSRAddress.INSTRETH:
+                return self.instret >> 32 & _MASK
+        raise self._trap(ExceptionCause.ILLEGAL_INSTRUCTION, pc)
+
+    def _write_csr(self, csr: int, value: int, pc: int):
+        if csr != CSRAddress.MCAUSE:
+            raise self._trap(ExceptionCause.ILLEGAL_INSTRUCTION, pc)
+        self.mcause = value
+
+    def _decode(self, pc: int) -> tuple[Callable[[int], int], int]:
+        instr = self._fetch(pc)
+        if instr & 0b11 == 0b11:
+            instr |= self._fetch(pc + 2) << 16
+            length = 4
+        else:
+            expanded = expand_compressed(instr)
+            if expanded is None:
+                raise self._trap(ExceptionCause.ILLEGAL_INSTRUCTION, pc)
+            instr = expanded
+            length = 2
+
+        decoded = self._decode_instr(instr, length)
+        if decoded is None:
+            raise self._trap(ExceptionCause.ILLEGAL_INSTRUCTION, pc)
+
+        self._decoded[pc] = decoded
+        return decoded
+
+    def _decode_instr(self, instr: int, length: int) -> Optional[tuple[Callable[[int], int], int]]:
+        regs = self.regs
+
+        if instr & 0b11 != 0b11:
+            return None
+
+        opcode = instr >> 2 & 0x1F
+        rd = instr >> 7 & 0x1F
+        funct3 = instr >> 12 & 0b111
+        rs1 = instr >> 15 & 0x1F
+        rs2 = instr >> 20 & 0x1F
+        funct7 = instr >> 25
+        imm_i = _sext(instr >> 20, 12)
+
+        def nop(pc: int) -> int:
+            return pc + length
+
+        match opcode:
+            case Opcode.LUI | Opcode.AUIPC:
+                imm_u = instr & 0xFFFFF000
+                if rd == 0:
+                    return nop, 0
+                if opcode == Opcode.LUI:
+
+                    def lui(pc: int) -> int:
+                        regs[rd] = imm_u
+                        return pc + length
+
+                    return lui, rd
+
+                def auipc(pc: int) -> int:
+                    regs[rd] = (pc + imm_u) & _MASK
+                    return pc + length
+
+                return auipc, rd
+
+            case Opcode.JAL:
+                imm_j = _sext(_bits(instr, (31, 31, 20), (30, 21, 1), (20, 20, 11), (19, 12, 12)), 21)
+
+                def jal(pc: int) -> int:
+                    regs[rd] = (pc + length) & _MASK
+                    regs[0] = 0
+                    return (pc + imm_j) & _MASK
+
+                return jal, rd
+
+            case Opcode.JALR:
+                if funct3 != Funct3.JALR:
+                    return None
+
+                def jalr(pc: int) -> int:
+                    target = (regs[rs1] + imm_i) & _MASK & ~1
+                    regs[rd] = (pc + length) & _MASK
+                    regs[0] = 0
+                    return target
+
+                return jalr, rd
+
+            case Opcode.BRANCH:
+                cond = _branch_conditions.get(funct3)
+                if cond is None:
+                    return None
+                imm_b = _sext(_bits(instr, (31, 31, 12), (30, 25, 5), (11, 8, 1), (7, 7, 11)), 13)
+
+                if funct3 == Funct3.BEQ:
+
+                    def beq(pc: int) -> int:
+                        return (pc + imm_b) & _MASK if regs[rs1] == regs[rs2] else pc + length
+
+                    return beq, 0
+
+                if funct3 == Funct3.BNE:
+
+                    def bne(pc: int) -> int:
+                        return (pc + imm_b) & _MASK if regs[rs1] != regs[rs2] else pc + length
+
+                    return bne, 0
+
+                def branch(pc: int) -> int:
+                    return (pc + imm_b) & _MASK if cond(regs[rs1], regs[rs2]) else pc + length
+
+                return branch, 0
+
+            case Opcode.LOAD:
+                load_type = _load_types.get(funct3)
+                if load_type is None:
+                    return None
+                size, signed = load_type
+                load_fn = self.load
+
+                def load(pc: int) -> int:
+                    regs[rd] = load_fn((regs[rs1] + imm_i) & _MASK, size, signed, pc)
+                    regs[0] = 0
+                    return pc + length
+
+                return load, rd
+
+            case Opcode.STORE:
+                size = _store_sizes.get(funct3, 0)
+                if size == 0:
+                    return None
+                imm_s = _sext(funct7 << 5 | rd, 12)
+                store_fn = self.store
+
+                def store(pc: int) -> int:
+                    store_fn((regs[rs1] + imm_s) & _MASK, regs[rs2], size, pc)
+                    return pc + length
+
+                return store, 0
+
+            case Opcode.OP_IMM:
+                if funct3 in (Funct3.SLL, Funct3.SR):
+                    unary_fn = _unary_functions.get((funct3, instr >> 20))
+                    if unary_fn is not None:
+
+                        def unary(pc: int) -> int:
+                            regs[rd] = unary_fn(regs[rs1])
+                            regs[0] = 0
+                            return pc + length
+
+                        return unary, rd
+
+                    shift_fn = _shift_imm_functions.get((funct3, funct7))
+                    if shift_fn is None:
+                        return None
+                    shamt = rs2
+
+                    def shift_imm(pc: int) -> int:
+                        regs[rd] = shift_fn(regs[rs1], shamt)
+                        regs[0] = 0
+                        return pc + length
+
+                    return shift_imm, rd
+
+                imm = imm_i & _MASK
+
+                if funct3 == Funct3.ADD:
+
+                    def addi(pc: int) -> int:
+                        regs[rd] = (regs[rs1] + imm) & _MASK
+                        regs[0] = 0
+                        return pc + length
+
+                    return addi, rd
+
+                op_fn = _op_functions[(funct3, Funct7.ADD)]
+
+                def op_imm(pc: int) -> int:
+                    regs[rd] = op_fn(regs[rs1], imm)
+                    regs[0] = 0
+                    return pc + length
+
+                return op_imm, rd
+
+            case Opcode.OP:
+                if (funct3, funct7) == (Funct3.ZEXTH, Funct7.ZEXTH):
+                    if rs2 != 0:
+                        return None
+
+                    def zext_h(pc: int) -> int:
+                        regs[rd] = regs[rs1] & 0xFFFF
+                        regs[0] = 0
+                        return pc + length
+
+                    return zext_h, rd
+
+                op_fn = _op_functions.get((funct3, funct7))
+                if op_fn is None:
+                    return None
+
+                if (funct3, funct7) == (Funct3.ADD, Funct7.ADD):
+
+                    def add(pc: int) -> int:
+                        regs[rd] = (regs[rs1] + regs[rs2]) & _MASK
+                        regs[0] = 0
+                        return pc + length
+
+                    return add, rd
+
+                def op(pc: int) -> int:
+                    regs[rd] = op_fn(regs[rs1], regs[rs2])
+                    regs[0] = 0
+                    return pc + length
+
+                return op, rd
+
+            case Opcode.MISC_MEM:
+                # Memory is always coherent and stores invalidate the decoded instructions.
+                if funct3 not in (Funct3.FENCE, Funct3.FENCEI):
+                    return None
+                return nop, 0
+
+            case Opcode.SYSTEM:
+                return self._decode_system(instr, length)
+
+        return None
+
+    def _decode_system(self, instr: int, length: int) -> Optional[tuple[Callable[[int], int], int]]:
+        regs = self.regs
+        rd = instr >> 7 & 0x1F
+        funct3 = instr >> 12 & 0b111
+        rs1 = instr >> 15 & 0x1F
+        csr = instr >> 20
+
+        if funct3 == Funct3.PRIV:
+            if rd != 0 or rs1 != 0 or csr not in (Funct12.ECALL, Funct12.EBREAK):
+                return None
+            cause = ExceptionCause.ENVIRONMENT_CALL_FROM_M if csr == Funct12.ECALL else ExceptionCause.BREAKPOINT
+
+            def priv(pc: int) -> int:
+                raise self._trap(cause, pc)
+
+            return priv, 0
+
+        if funct3 not in (Funct3.CSRRW, Funct3.CSRRS, Funct3.CSRRC, Funct3.CSRRWI, Funct3.CSRRSI, Funct3.CSRRCI):
+            return None
+
+        immediate = funct3 & 0b100
+        kind = funct3 & 0b11
+        # CSRRW doesn't read the CSR if rd is x0, CSRRS/CSRRC don't write it if rs1 is x0.
+        reads = kind != Funct3.CSRRW or rd != 0
+        writes = kind == Funct3.CSRRW or rs1 != 0
+
+        def csr_op(pc: int) -> int:
+            old = self._read_csr(csr, pc) if reads else 0
+            src = rs1 if immediate else regs[rs1]
+            if writes:
+                if kind == Funct3.CSRRW:
+                    self._write_csr(csr, src, pc)
+                elif kind == Funct3.CSRRS:
+                    self._write_csr(csr, old | src, pc)
+                else:
+                    self._write_csr(csr, old & ~src & _MASK, pc)
+            regs[rd] = old
+            regs[0] = 0
+            return pc + length
+
+        return csr_op, rd
+
+
+class ISASimulation(SimulationBackend):
+    """Simulation backend using the functional simulator.
+
+    Runs programs without timing, e.g. to check them before a cycle-accurate
+    simulation. The timeout is given in instructions instead of cycles. Like
+    the core, which has no trap handling, the simulation fails at the first
+    exception.
+    """
+
+    def __init__(self, verbose: bool, pc: int = 0):
+        self.verbose = verbose
+        self.pc = pc
+        self.running = False
+
+    async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
+        sim = ISASimulator(mem_model, self.pc)
+
+        self.running = True
+        try:
+            sim.run(timeout_cycles, running=lambda: self.running)
+        except Trap as trap:
+            if self.verbose:
+                print(f"Simulation stopped after {sim.instret} instructions: {trap}")
+            return False
+
+        if self.verbose:
+            print(f"Simulation finished after {sim.instret} instructions")
+
+        return not self.running
+
+    def stop(self):
+        self.running = False
@@ -1,7 +1,9 @@
+import bisect
+import struct
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from enum import Enum, IntFlag, auto
-from typing import Optional, TypeVar
+from typing import BinaryIO, Optional, TypeVar, cast
 from dataclasses import dataclass, replace
 from elftools.elf.constants import P_FLAGS
 from elftools.elf.elffile import ELFFile, Segment
@@ -17,6 +19,7 @@ all = [
     "MemoryModel",
     "RAMSegment",
     "CoreMemoryModel",
+    "plain_ram_segments",
 ]
 
 
@@ -73,6 +76,11 @@ class MemorySegment(ABC):
         raise NotImplementedError
 
 
+# Byte masks for the `byte_sel` values of 32-bit word accesses.
+_word_masks = [sum(0xFF << (8 * i) for i in range(4) if sel & (1 << i)) for sel in range(16)]
+_word = struct.Struct("<I")
+
+
 class RandomAccessMemory(MemorySegment):
     def __init__(self, address_range: range, flags: SegmentFlags, data: bytes):
         super().__init__(address_range, flags)
@@ -81,14 +89,30 @@ class RandomAccessMemory(MemorySegment):
         if len(self.data) != len(address_range):
             raise ValueError("Data length must be equal to the length of the address range")
 
+    def read_word(self, offset: int, byte_count: int) -> int:
+        """Reads data at the given offset from the start of the segment."""
+        if byte_count == 4 and offset + 4 <= len(self.data):
+            return _word.unpack_from(self.data, offset)[0]
+        return int.from_bytes(self.data[offset : offset + byte_count], "little")
+
+    def write_word(self, offset: int, data: int, byte_count: int, byte_sel: int):
+        """Writes the selected bytes of data at the given offset from the start of the segment."""
+        mask = _word_masks[byte_sel & 0xF]
+        if byte_count == 4 and offset + 4 <= len(self.data):
+            old = _word.unpack_from(self.data, offset)[0]
+            _word.pack_into(self.data, offset, old & ~mask | data & mask)
+        else:
+            # the access may be cut short by the end of the segment
+            size = min(byte_count, len(self.data) - offset)
+            old = int.from_bytes(self.data[offset : offset + size], "little")
+            new = (old & ~mask | data & mask) & ((1 << (8 * size)) - 1)
+            self.data[offset : offset + size] = new.to_bytes(size, "little")
+
     def read(self, req: ReadRequest) -> ReadReply:
-        return ReadReply(data=int.from_bytes(self.data[req.addr : req.addr + req.byte_count], "little"))
+        return ReadReply(data=self.read_word(req.addr, req.byte_count))
 
     def write(self, req: WriteRequest) -> WriteReply:
-        mask_bytes = [b"\x00", b"\xff"]
-        mask = int.from_bytes(b"".join(mask_bytes[1 & (req.byte_sel >> i)] for i in range(4)), "little")
-        old = int.from_bytes(self.data[req.addr : req.addr + req.byte_count], "little")
-        self.data[req.addr : req.addr + req.byte_count] = (old & ~mask | req.data & mask).to_bytes(4, "little")
+        self.write_word(req.addr, req.data, req.byte_count, req.byte_sel)
         return WriteReply()
 
 
@@ -97,14 +121,48 @@ TRep = TypeVar("TRep", bound=ReadReply | WriteReply)
 
 
 class CoreMemoryModel:
+    """Memory seen by the core, consisting of non-overlapping segments.
+
+    Segments are looked up by binary search, and the last segment found is
+    checked first. Accesses to plain `RandomAccessMemory` segments don't
+    allocate a request with a segment-relative address.
+    """
+
     def __init__(self, segments: list[MemorySegment], fail_on_undefined=True):
         self.segments = segments
         self.fail_on_undefined = fail_on_undefined
 
+        self._sorted_segments = sorted(segments, key=lambda seg: seg.address_range.start)
+        self._starts = [seg.address_range.start for seg in self._sorted_segments]
+        for prev, seg in zip(self._sorted_segments, self._sorted_segments[1:]):
+            if prev.address_range.stop > seg.address_range.start:
+                raise ValueError(
+                    "Overlapping memory segments: %x and %x" % (prev.address_range.start, seg.address_range.start)
+                )
+
+        self._plain_ram = set(map(id, plain_ram_segments(segments)))
+        self._last_segment: Optional[MemorySegment] = None
+
+    def find_segment(self, addr: int) -> Optional[MemorySegment]:
+        seg = self._last_segment
+        if seg is not None and seg.address_range.start <= addr < seg.address_range.stop:
+            return seg
+
+        idx = bisect.bisect_right(self._starts, addr) - 1
+        if idx < 0:
+            return None
+
+        seg = self._sorted_segments[idx]
+        if addr >= seg.address_range.stop:
+            return None
+
+        self._last_segment = seg
+        return seg
+
     def _run_on_range(self, f: Callable[[MemorySegment, TReq], TRep], req: TReq) -> Optional[TRep]:
-        for seg in self.segments:
-            if req.addr in seg.address_range:
-                return f(seg, req)
+        seg = self.find_segment(req.addr)
+        if seg is not None:
+            return f(seg, req)
 
     def _do_read(self, seg: MemorySegment, req: ReadRequest) -> ReadReply:
         if SegmentFlags.READ not in seg.flags:
@@ -112,12 +170,21 @@ class CoreMemoryModel:
         if req.exec and SegmentFlags.EXECUTABLE not in seg.flags:
             raise RuntimeError("Memory is not executable: %x" % req.addr)
 
+        if id(seg) in self._plain_ram:
+            ram = cast(RandomAccessMemory, seg)
+            return ReadReply(data=ram.read_word(req.addr - seg.address_range.start, req.byte_count))
+
         return seg.read(replace(req, addr=req.addr - seg.address_range.start))
 
     def _do_write(self, seg: MemorySegment, req: WriteRequest) -> WriteReply:
         if SegmentFlags.WRITE not in seg.flags:
             raise RuntimeError("Tried to write to non-writable memory: %x" % req.addr)
 
+        if id(seg) in self._plain_ram:
+            ram = cast(RandomAccessMemory, seg)
+            ram.write_word(req.addr - seg.address_range.start, req.data, req.byte_count, req.byte_sel)
+            return WriteReply()
+
         return seg.write(replace(req, addr=req.addr - seg.address_range.start))
 
     def read(self, req: ReadRequest) -> ReadReply:
@@ -139,6 +206,42 @@ class CoreMemoryModel:
             return WriteReply(status=ReplyStatus.ERROR)
 
 
+def plain_ram_segments(segments: list[MemorySegment]) -> list[RandomAccessMemory]:
+    """Selects the RAM segments which can be simulated outside of Python.
+
+    Subclasses of `RandomAccessMemory` (e.g. MMIO) can have side effects, so they are not included.
+    """
+    return [seg for seg in segments if type(seg) is RandomAccessMemory]
+
+
+# Segment header of memory images: start address, length, flags.
+# Keep in sync with cocotb/wishbone_memory.cpp.
+_image_header = struct.Struct("<III")
+
+
+def write_memory_image(file: BinaryIO, segments: list[RandomAccessMemory]):
+    """Writes the contents of the segments, each preceded by its address range and flags."""
+    for seg in segments:
+        file.write(_image_header.pack(seg.address_range.start, len(seg.data), seg.flags))
+        file.write(seg.data)
+
+
+def read_memory_image(file: BinaryIO, segments: list[RandomAccessMemory]):
+    """Reads back the contents of the segments written by `write_memory_image`."""
+    for seg in segments:
+        _, length, _ = _image_header.unpack(file.read(_image_header.size))
+        seg.data[:] = file.read(length)
+
+
+def load_memory_image(file: BinaryIO) -> list[RandomAccessMemory]:
+    """Creates the segments stored by `write_memory_image`, reading until the end of the file."""
+    segments: list[RandomAccessMemory] = []
+    while header := file.read(_image_header.size):
+        start, length, flags = _image_header.unpack(header)
+        segments.append(RandomAccessMemory(range(start, start + length), SegmentFlags(flags), file.read(length)))
+    return segments
+
+
 def load_segment(segment: Segment, *, disable_write_protection: bool = False) -> RandomAccessMemory:
     paddr = segment.header["p_paddr"]
     memsz = segment.header["p_memsz"]
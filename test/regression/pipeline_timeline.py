@@ -0,0 +1,86 @@
+from typing import TextIO
+
+__all__ = ["O3PipeViewWriter"]
+
+
+class O3PipeViewWriter:
+    """Writes the pipeline timelines of the retired instructions.
+
+    The output uses the O3PipeView format of gem5, which can be viewed with
+    Konata or gem5's `util/o3-pipeview.py`. The instructions are shown as
+    their hexadecimal encodings.
+
+    The timestamps in the retirement trace are counted modulo
+    `2**timestamp_bits`, so they are extended relative to the retirement of
+    the previous instruction. The stages which weren't reported for an
+    instruction (e.g. the issue of a fence) hold the timestamp of an older
+    instruction, so the timestamps are clamped to be non-decreasing.
+    """
+
+    # Names of the stages of the retirement trace timeline in the O3PipeView format.
+    stage_names = {
+        "fetch": "fetch",
+        "decode": "decode",
+        "rename": "rename",
+        "dispatch": "dispatch",
+        "issue": "issue",
+        "writeback": "complete",
+        "retire": "retire",
+    }
+
+    def __init__(self, file: TextIO, ticks_per_cycle: int = 1000, timestamp_bits: int = 32):
+        """
+        Parameters
+        ----------
+        file: TextIO
+            Output file.
+        ticks_per_cycle: int
+            Clock period in gem5 ticks. The default is the period of a 1 GHz clock.
+        timestamp_bits: int
+            Width of the timestamps in the retirement trace.
+        """
+        self.file = file
+        self.ticks_per_cycle = ticks_per_cycle
+        self.timestamp_mod = 2**timestamp_bits
+        self.retire_cycle = 0
+        self.seq_num = 0
+
+    def write(self, pc: int, instr: int, timeline: dict[str, int], store: bool = False):
+        """Writes the timeline of a retired instruction.
+
+        Parameters
+        ----------
+        pc: int
+            Address of the instruction.
+        instr: int
+            The instruction.
+        timeline: dict[str, int]
+            Timestamps of the stages in `RetirementTraceLayouts.stages`.
+        store: bool
+            The instruction wrote to the memory. Stores are performed before
+            retirement, so they are shown at the writeback.
+        """
+        self.retire_cycle += (timeline["retire"] - self.retire_cycle) % self.timestamp_mod
+        self.seq_num += 1
+
+        cycles = {}
+        last = None
+        for stage in self.stage_names:
+            cycle = self.retire_cycle - (timeline["retire"] - timeline[stage]) % self.timestamp_mod
+            if last is not None:
+                cycle = max(cycle, last)
+            cycles[stage] = last = cycle
+
+        ticks = {stage: cycle * self.ticks_per_cycle for stage, cycle in cycles.items()}
+        store_tick = ticks["writeback"] if store else 0
+
+        lines = [f"O3PipeView:fetch:{ticks['fetch']}:0x{pc:08x}:0:{self.seq_num}:{instr:08x}"]
+        for stage, name in self.stage_names.items():
+            if stage == "fetch":
+                continue
+            if stage == "retire":
+                lines.append(f"O3PipeView:{name}:{ticks[stage]}:store:{store_tick}")
+            else:
+                lines.append(f"O3PipeView:{name}:{ticks[stage]}")
+
+        self.file.write("\n".join(lines) + "\n")
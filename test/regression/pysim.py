@@ -1,34 +1,147 @@
-from amaranth.sim import Passive, Settle
+from typing import BinaryIO, Optional, TextIO
+
+from amaranth import *
+from amaranth.sim import Passive, Settle, Tick
 from amaranth.utils import log2_int
 
 from .memory import *
 from .common import SimulationBackend
+from .commit_log import CommitRecord, write_commit_record
+from .pipeline_timeline import O3PipeViewWriter
 
 from ..common import SimpleTestCircuit, PysimSimulator
 from ..peripherals.test_wishbone import WishboneInterfaceWrapper
 
 from coreblocks.core import Core
-from coreblocks.params import GenParams
-from coreblocks.params.configurations import full_core_config
+from coreblocks.params import GenParams, RetirementTraceLayouts
+from coreblocks.params.configurations import CoreConfiguration, full_core_config
+from coreblocks.structs_common.retirement_trace import RetirementTrace
 from coreblocks.peripherals.wishbone import WishboneBus
+from transactron.utils import ModuleConnector
+
+
+class SimulationEvents(Elaboratable):
+    """Wake-up events for the Wishbone slave processes.
+
+    Amaranth simulation processes can only wait for clock edges. For each bus,
+    this module defines a clock domain, whose clock rises when a request starts
+    on the bus or when the simulation is stopped. This allows the slave
+    processes to sleep while the bus is idle instead of checking it every
+    cycle. Similarly, the clock of the `instret_limit` domain rises when the
+    number of retired instructions reaches `instret_limit`, and the clock of
+    the `retirement_trace` domain rises when the retirement trace port becomes
+    valid. The module also counts the simulated cycles.
+    """
+
+    def __init__(self, buses: dict[str, WishboneBus], instret: Value, trace_valid: Value = C(0)):
+        """
+        Parameters
+        ----------
+        buses: dict[str, WishboneBus]
+            Buses to watch, keyed by the name of the clock domain to define.
+        instret: Value
+            Number of the instructions retired by the core.
+        trace_valid: Value
+            Valid bit of the retirement trace port of the core, if enabled.
+        """
+        self.buses = buses
+        self.instret = instret
+        self.trace_valid = trace_valid
+        self.instret_limit = Signal(64)
+        self.stop = Signal()
+        self.cycles = Signal(64)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        m.d.sync += self.cycles.eq(self.cycles + 1)
+
+        cd_instret = ClockDomain("instret_limit", reset_less=True)
+        m.domains += cd_instret
+        m.d.comb += cd_instret.clk.eq((self.instret >= self.instret_limit) | self.stop)
+
+        cd_trace = ClockDomain("retirement_trace", reset_less=True)
+        m.domains += cd_trace
+        m.d.comb += cd_trace.clk.eq(self.trace_valid)
+
+        for domain, bus in self.buses.items():
+            cd = ClockDomain(domain, reset_less=True)
+            m.domains += cd
+            m.d.comb += cd.clk.eq(bus.stb & bus.cyc | self.stop)
+
+        return m
 
 
 class PySimulation(SimulationBackend):
-    def __init__(self, verbose: bool, traces_file: Optional[str] = None):
-        self.gp = GenParams(full_core_config)
+    """Simulation backend using the Amaranth simulator.
+
+    The core is elaborated on the first call of `run`. The following calls
+    reuse the simulator, resetting it to the initial state (including the
+    contents of memories) before running the next program. When traces are
+    dumped, a new simulator is created for every program.
+
+    When `commit_log_file` is set, the retirement trace port of the core is
+    enabled, and every retired instruction is written to the file (see
+    `commit_log`). Similarly, when `timeline_file` is set, the pipeline
+    timeline is enabled, and the timelines of the retired instructions are
+    written to the file in the O3PipeView format (see `pipeline_timeline`).
+    The files can be changed between the runs.
+    """
+
+    def __init__(
+        self,
+        verbose: bool,
+        traces_file: Optional[str] = None,
+        config: CoreConfiguration = full_core_config,
+        commit_log_file: Optional[str] = None,
+        timeline_file: Optional[str] = None,
+    ):
+        if commit_log_file is not None:
+            config = config.replace(retirement_trace=True)
+        if timeline_file is not None:
+            config = config.replace(pipeline_timeline=True)
+        self.gp = GenParams(config)
+        self.commit_log_file = commit_log_file
+        self.timeline_file = timeline_file
+        self._commit_log: Optional[BinaryIO] = None
+        self._timeline_file: Optional[TextIO] = None
+        self._timeline: Optional[O3PipeViewWriter] = None
         self.running = False
         self.cycle_cnt = 0
         self.verbose = verbose
         self.traces_file = traces_file
+        self.mem_model: Optional[CoreMemoryModel] = None
+        self.sim: Optional[PysimSimulator] = None
+        self.instr_marks: list[int] = []
+        self.samples: list[tuple[int, int]] = []
+
+    def _wait_for_request(self, wb_ctrl: WishboneInterfaceWrapper, domain: str):
+        # Equivalent to `wb_ctrl.slave_wait`, but without waking up every cycle.
+        while self.running and not ((yield wb_ctrl.wb.stb) and (yield wb_ctrl.wb.cyc)):
+            yield Settle()
+            # The request could have started on the last clock edge.
+            if not ((yield wb_ctrl.wb.stb) and (yield wb_ctrl.wb.cyc)):
+                yield Tick(domain)
+            yield
 
     def _wishbone_slave(
-        self, mem_model: CoreMemoryModel, wb_ctrl: WishboneInterfaceWrapper, is_instr_bus: bool, delay: int = 0
+        self,
+        wb_ctrl: WishboneInterfaceWrapper,
+        events: SimulationEvents,
+        domain: str,
+        is_instr_bus: bool,
+        delay: int = 0,
     ):
         def f():
-            yield Passive()
+            # The process is restarted when the simulator is reset for the next program.
+            mem_model = self.mem_model
+            assert mem_model is not None
 
             while True:
-                yield from wb_ctrl.slave_wait()
+                yield from self._wait_for_request(wb_ctrl, domain)
+
+                if not self.running:
+                    break
 
                 word_width_bytes = self.gp.isa.xlen // 8
 
@@ -63,6 +176,10 @@ class PySimulation(SimulationBackend):
                     if self.verbose:
                         print(f"Wishbone '{bus_name}' bus read response: data=0x{resp.data:x}")
 
+                if not self.running:
+                    # The request has stopped the simulation.
+                    self.cycle_cnt = yield events.cycles
+
                 ack = err = rty = 0
                 match resp.status:
                     case ReplyStatus.OK:
@@ -79,39 +196,186 @@ class PySimulation(SimulationBackend):
 
                 yield Settle()
 
+            # Wake up the slave of the other bus, so that the simulation can finish.
+            yield events.stop.eq(1)
+
         return f
 
-    def _waiter(self):
+    def _sampler(self, events: SimulationEvents):
         def f():
-            while self.running:
-                self.cycle_cnt += 1
+            # Records the cycle and instruction counts when the marks are reached.
+            instr_marks = self.instr_marks
+            self.samples = []
+
+            for mark in instr_marks:
+                yield events.instret_limit.eq(mark)
+                yield Settle()
+                while self.running and (yield events.instret) < mark:
+                    yield Tick("instret_limit")
+                    yield Settle()
+
+                self.samples.append(((yield events.cycles), (yield events.instret)))
+                if not self.running:
+                    return
+
+            if instr_marks:
+                # The last mark stops the simulation.
+                self.running = False
+                self.cycle_cnt = yield events.cycles
+                yield events.stop.eq(1)
+
+        return f
+
+    def _retirement_logger(self, retirement_trace: RetirementTrace):
+        trace = Value.cast(retirement_trace.trace)
+        # Offsets of the fields in the value of the record, for reading it with a single `yield`.
+        fields: dict[str, tuple[int, int]] = {}
+        offset = 0
+        for name, _ in retirement_trace.layouts.trace:
+            if name == "timeline":
+                for stage in retirement_trace.layouts.stages:
+                    width = len(retirement_trace.trace.timeline[stage])
+                    fields[stage] = (offset, (1 << width) - 1)
+                    offset += width
+                continue
+            width = len(retirement_trace.trace[name])
+            fields[name] = (offset, (1 << width) - 1)
+            offset += width
+
+        def field(value: int, name: str) -> int:
+            offset, mask = fields[name]
+            return value >> offset & mask
+
+        def f():
+            yield Passive()
+
+            while True:
+                yield Settle()
+                value = yield trace
+                if not field(value, "valid"):
+                    yield Tick("retirement_trace")
+                    continue
+
+                if self._commit_log is not None:
+                    record = CommitRecord(
+                        pc=field(value, "pc"),
+                        instr=field(value, "instr"),
+                        rd=field(value, "rl_dst"),
+                        rd_data=field(value, "rd_data"),
+                        mem_addr=field(value, "mem_addr"),
+                        mem_rmask=field(value, "mem_rmask"),
+                        mem_wmask=field(value, "mem_wmask"),
+                        mem_data=field(value, "mem_data"),
+                        exception=bool(field(value, "exception")),
+                    )
+                    write_commit_record(self._commit_log, record)
+
+                if self._timeline is not None:
+                    self._timeline.write(
+                        pc=field(value, "pc"),
+                        instr=field(value, "instr"),
+                        timeline={stage: field(value, stage) for stage in retirement_trace.layouts.stages},
+                        store=field(value, "mem_wmask") != 0,
+                    )
+
                 yield
 
         return f
 
-    async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
+    def _create_simulator(self) -> PysimSimulator:
         wb_instr_bus = WishboneBus(self.gp.wb_params)
         wb_data_bus = WishboneBus(self.gp.wb_params)
         core = Core(gen_params=self.gp, wb_instr_bus=wb_instr_bus, wb_data_bus=wb_data_bus)
 
-        m = SimpleTestCircuit(core)
+        instret_csr = core.retirement.instret_csr
+        instret = Cat(instret_csr.register_low.value, instret_csr.register_high.value)
+        buses = {"wb_instr_request": wb_instr_bus, "wb_data_request": wb_data_bus}
+        if self.gp.retirement_trace:
+            events = SimulationEvents(buses, instret, core.retirement_trace.trace.valid)
+        else:
+            events = SimulationEvents(buses, instret)
+        m = ModuleConnector(core=SimpleTestCircuit(core), events=events)
 
         wb_instr_ctrl = WishboneInterfaceWrapper(wb_instr_bus)
         wb_data_ctrl = WishboneInterfaceWrapper(wb_data_bus)
 
+        sim = PysimSimulator(m, traces_file=self.traces_file)
+        sim.add_sync_process(self._wishbone_slave(wb_instr_ctrl, events, "wb_instr_request", is_instr_bus=True))
+        sim.add_sync_process(self._wishbone_slave(wb_data_ctrl, events, "wb_data_request", is_instr_bus=False))
+        sim.add_sync_process(self._sampler(events))
+        if self.gp.retirement_trace:
+            sim.add_sync_process(self._retirement_logger(core.retirement_trace))
+
+        return sim
+
+    async def run(self, mem_model: CoreMemoryModel, timeout_cycles: int = 5000) -> bool:
+        if self.sim is None or self.traces_file is not None:
+            self.sim = self._create_simulator()
+        else:
+            self.sim.reset()
+
+        self.mem_model = mem_model
         self.running = True
         self.cycle_cnt = 0
 
-        sim = PysimSimulator(m, max_cycles=timeout_cycles, traces_file=self.traces_file)
-        sim.add_sync_process(self._wishbone_slave(mem_model, wb_instr_ctrl, is_instr_bus=True))
-        sim.add_sync_process(self._wishbone_slave(mem_model, wb_data_ctrl, is_instr_bus=False))
-        sim.add_sync_process(self._waiter())
-        res = sim.run()
+        if self.commit_log_file is not None:
+            self._commit_log = open(self.commit_log_file, "wb")
+        if self.timeline_file is not None:
+            self._timeline_file = open(self.timeline_file, "w")
+            timestamp_bits = self.gp.get(RetirementTraceLayouts).timestamp_bits
+            self._timeline = O3PipeViewWriter(self._timeline_file, timestamp_bits=timestamp_bits)
+
+        try:
+            res = self.sim.run(max_cycles=timeout_cycles)
+        finally:
+            if self._commit_log is not None:
+                self._commit_log.close()
+                self._commit_log = None
+            if self._timeline_file is not None:
+                self._timeline_file.close()
+                self._timeline_file = None
+                self._timeline = None
+
+        if not res:
+            self.cycle_cnt = timeout_cycles
 
         if self.verbose:
             print(f"Simulation finished in {self.cycle_cnt} cycles")
 
         return res
 
+    async def run_sample(
+        self, mem_model: CoreMemoryModel, warmup_instrs: int, sample_instrs: int, timeout_cycles: int = 5000
+    ) -> tuple[int, int]:
+        """Measures the cycles taken by a fragment of a program.
+
+        Parameters
+        ----------
+        mem_model: CoreMemoryModel
+            Memory of the simulated program.
+        warmup_instrs: int
+            Number of the instructions retired before the measured fragment.
+        sample_instrs: int
+            Number of the instructions in the measured fragment. The simulation
+            stops after them, or earlier if the program finishes.
+
+        Returns
+        -------
+        tuple[int, int]
+            The numbers of cycles and instructions of the measured fragment.
+        """
+        self.instr_marks = [warmup_instrs, warmup_instrs + sample_instrs]
+        try:
+            if not await self.run(mem_model, timeout_cycles):
+                raise RuntimeError("Simulation timed out")
+        finally:
+            self.instr_marks = []
+
+        if len(self.samples) < 2:
+            raise RuntimeError("The program finished during the warmup")
+
+        (start_cycle, start_instr), (end_cycle, end_instr) = self.samples
+        return end_cycle - start_cycle, end_instr - start_instr
+
     def stop(self):
         self.running = False
@@ -0,0 +1,78 @@
+from typing import Protocol
+
+from .memory import *
+from .benchmark import MMIO, embench_dir, write_results
+from .checkpoint import Checkpoint
+from .iss import ISASimulator
+
+from coreblocks.params import GenParams
+
+__all__ = ["SampledSimulationBackend", "run_sampled_benchmark"]
+
+
+class SampledSimulationBackend(Protocol):
+    """Simulation backend which can measure a fragment of a program, see `PySimulation.run_sample`."""
+
+    gp: GenParams
+
+    async def run_sample(
+        self, mem_model: CoreMemoryModel, warmup_instrs: int, sample_instrs: int, timeout_cycles: int = 5000
+    ) -> tuple[int, int]:
+        ...
+
+    def stop(self):
+        ...
+
+
+async def run_sampled_benchmark(
+    sim_backend: SampledSimulationBackend, benchmark_name: str, skip_instrs: int, warmup_instrs: int, sample_instrs: int
+):
+    """Measures a fragment of a benchmark, SimPoint-style.
+
+    The benchmark is fast-forwarded by the functional simulator, and the
+    detailed simulation starts from a checkpoint. Its boot stub is placed at
+    the `start_pc` of the simulated core. The instructions of the stub and
+    the warmup are not measured.
+
+    Parameters
+    ----------
+    sim_backend: SampledSimulationBackend
+        Backend running the detailed simulation, e.g. `PySimulation`.
+    benchmark_name: str
+        Name of the benchmark.
+    skip_instrs: int
+        Number of the instructions executed by the functional simulator.
+    warmup_instrs: int
+        Number of the instructions simulated in detail before the measured fragment.
+    sample_instrs: int
+        Number of the instructions in the measured fragment.
+    """
+    finished = False
+
+    def finish():
+        nonlocal finished
+        finished = True
+
+    mmio = MMIO(finish)
+
+    mem_segments: list[MemorySegment] = []
+    mem_segments += load_segments_from_elf(str(embench_dir.joinpath(f"{benchmark_name}/{benchmark_name}")))
+    mem_segments.append(mmio)
+
+    iss = ISASimulator(CoreMemoryModel(mem_segments))
+    iss.run(skip_instrs, running=lambda: not finished)
+
+    if finished:
+        raise RuntimeError("The benchmark finished before the sample")
+
+    checkpoint = Checkpoint.from_simulator(iss)
+    resumed_mmio = MMIO(lambda: sim_backend.stop())
+    resumed_mmio.data[:] = mmio.data
+    mem_model = checkpoint.memory_model([resumed_mmio], sim_backend.gp.start_pc)
+
+    stub_instrs = len(checkpoint.boot_stub(sim_backend.gp.start_pc)) // 4
+    cycles, instrs = await sim_backend.run_sample(
+        mem_model, stub_instrs + warmup_instrs, sample_instrs, timeout_cycles=5000000
+    )
+
+    write_results(benchmark_name, cycles, instrs)
@@ -0,0 +1,97 @@
+import asyncio
+import io
+import unittest
+from dataclasses import replace
+
+from coreblocks.params.configurations import full_core_config
+
+from .checkpoint import BOOT_ADDRESS, Checkpoint
+from .iss import ISASimulator
+from .memory import *
+from .pysim import PySimulation
+from .test import MMIO
+from .test_iss import arith_program
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.finished = False
+
+    def finish(self):
+        self.finished = True
+
+    def make_memory(self) -> tuple[CoreMemoryModel, MMIO]:
+        mmio = MMIO(self.finish)
+        mem_model = CoreMemoryModel(
+            [
+                RandomAccessMemory(
+                    range(0, 0x100),
+                    SegmentFlags.READ | SegmentFlags.EXECUTABLE,
+                    arith_program.ljust(0x100, b"\0"),
+                ),
+                RandomAccessMemory(range(0x1000, 0x1100), SegmentFlags.READ | SegmentFlags.WRITE, bytes(0x100)),
+                mmio,
+            ]
+        )
+        return mem_model, mmio
+
+    def take_checkpoint(self, instrs: int) -> Checkpoint:
+        mem_model, _ = self.make_memory()
+        sim = ISASimulator(mem_model)
+        sim.run(instrs)
+        return Checkpoint.from_simulator(sim)
+
+    def test_save_load(self):
+        checkpoint = self.take_checkpoint(12)
+
+        file = io.BytesIO()
+        checkpoint.save(file)
+        file.seek(0)
+        loaded = Checkpoint.load(file)
+
+        self.assertEqual(loaded.pc, checkpoint.pc)
+        self.assertEqual(loaded.regs, checkpoint.regs)
+        self.assertEqual(loaded.mcause, checkpoint.mcause)
+        self.assertEqual(len(loaded.segments), 2)
+        for seg, loaded_seg in zip(checkpoint.segments, loaded.segments):
+            self.assertEqual(loaded_seg.address_range, seg.address_range)
+            self.assertEqual(loaded_seg.flags, seg.flags)
+            self.assertEqual(loaded_seg.data, seg.data)
+
+        with self.assertRaises(ValueError):
+            Checkpoint.load(io.BytesIO(bytes(len(file.getvalue()))))
+
+    def test_resume(self):
+        mem_model, _ = self.make_memory()
+        reference = ISASimulator(mem_model)
+        reference.run(100, running=lambda: not self.finished)
+
+        self.finished = False
+        checkpoint = self.take_checkpoint(12)
+        mmio = MMIO(self.finish)
+        sim = ISASimulator(checkpoint.memory_model([mmio]), BOOT_ADDRESS)
+        sim.run(100, running=lambda: not self.finished)
+
+        self.assertTrue(self.finished)
+        self.assertEqual(sim.regs, reference.regs)
+        self.assertEqual(mmio.failed_test, 0x8091A2B8)
+
+    def test_jump_range(self):
+        checkpoint = self.take_checkpoint(12)
+
+        with self.assertRaises(ValueError):
+            checkpoint.boot_stub(0x200000)
+
+    def test_pysim_sample(self):
+        checkpoint = self.take_checkpoint(12)
+        backend = PySimulation(verbose=False, config=replace(full_core_config, start_pc=BOOT_ADDRESS))
+        mmio = MMIO(backend.stop)
+        stub_instrs = len(checkpoint.boot_stub()) // 4
+
+        cycles, instrs = asyncio.run(backend.run_sample(checkpoint.memory_model([mmio]), stub_instrs, 4, 3000))
+
+        self.assertEqual(instrs, 4)
+        self.assertGreaterEqual(cycles, 4)
+        # The registers restored by the stub are used by the final store.
+        asyncio.run(backend.run(checkpoint.memory_model([mmio]), 3000))
+        self.assertEqual(mmio.failed_test, 0x8091A2B8)
@@ -0,0 +1,90 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+from .commit_log import CommitRecord, compare_commit_log, read_commit_log, write_commit_record
+from .iss import ISASimulator
+from .memory import *
+from .pysim import PySimulation
+from .test import MMIO
+from .test_iss import program
+
+# Loads and stores, and instructions of all the extensions executed correctly by the core.
+commit_program = program(
+    "37553412",  # lui a0, 0x12345
+    "13058567",  # addi a0, a0, 0x678
+    "e555",  # c.li a1, -7
+    "3306b502",  # mul a2, a0, a1
+    "b356b502",  # divu a3, a0, a1
+    "3347b520",  # sh2add a4, a0, a1
+    "0564",  # c.lui s0, 1
+    "2311b400",  # sh a1, 2(s0)
+    "0440",  # c.lw s1, 0(s0)
+    "03493400",  # lbu s2, 3(s0)
+    "b7020080",  # lui t0, 0x80000
+    "23a0c200",  # sw a2, 0(t0)
+)
+
+
+def make_memory(mmio: MMIO) -> CoreMemoryModel:
+    return CoreMemoryModel(
+        [
+            RandomAccessMemory(
+                range(0, 0x100), SegmentFlags.READ | SegmentFlags.EXECUTABLE, commit_program.ljust(0x100, b"\0")
+            ),
+            RandomAccessMemory(range(0x1000, 0x1100), SegmentFlags.READ | SegmentFlags.WRITE, bytes(0x100)),
+            mmio,
+        ]
+    )
+
+
+class TestCommitLog(unittest.TestCase):
+    def reference_log(self) -> list[CommitRecord]:
+        sim = ISASimulator(make_memory(MMIO(lambda: None)))
+        records = []
+        for _ in range(11):
+            retired = sim.step()
+            records.append(CommitRecord(pc=retired.pc, instr=0, rd=retired.rd, rd_data=retired.rd_data))
+        return records
+
+    def test_write_read(self):
+        records = self.reference_log()
+        records[7] = replace(records[7], mem_addr=0x1000, mem_wmask=0xC, mem_data=0xFFF90000, exception=True)
+
+        file = io.BytesIO()
+        for record in records:
+            write_commit_record(file, record)
+        file.seek(0)
+
+        self.assertEqual(list(read_commit_log(file)), records)
+
+    def test_compare(self):
+        records = self.reference_log()
+        self.assertIsNone(compare_commit_log(records, ISASimulator(make_memory(MMIO(lambda: None)))))
+
+        records[5] = replace(records[5], rd_data=records[5].rd_data ^ 1)
+        divergence = compare_commit_log(records, ISASimulator(make_memory(MMIO(lambda: None))))
+        assert divergence is not None
+        self.assertTrue(divergence.startswith("Instruction 5 at pc=0x12"))
+
+    def test_pysim(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "commit.log")
+            backend = PySimulation(verbose=False, commit_log_file=log_file)
+            mmio = MMIO(backend.stop)
+
+            self.assertTrue(asyncio.run(backend.run(make_memory(mmio), 1000)))
+            self.assertEqual(mmio.failed_test, 0x8091A2B8)
+
+            with open(log_file, "rb") as f:
+                records = list(read_commit_log(f))
+
+        # The simulation stops at the store to MMIO, before it retires.
+        self.assertEqual(len(records), 11)
+        self.assertIsNone(compare_commit_log(records, ISASimulator(make_memory(MMIO(lambda: None)))))
+        self.assertEqual(records[0].instr, 0x12345537)
+        self.assertEqual((records[7].mem_addr, records[7].mem_wmask, records[7].mem_data), (0x1000, 0xC, 0xFFF90000))
+        self.assertEqual((records[8].mem_addr, records[8].mem_rmask), (0x1000, 0xF))
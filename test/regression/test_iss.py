@@ -0,0 +1,157 @@
+import asyncio
+import unittest
+
+from coreblocks.params.isa import ExceptionCause
+
+from .iss import ISASimulation, ISASimulator, RetiredInstr, Trap
+from .memory import *
+from .test import MMIO
+
+
+def program(*instrs: str) -> bytes:
+    """Builds a program from the hex encodings of instructions, in the byte order of the disassembly."""
+    return b"".join(bytes.fromhex(instr) for instr in instrs)
+
+
+# Instructions of all the extensions, including compressed ones.
+arith_program = program(
+    "37553412",  # lui a0, 0x12345
+    "13058567",  # addi a0, a0, 0x678
+    "e555",  # c.li a1, -7
+    "3306b502",  # mul a2, a0, a1
+    "b356b502",  # divu a3, a0, a1
+    "3347b520",  # sh2add a4, a0, a1
+    "93170560",  # clz a5, a0
+    "13588569",  # rev8 a6, a0
+    "9318f029",  # bseti a7, zero, 31
+    "0564",  # c.lui s0, 1
+    "2311b400",  # sh a1, 2(s0)
+    "0440",  # c.lw s1, 0(s0)
+    "03493400",  # lbu s2, 3(s0)
+    "fd54",  # c.li s1, -1
+    "8d04",  # c.addi s1, 3
+    "9204",  # c.slli s1, 4
+    "2689",  # c.mv s2, s1
+    "8584",  # c.srai s1, 1
+    "b7020080",  # lui t0, 0x80000
+    "23a0c200",  # sw a2, 0(t0)
+)
+
+# Overwrites an already executed instruction.
+self_modifying_program = program(
+    "97020000",  # auipc t0, 0
+    "ef00c001",  # jal ra, target
+    "37032000",  # lui t1, 0x200
+    "13033351",  # addi t1, t1, 0x513
+    "23a06202",  # sw t1, 32(t0)
+    "ef00c000",  # jal ra, target
+    "73001000",  # ebreak
+    "13000000",  # nop
+    # target:
+    "13051000",  # addi a0, zero, 1
+    "67800000",  # jalr zero, 0(ra)
+)
+
+
+class TestISASimulator(unittest.TestCase):
+    def setUp(self):
+        self.finished = False
+
+    def make_simulator(self, code: bytes) -> tuple[ISASimulator, MMIO]:
+        mmio = MMIO(self.finish)
+        mem_model = CoreMemoryModel(
+            [
+                RandomAccessMemory(
+                    range(0, 0x100),
+                    SegmentFlags.READ | SegmentFlags.EXECUTABLE | SegmentFlags.WRITE,
+                    code.ljust(0x100, b"\0"),
+                ),
+                RandomAccessMemory(range(0x1000, 0x1100), SegmentFlags.READ | SegmentFlags.WRITE, bytes(0x100)),
+                mmio,
+            ]
+        )
+        return ISASimulator(mem_model), mmio
+
+    def finish(self):
+        self.finished = True
+
+    def test_instructions(self):
+        sim, mmio = self.make_simulator(arith_program)
+
+        count = sim.run(100, running=lambda: not self.finished)
+
+        self.assertTrue(self.finished)
+        self.assertEqual(count, 20)
+        self.assertEqual(sim.instret, 20)
+        self.assertEqual(mmio.failed_test, 0x8091A2B8)
+
+        expected = {
+            "a0": (10, 0x12345678),
+            "a1": (11, 0xFFFFFFF9),
+            "a2": (12, 0x8091A2B8),
+            "a3": (13, 0),
+            "a4": (14, 0x48D159D9),
+            "a5": (15, 3),
+            "a6": (16, 0x78563412),
+            "a7": (17, 0x80000000),
+            "s1": (9, 16),
+            "s2": (18, 32),
+        }
+        for name, (reg, value) in expected.items():
+            self.assertEqual(sim.regs[reg], value, name)
+
+    def test_step(self):
+        sim, _ = self.make_simulator(arith_program)
+
+        self.assertEqual(sim.step(), RetiredInstr(pc=0, rd=10, rd_data=0x12345000, next_pc=4))
+        sim.step()
+        self.assertEqual(sim.step(), RetiredInstr(pc=8, rd=11, rd_data=0xFFFFFFF9, next_pc=10))
+
+    def test_self_modifying_code(self):
+        sim, _ = self.make_simulator(self_modifying_program)
+
+        sim.run(100, stop_pc=0x18)
+
+        self.assertEqual(sim.regs[10], 2)
+
+    def test_traps(self):
+        sim, _ = self.make_simulator(self_modifying_program)
+
+        with self.assertRaises(Trap) as ctx:
+            sim.run(100)
+
+        self.assertEqual(ctx.exception.cause, ExceptionCause.BREAKPOINT)
+        self.assertEqual(ctx.exception.pc, 0x18)
+        self.assertEqual(sim.pc, 0x18)
+        self.assertEqual(sim.mcause, ExceptionCause.BREAKPOINT | 1 << 31)
+
+        sim, _ = self.make_simulator(program("0000"))
+
+        with self.assertRaises(Trap) as ctx:
+            sim.step()
+
+        self.assertEqual(ctx.exception.cause, ExceptionCause.ILLEGAL_INSTRUCTION)
+
+
+class TestISASimulation(unittest.TestCase):
+    def run_program(self, code: bytes, timeout: int) -> bool:
+        backend = ISASimulation(verbose=False)
+        mem_model = CoreMemoryModel(
+            [
+                RandomAccessMemory(
+                    range(0, 0x100), SegmentFlags.READ | SegmentFlags.EXECUTABLE, code.ljust(0x100, b"\0")
+                ),
+                RandomAccessMemory(range(0x1000, 0x1100), SegmentFlags.READ | SegmentFlags.WRITE, bytes(0x100)),
+                MMIO(backend.stop),
+            ]
+        )
+        return asyncio.run(backend.run(mem_model, timeout))
+
+    def test_finish(self):
+        self.assertTrue(self.run_program(arith_program, 100))
+
+    def test_timeout(self):
+        self.assertFalse(self.run_program(arith_program, 10))
+
+    def test_trap(self):
+        self.assertFalse(self.run_program(arith_program[:8] + program("73001000"), 100))  # ebreak
@@ -0,0 +1,201 @@
+import random
+import unittest
+from typing import Optional
+
+from .memory import *
+
+_rw = SegmentFlags.READ | SegmentFlags.WRITE
+
+
+class RecordingSegment(MemorySegment):
+    """A segment with side effects, which records the requests it receives."""
+
+    def __init__(self, address_range: range):
+        super().__init__(address_range, _rw)
+        self.requests: list[ReadRequest | WriteRequest] = []
+
+    def read(self, req: ReadRequest) -> ReadReply:
+        self.requests.append(req)
+        return ReadReply(data=0x12345678)
+
+    def write(self, req: WriteRequest) -> WriteReply:
+        self.requests.append(req)
+        return WriteReply()
+
+
+class TestCoreMemoryModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+
+    def read(self, mem: CoreMemoryModel, addr: int, byte_count: int = 4) -> ReadReply:
+        return mem.read(ReadRequest(addr=addr, byte_count=byte_count, byte_sel=0xF, exec=False))
+
+    def write(self, mem: CoreMemoryModel, addr: int, data: int, byte_count: int = 4, byte_sel: int = 0xF):
+        return mem.write(WriteRequest(addr=addr, data=data, byte_count=byte_count, byte_sel=byte_sel))
+
+    def test_overlapping_segments(self):
+        for first, second in [(range(0, 0x10), range(0xC, 0x20)), (range(0x10, 0x20), range(0x14, 0x18))]:
+            with self.assertRaises(ValueError):
+                CoreMemoryModel([RandomAccessMemory(r, _rw, bytes(len(r))) for r in [first, second]])
+
+        # adjacent segments don't overlap
+        CoreMemoryModel([RandomAccessMemory(r, _rw, bytes(len(r))) for r in [range(0x10, 0x20), range(0, 0x10)]])
+
+    def test_find_segment(self):
+        # not sorted by address
+        segments: list[MemorySegment] = [
+            RandomAccessMemory(range(0x100, 0x110), _rw, bytes(0x10)),
+            RandomAccessMemory(range(0x10, 0x20), _rw, bytes(0x10)),
+            RandomAccessMemory(range(0x20, 0x30), _rw, bytes(0x10)),
+        ]
+        mem = CoreMemoryModel(segments)
+        expected = {
+            0: None,
+            0xF: None,
+            0x10: segments[1],
+            0x1F: segments[1],
+            0x20: segments[2],
+            0x2F: segments[2],
+            0x30: None,
+            0xFF: None,
+            0x100: segments[0],
+            0x10F: segments[0],
+            0x110: None,
+            2**32 - 1: None,
+        }
+
+        # the same addresses are looked up in different orders, so the last hit varies
+        addrs = list(expected) * 4
+        random.shuffle(addrs)
+        for addr in addrs:
+            self.assertIs(mem.find_segment(addr), expected[addr], hex(addr))
+
+        # a miss right after a hit in the same segment
+        self.assertIs(mem.find_segment(0x2F), segments[2])
+        self.assertIsNone(mem.find_segment(0x30))
+        self.assertIs(mem.find_segment(0x20), segments[2])
+        self.assertIsNone(mem.find_segment(0xF))
+
+    def test_undefined(self):
+        mem = CoreMemoryModel([RandomAccessMemory(range(0x10, 0x20), _rw, bytes(0x10))])
+        with self.assertRaises(RuntimeError):
+            self.read(mem, 0x20)
+        with self.assertRaises(RuntimeError):
+            self.write(mem, 0xC, 0)
+
+        mem = CoreMemoryModel([RandomAccessMemory(range(0x10, 0x20), _rw, bytes(0x10))], fail_on_undefined=False)
+        self.assertEqual(self.read(mem, 0x20).status, ReplyStatus.ERROR)
+        self.assertEqual(self.write(mem, 0xC, 0).status, ReplyStatus.ERROR)
+
+    def test_byte_sel(self):
+        ram = RandomAccessMemory(range(0x10, 0x20), _rw, bytes(range(0x10)))
+        mem = CoreMemoryModel([ram])
+
+        self.write(mem, 0x14, 0xAABBCCDD, byte_sel=0b0101)
+        self.assertEqual(self.read(mem, 0x14).data, 0x07BB05DD)
+        self.write(mem, 0x14, 0x11223344, byte_sel=0b1000)
+        self.assertEqual(self.read(mem, 0x14).data, 0x11BB05DD)
+        self.write(mem, 0x14, 0x55667788, byte_sel=0)
+        self.assertEqual(self.read(mem, 0x14).data, 0x11BB05DD)
+
+        # the neighbouring words are intact
+        self.assertEqual(ram.data[:4], bytes(range(4)))
+        self.assertEqual(ram.data[8:], bytes(range(8, 0x10)))
+
+    def test_partial_word(self):
+        # the segment ends in the middle of a word
+        ram = RandomAccessMemory(range(0x10, 0x16), _rw, bytes(range(1, 7)))
+        mem = CoreMemoryModel([ram])
+
+        self.assertEqual(self.read(mem, 0x14).data, 0x0605)
+        self.assertEqual(self.read(mem, 0x12, 2).data, 0x0403)
+
+        self.write(mem, 0x14, 0xAABBCCDD, byte_sel=0b1110)
+        self.assertEqual(self.read(mem, 0x14).data, 0xCC05)
+        self.write(mem, 0x10, 0xAABBCCDD, byte_count=2, byte_sel=0b1111)
+        self.assertEqual(self.read(mem, 0x10).data, 0x0403CCDD)
+
+        self.assertEqual(len(ram.data), 6)
+        self.assertEqual(ram.data, bytes([0xDD, 0xCC, 3, 4, 5, 0xCC]))
+
+    def test_side_effect_segment(self):
+        mmio = RecordingSegment(range(0x100, 0x108))
+        ram = RandomAccessMemory(range(0, 0x100), _rw, bytes(0x100))
+        mem = CoreMemoryModel([ram, mmio])
+
+        self.assertEqual(self.read(mem, 0x104).data, 0x12345678)
+        self.write(mem, 0x100, 0xDEADBEEF, byte_sel=0b0011)
+        self.write(mem, 0x10, 0xDEADBEEF)
+
+        # the requests have addresses relative to the segment
+        self.assertEqual(
+            mmio.requests,
+            [
+                ReadRequest(addr=4, byte_count=4, byte_sel=0xF, exec=False),
+                WriteRequest(addr=0, data=0xDEADBEEF, byte_count=4, byte_sel=0b0011),
+            ],
+        )
+
+        # subclasses of RandomAccessMemory can have side effects too
+        class LoggingRAM(RandomAccessMemory):
+            def write(self, req: WriteRequest) -> WriteReply:
+                writes.append(req.addr)
+                return super().write(req)
+
+        writes: list[int] = []
+        logging_ram = LoggingRAM(range(0x200, 0x210), _rw, bytes(0x10))
+        mem = CoreMemoryModel([ram, logging_ram])
+        self.write(mem, 0x208, 0xDEADBEEF)
+        self.assertEqual(writes, [8])
+        self.assertEqual(self.read(mem, 0x208).data, 0xDEADBEEF)
+
+    def test_permissions(self):
+        mem = CoreMemoryModel(
+            [
+                RandomAccessMemory(range(0, 0x10), SegmentFlags.READ, bytes(0x10)),
+                RandomAccessMemory(range(0x10, 0x20), SegmentFlags.WRITE, bytes(0x10)),
+            ]
+        )
+        with self.assertRaises(RuntimeError):
+            self.write(mem, 0, 0)
+        with self.assertRaises(RuntimeError):
+            self.read(mem, 0x10)
+        with self.assertRaises(RuntimeError):
+            mem.read(ReadRequest(addr=0, byte_count=4, byte_sel=0xF, exec=True))
+
+    def test_random(self):
+        # compares with a flat byte array, looking up the segments by a linear scan
+        ranges = [range(0x1000, 0x1100), range(0x80, 0x100), range(0x100, 0x102), range(0x2000, 0x2010)]
+        segments: list[MemorySegment] = [RandomAccessMemory(r, _rw, bytes(len(r))) for r in ranges]
+        mem = CoreMemoryModel(segments, fail_on_undefined=False)
+        reference = bytearray(0x2010)
+
+        def reference_segment(addr: int) -> Optional[range]:
+            return next((r for r in ranges if addr in r), None)
+
+        for _ in range(20000):
+            r = random.choice(ranges + [range(0, 0x2100)])
+            addr = random.randrange(r.start, r.stop) & ~3
+            seg = reference_segment(addr)
+            # the accesses are cut short by the end of the segment
+            size = min(4, seg.stop - addr) if seg is not None else 0
+            if random.randrange(2):
+                data = random.randrange(2**32)
+                byte_sel = random.randrange(16)
+                rep = self.write(mem, addr, data, byte_sel=byte_sel)
+                if seg is None:
+                    self.assertEqual(rep.status, ReplyStatus.ERROR)
+                    continue
+                for i in range(size):
+                    if byte_sel & (1 << i):
+                        reference[addr + i] = data >> (8 * i) & 0xFF
+            else:
+                rep = self.read(mem, addr)
+                if seg is None:
+                    self.assertEqual(rep.status, ReplyStatus.ERROR)
+                    continue
+                self.assertEqual(rep.data, int.from_bytes(reference[addr : addr + size], "little"))
+
+        for r, seg in zip(ranges, segments):
+            assert isinstance(seg, RandomAccessMemory)
+            self.assertEqual(seg.data, reference[r.start : r.stop])
@@ -0,0 +1,99 @@
+import asyncio
+import io
+import os
+import re
+import tempfile
+import unittest
+
+from .pipeline_timeline import O3PipeViewWriter
+from .pysim import PySimulation
+from .test import MMIO
+from .test_commit_log import commit_program, make_memory
+
+_stages = ["fetch", "decode", "rename", "dispatch", "issue", "complete", "retire"]
+
+
+def parse_o3pipeview(text: str) -> list[dict[str, int]]:
+    instrs: list[dict[str, int]] = []
+    for line in text.splitlines():
+        _, stage, tick, *rest = line.split(":")
+        if stage == "fetch":
+            instrs.append({"pc": int(rest[0], 16), "seq": int(rest[2]), "instr": int(rest[3], 16)})
+        elif stage == "retire":
+            instrs[-1]["store"] = int(rest[1])
+        instrs[-1][stage] = int(tick)
+    return instrs
+
+
+class TestO3PipeViewWriter(unittest.TestCase):
+    def test_write(self):
+        file = io.StringIO()
+        writer = O3PipeViewWriter(file, ticks_per_cycle=10, timestamp_bits=8)
+        timeline = {"fetch": 1, "decode": 2, "rename": 4, "dispatch": 5, "issue": 6, "writeback": 7, "retire": 9}
+        writer.write(0x10, 0x00B41123, timeline, store=True)
+        # The timestamps wrap around, and the issue wasn't reported.
+        timeline = {
+            "fetch": 250,
+            "decode": 251,
+            "rename": 253,
+            "dispatch": 254,
+            "issue": 9,
+            "writeback": 3,
+            "retire": 5,
+        }
+        writer.write(0x14, 0x00000013, timeline)
+
+        self.assertEqual(
+            file.getvalue().splitlines()[:7],
+            [
+                "O3PipeView:fetch:10:0x00000010:0:1:00b41123",
+                "O3PipeView:decode:20",
+                "O3PipeView:rename:40",
+                "O3PipeView:dispatch:50",
+                "O3PipeView:issue:60",
+                "O3PipeView:complete:70",
+                "O3PipeView:retire:90:store:70",
+            ],
+        )
+
+        instrs = parse_o3pipeview(file.getvalue())
+        self.assertEqual(
+            [instrs[1][stage] for stage in _stages + ["store"]], [2500, 2510, 2530, 2540, 2540, 2590, 2610, 0]
+        )
+
+
+class TestPipelineTimeline(unittest.TestCase):
+    def test_pysim(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            timeline_file = os.path.join(tmpdir, "timeline.txt")
+            backend = PySimulation(verbose=False, timeline_file=timeline_file)
+            mmio = MMIO(backend.stop)
+
+            self.assertTrue(asyncio.run(backend.run(make_memory(mmio), 1000)))
+            cycles = backend.cycle_cnt
+
+            with open(timeline_file) as f:
+                text = f.read()
+
+        self.assertTrue(all(re.fullmatch(r"O3PipeView:\w+:\d+(:.*)?", line) for line in text.splitlines()))
+
+        # The simulation stops at the store to MMIO, before it retires.
+        instrs = parse_o3pipeview(text)
+        self.assertEqual(len(instrs), 11)
+        self.assertEqual([instr["seq"] for instr in instrs], list(range(1, 12)))
+        self.assertEqual(instrs[0]["instr"], int.from_bytes(commit_program[:4], "little"))
+
+        for instr in instrs:
+            ticks = [instr[stage] for stage in _stages]
+            self.assertEqual(ticks, sorted(ticks))
+            self.assertLess(instr["fetch"], instr["dispatch"])
+            self.assertLess(instr["retire"], cycles * 1000)
+            self.assertEqual(instr["store"] != 0, instr["pc"] == 0x18)
+
+        retires = [instr["retire"] for instr in instrs]
+        self.assertEqual(retires, sorted(retires))
+
+        # The timeline doesn't slow down the core.
+        backend = PySimulation(verbose=False)
+        self.assertTrue(asyncio.run(backend.run(make_memory(MMIO(backend.stop)), 1000)))
+        self.assertEqual(backend.cycle_cnt, cycles)
@@ -3,6 +3,7 @@ import random
 from collections import namedtuple, deque
 from typing import Callable, Optional, Iterable
 from amaranth import *
+from amaranth.hdl.rec import Layout
 from amaranth.sim import Settle
 from parameterized import parameterized_class
 from coreblocks.stages.rs_func_block import RSBlockComponent
@@ -12,13 +13,25 @@ from transactron.lib import FIFO, AdapterTrans, Adapter
 from coreblocks.scheduler.scheduler import Scheduler
 from coreblocks.structs_common.rf import RegisterFile
 from coreblocks.structs_common.rat import FRAT
-from coreblocks.params import RSLayouts, DecodeLayouts, SchedulerLayouts, GenParams, OpType, Funct3, Funct7
+from coreblocks.params import RSLayouts, DecodeLayouts, SchedulerLayouts, ROBLayouts, GenParams, OpType, Funct3, Funct7
 from coreblocks.params.configurations import test_core_config
 from coreblocks.structs_common.rob import ReorderBuffer
 from coreblocks.utils.protocols import FuncBlock
+from transactron.utils._typing import LayoutList
 from ..common import RecordIntDict, TestCaseWithSimulator, TestGen, TestbenchIO, def_method_mock
 
 
+def layout_field_slice(layout: LayoutList, name: str) -> slice:
+    """Bit range of a (non-nested) field in the values of records with the given layout."""
+    offset = 0
+    for field_name, shape, _ in Layout.cast(layout):
+        width = Shape.cast(shape).width
+        if field_name == name:
+            return slice(offset, offset + width)
+        offset += width
+    raise KeyError(name)
+
+
 class SchedulerTestCircuit(Elaboratable):
     def __init__(self, gen_params: GenParams, rs: list[set[OpType]]):
         self.gen_params = gen_params
@@ -128,6 +141,7 @@ class TestScheduler(TestCaseWithSimulator):
         self.expected_rs_entry_queue = [deque() for _ in self.optype_sets]
         self.current_RAT = [0] * self.gen_params.isa.reg_cnt
         self.allocated_instr_count = 0
+        self.rl_dst_bits = layout_field_slice(self.gen_params.get(ROBLayouts).data_layout, "rl_dst")
         self.m = SchedulerTestCircuit(self.gen_params, self.optype_sets)
 
         random.seed(42)
@@ -258,7 +272,8 @@ class TestScheduler(TestCaseWithSimulator):
 
     def make_output_process(self, io: TestbenchIO, output_queues: Iterable[deque]):
         def check(got, expected):
-            rl_dst = yield self.m.rob.data[got["rs_data"]["rob_id"]].rob_data.rl_dst
+            rob_data = yield self.m.rob.data[got["rs_data"]["rob_id"]]
+            rl_dst = (rob_data & ((1 << self.rl_dst_bits.stop) - 1)) >> self.rl_dst_bits.start
             s1 = self.rf_state[expected["rp_s1"]]
             s2 = self.rf_state[expected["rp_s2"]]
 
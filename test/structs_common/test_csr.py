@@ -1,7 +1,9 @@
 from amaranth import *
 
 from transactron.lib import Adapter
+from transactron import TModule, Transaction, TransactionManager, TransactionModule
 from coreblocks.structs_common.csr import CSRUnit, CSRRegister
+from coreblocks.structs_common.csr_generic import TransactionCountersCSR
 from coreblocks.params import GenParams
 from coreblocks.params.isa import Funct3, ExceptionCause
 from coreblocks.params.configurations import test_core_config
@@ -269,3 +271,58 @@ class TestCSRRegister(TestCaseWithSimulator):
 
         with self.run_simulation(self.dut) as sim:
             sim.add_sync_process(self.process_test)
+
+
+class TransactionCountersTestCircuit(Elaboratable):
+    def __init__(self, gen_params):
+        self.dut = TransactionCountersCSR(gen_params)
+        self.request = Signal()
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        m.submodules.dut = self.dut
+        m.submodules.select = self.select = TestbenchIO(AdapterTrans(self.dut.select._fu_write))
+        m.submodules.clear = self.clear = TestbenchIO(AdapterTrans(self.dut.clear._fu_write))
+        m.submodules.data = self.data = TestbenchIO(AdapterTrans(self.dut.data._fu_read))
+        m.submodules.data_high = self.data_high = TestbenchIO(AdapterTrans(self.dut.data_high._fu_read))
+
+        with Transaction(name="counted").body(m, request=self.request):
+            pass
+
+        return m
+
+
+class TestTransactionCountersCSR(TestCaseWithSimulator):
+    def test_counters(self):
+        gp = GenParams(test_core_config)
+        circ = TransactionCountersTestCircuit(gp)
+        manager = TransactionManager()
+
+        def process():
+            yield circ.request.eq(1)
+            for _ in range(10):
+                yield
+            yield circ.request.eq(0)
+
+            counters = manager.utilization_counters()
+            self.assertEqual(counters.width, 2 * gp.isa.xlen)
+
+            def check(expected: list[tuple[str, int]]):
+                for kind, value in expected:
+                    yield from circ.select.call(
+                        data=counters.names.index(f"TransactionCountersTestCircuit_counted.{kind}")
+                    )
+                    yield
+                    self.assertEqual((yield from circ.data.call()), {"data": value})
+                    self.assertEqual((yield from circ.data_high.call()), {"data": 0})
+
+            yield from check([("requested", 10), ("granted", 10), ("blocked_conflict", 0)])
+
+            yield circ.request.eq(1)
+            yield from circ.clear.call(data=0)
+            yield circ.request.eq(0)
+            yield from check([("requested", 0), ("granted", 0)])
+
+        with self.run_simulation(TransactionModule(circ, manager), add_transaction_module=False) as sim:
+            sim.add_sync_process(process)
@@ -0,0 +1,71 @@
+from amaranth.sim import Settle
+
+from ..common import TestCaseWithSimulator, SimpleTestCircuit
+
+from coreblocks.structs_common.free_list import FreeList
+from coreblocks.params import GenParams
+from coreblocks.params.configurations import test_core_config
+
+import random
+
+
+class TestFreeList(TestCaseWithSimulator):
+    def process(self):
+        yield from self.m.get_state.enable()
+        for _ in range(self.test_steps):
+            restore = random.random() < 0.02
+            allocs = [random.random() < 0.6 for _ in self.m.alloc]
+            frees = random.sample(sorted(self.allocated), min(len(self.allocated), len(self.m.free)))
+            frees = [reg for reg in frees if random.random() < 0.5]
+
+            if restore:
+                new_free = set(random.sample(range(1, self.count), random.randrange(self.count)))
+                yield from self.m.restore.call_init(free=sum(1 << reg for reg in new_free))
+            for alloc, enable in zip(self.m.alloc, allocs):
+                yield from alloc.set_enable(enable)
+            for free, reg in zip(self.m.free, frees):
+                yield from free.call_init(reg_id=reg)
+
+            yield Settle()
+
+            self.assertTrue((yield from self.m.get_state.done()))
+            state = yield from self.m.get_state.get_outputs()
+            self.assertEqual(state["free"], sum(1 << reg for reg in self.free))
+
+            if restore:
+                self.assertTrue((yield from self.m.restore.done()))
+                for io in self.m.alloc + self.m.free:
+                    self.assertFalse((yield from io.done()))
+                self.free = new_free
+                self.allocated = set(range(1, self.count)) - new_free
+            else:
+                allocated = []
+                for k, (alloc, enable) in enumerate(zip(self.m.alloc, allocs)):
+                    # the k-th port can allocate if there are more than k free registers
+                    self.assertEqual((yield from alloc.done()), enable and len(self.free) > k)
+                    if enable and len(self.free) > k:
+                        allocated.append((yield from alloc.get_outputs())["reg_id"])
+                for free in self.m.free[: len(frees)]:
+                    self.assertTrue((yield from free.done()))
+
+                self.assertEqual(len(set(allocated)), len(allocated))
+                self.assertTrue(set(allocated) <= self.free)
+                self.free = (self.free - set(allocated)) | set(frees)
+                self.allocated = (self.allocated | set(allocated)) - set(frees)
+
+            yield
+            for io in self.m.alloc + self.m.free + [self.m.restore]:
+                yield from io.disable()
+
+    def test_randomized(self):
+        random.seed(42)
+        self.test_steps = 1000
+        gp = GenParams(test_core_config.replace(phys_regs_bits=4))
+        self.count = 2**gp.phys_regs_bits
+        self.m = SimpleTestCircuit(FreeList(gp, alloc_ports=2, free_ports=2))
+
+        self.free = set(range(1, self.count))
+        self.allocated = set()
+
+        with self.run_simulation(self.m) as sim:
+            sim.add_sync_process(self.process)
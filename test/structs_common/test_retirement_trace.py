@@ -0,0 +1,123 @@
+import random
+
+from amaranth.sim import Settle
+
+from coreblocks.structs_common.retirement_trace import RetirementTrace
+from coreblocks.params import GenParams
+from coreblocks.params.configurations import test_core_config
+
+from ..common import *
+
+
+class TestRetirementTrace(TestCaseWithSimulator):
+    def test_randomized(self):
+        random.seed(42)
+        gp = GenParams(test_core_config.replace(retirement_trace=True))
+        trace = RetirementTrace(gp)
+        m = SimpleTestCircuit(trace)
+
+        instr_count = 200
+        rob_entries = 2**gp.rob_entries_bits
+        window = 8
+
+        instrs = []
+        for i in range(instr_count):
+            instr = {
+                "rob_id": i % rob_entries,
+                "pc": random.randrange(2**32) & ~1,
+                "instr": random.randrange(2**32),
+                "rl_dst": random.randrange(32),
+                "rd_data": random.randrange(2**32),
+                "exception": random.randrange(2),
+            }
+            if random.random() < 0.3:
+                instr["mem_addr"] = random.randrange(2**30) << 2
+                instr["mem_rmask"], instr["mem_wmask"] = random.choice([(0xF, 0), (0, 0x3)])
+                instr["mem_data"] = random.randrange(2**32)
+            instrs.append(instr)
+
+        def process():
+            reported = 0
+            for retired in range(instr_count):
+                # Keep a window of instructions in flight, reporting their results out of order.
+                while reported < min(retired + window, instr_count):
+                    instr = instrs[reported]
+                    yield from m.report_instr.call(instr=instr["instr"])
+                    yield from m.report_alloc.call(rob_id=instr["rob_id"], pc=instr["pc"])
+                    reported += 1
+
+                in_flight = instrs[retired:reported]
+                for instr in random.sample(in_flight, len(in_flight)):
+                    yield from m.report_result.call(rob_id=instr["rob_id"], rd_data=instr["rd_data"])
+                    if "mem_addr" in instr:
+                        yield from m.report_mem.call(
+                            {key: instr[key] for key in ["rob_id", "mem_addr", "mem_rmask", "mem_wmask", "mem_data"]}
+                        )
+
+                instr = instrs[retired]
+                yield from m.retire.call(rob_id=instr["rob_id"], rl_dst=instr["rl_dst"], exception=instr["exception"])
+                yield Settle()
+
+                self.assertEqual((yield trace.trace.valid), 1)
+                expected = {
+                    "pc": instr["pc"],
+                    "instr": instr["instr"],
+                    "rl_dst": instr["rl_dst"],
+                    "rd_data": instr["rd_data"] if instr["rl_dst"] else 0,
+                    "mem_addr": instr.get("mem_addr", 0),
+                    "mem_rmask": instr.get("mem_rmask", 0),
+                    "mem_wmask": instr.get("mem_wmask", 0),
+                    "mem_data": instr.get("mem_data", 0),
+                    "exception": instr["exception"],
+                }
+                for name, value in expected.items():
+                    self.assertEqual((yield trace.trace[name]), value, name)
+
+                yield
+                yield Settle()
+                self.assertEqual((yield trace.trace.valid), 0)
+
+        with self.run_simulation(m) as sim:
+            sim.add_sync_process(process)
+
+    def test_timeline(self):
+        random.seed(43)
+        gp = GenParams(test_core_config.replace(pipeline_timeline=True))
+        trace = RetirementTrace(gp)
+        for _ in range(2):
+            trace.new_report_issue()
+        m = SimpleTestCircuit(trace)
+
+        rob_entries = 2**gp.rob_entries_bits
+
+        def process():
+            for i in range(50):
+                rob_id = i % rob_entries
+                timeline = {}
+
+                def report(stage, method, **kwargs):
+                    for _ in range(random.randrange(3)):
+                        yield
+                    yield Settle()
+                    timeline[stage] = yield trace.timestamp
+                    yield from method.call(**kwargs)
+
+                # the fetch cycle is passed with the instruction
+                yield Settle()
+                timeline["fetch"] = yield trace.timestamp
+                yield from report("decode", m.report_instr, instr=i, fetch=timeline["fetch"])
+                yield from report("rename", m.report_rename)
+                yield from m.report_alloc.call(rob_id=rob_id, pc=4 * i)
+                yield from report("dispatch", m.report_dispatch, rob_id=rob_id)
+                yield from report("issue", random.choice(m.report_issue), rob_id=rob_id)
+                yield from report("writeback", m.report_result, rob_id=rob_id, rd_data=0)
+                yield from report("retire", m.retire, rob_id=rob_id, rl_dst=0, exception=0)
+                yield Settle()
+
+                self.assertEqual((yield trace.trace.valid), 1)
+                self.assertEqual((yield trace.trace.instr), i)
+                for stage, timestamp in timeline.items():
+                    self.assertEqual((yield trace.trace.timeline[stage]), timestamp, stage)
+
+        with self.run_simulation(m) as sim:
+            sim.add_sync_process(process)
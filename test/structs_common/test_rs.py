@@ -7,6 +7,7 @@ from transactron.lib import AdapterTrans
 from ..common import TestCaseWithSimulator, TestbenchIO, get_outputs
 
 from coreblocks.structs_common.rs import RS
+from coreblocks.structs_common.rf import RegisterFile
 from coreblocks.params import *
 from coreblocks.params.configurations import test_core_config
 
@@ -27,16 +28,24 @@ def create_check_list(rs_entries_bits: int, insert_list: list[dict]) -> list[dic
 
 
 class TestElaboratable(Elaboratable):
-    def __init__(self, gen_params: GenParams, ready_for: Optional[Iterable[Iterable[OpType]]] = None) -> None:
+    def __init__(
+        self, gen_params: GenParams, ready_for: Optional[Iterable[Iterable[OpType]]] = None, dataless: bool = False
+    ) -> None:
         self.gp = gen_params
         self.ready_for = ready_for
+        self.dataless = dataless
         # test config GenParams specifies only one RS - it has the max number of entries
         self.rs_entries = self.gp.max_rs_entries
         self.rs_entries_bits = self.gp.max_rs_entries_bits
 
     def elaborate(self, platform) -> Module:
         m = Module()
-        rs = RS(self.gp, 2**self.rs_entries_bits, self.ready_for)
+        rf_read = None
+        if self.dataless:
+            m.submodules.rf = rf = RegisterFile(gen_params=self.gp)
+            m.submodules.io_rf_write = self.io_rf_write = TestbenchIO(AdapterTrans(rf.write))
+            rf_read = (rf.issue_read1, rf.issue_read2)
+        rs = RS(self.gp, 2**self.rs_entries_bits, self.ready_for, rf_read)
 
         self.rs = rs
         self.io_select = TestbenchIO(AdapterTrans(rs.select))
@@ -457,3 +466,68 @@ class TestRSMethodTwoGetReadyLists(TestCaseWithSimulator):
             yield Settle()
 
             masks = [mask & ~(1 << i) for mask in masks]
+
+
+class TestRSDataless(TestCaseWithSimulator):
+    def test_dataless(self):
+        self.gp = GenParams(test_core_config)
+        self.m = TestElaboratable(self.gp, dataless=True)
+        self.insert_list = [
+            {
+                "rs_entry_id": id,
+                "rs_data": {
+                    "rp_s1": 0 if id % 2 else id + 1,
+                    "rp_s2": id + 17,
+                    "rp_s1_reg": id + 1,
+                    "rp_s2_reg": id + 17,
+                    "rp_dst": id * 2,
+                    "rob_id": id,
+                    "exec_fn": {
+                        "op_type": 1,
+                        "funct3": 2,
+                        "funct7": 3,
+                    },
+                    "imm": id,
+                    "pc": id,
+                },
+            }
+            for id in range(self.m.rs_entries)
+        ]
+        self.check_list = create_check_list(self.m.rs_entries_bits, self.insert_list)
+
+        with self.run_simulation(self.m) as sim:
+            sim.add_sync_process(self.simulation_process)
+
+    def simulation_process(self):
+        for id in range(1, self.m.rs_entries, 2):
+            yield from self.m.io_rf_write.call(reg_id=id + 1, reg_val=100 + id)
+
+        for record in self.insert_list:
+            yield from self.m.io_insert.call(record)
+        yield Settle()
+
+        # Entries store tags only
+        for expected, record in zip(self.check_list, self.m.rs.data):
+            self.assertEqual(expected, (yield from get_outputs(record)))
+        self.assertEqual((yield self.m.rs.take.ready), 0)
+
+        for id in range(self.m.rs_entries):
+            # Operand values are announced to the register file and the RS at the same time
+            yield from self.m.io_rf_write.call(reg_id=id + 17, reg_val=200 + id)
+            yield from self.m.io_update.call(reg_id=id + 17, reg_val=200 + id)
+            if id % 2 == 0:
+                yield Settle()
+                self.assertEqual((yield self.m.rs.take.ready), 0)
+                yield from self.m.io_rf_write.call(reg_id=id + 1, reg_val=100 + id)
+                yield from self.m.io_update.call(reg_id=id + 1, reg_val=100 + id)
+            yield Settle()
+            self.assertEqual((yield self.m.rs.take.ready), 1)
+
+            data = yield from self.m.io_take.call(rs_entry_id=id)
+            expected = self.insert_list[id]["rs_data"]
+            for key in ["rp_dst", "rob_id", "exec_fn", "imm", "pc"]:
+                self.assertEqual(data[key], expected[key])
+            self.assertEqual(data["s1_val"], 100 + id)
+            self.assertEqual(data["s2_val"], 200 + id)
+            yield Settle()
+            self.assertEqual((yield self.m.rs.take.ready), 0)
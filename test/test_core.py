@@ -9,6 +9,12 @@ from coreblocks.core import Core
 from coreblocks.params import GenParams
 from coreblocks.params.configurations import CoreConfiguration, basic_core_config, full_core_config
 from coreblocks.peripherals.wishbone import WishboneBus, WishboneMemorySlave
+from coreblocks.stages.rs_func_block import RSBlockComponent
+from coreblocks.fu.alu import ALUComponent
+from coreblocks.fu.shift_unit import ShiftUnitComponent
+from coreblocks.fu.jumpbranch import JumpComponent
+from coreblocks.fu.exception import ExceptionUnitComponent
+from coreblocks.lsu.dummyLsu import LSUBlockComponent
 
 from typing import Optional, cast
 import random
@@ -105,10 +111,10 @@ class TestCoreBase(TestCaseWithSimulator):
         return (yield self.m.core.FRAT.entries[reg_id])
 
     def get_arch_reg_val(self, reg_id):
-        return (yield self.m.core.RF.entries[(yield from self.get_phys_reg_rrat(reg_id))].reg_val)
+        return (yield self.m.core.RF.entries[(yield from self.get_phys_reg_rrat(reg_id))])
 
     def get_phys_reg_val(self, reg_id):
-        return (yield self.m.core.RF.entries[reg_id].reg_val)
+        return (yield self.m.core.RF.entries[reg_id])
 
     def push_instr(self, opcode):
         yield from self.m.io_in.call(instr=opcode)
@@ -177,6 +183,34 @@ class TestCoreSimple(TestCoreBase):
         with self.run_simulation(m) as sim:
             sim.add_sync_process(self.simple_test)
 
+    def test_simple_timeline(self):
+        # the instructions pushed to `fifo_fetch` by the test bypass the fetch unit
+        gp = GenParams(basic_core_config.replace(pipeline_timeline=True))
+        m = TestElaboratable(gp)
+        self.m = m
+
+        with self.run_simulation(m) as sim:
+            sim.add_sync_process(self.simple_test)
+
+    def test_simple_dataless(self):
+        gp = GenParams(
+            basic_core_config.replace(
+                func_units_config=(
+                    RSBlockComponent(
+                        [ALUComponent(), ShiftUnitComponent(), JumpComponent(), ExceptionUnitComponent()],
+                        rs_entries=8,
+                        dataless=True,
+                    ),
+                    LSUBlockComponent(),
+                ),
+            )
+        )
+        m = TestElaboratable(gp)
+        self.m = m
+
+        with self.run_simulation(m) as sim:
+            sim.add_sync_process(self.simple_test)
+
 
 class TestCoreRandomized(TestCoreBase):
     def randomized_input(self):
@@ -0,0 +1,166 @@
+import unittest
+
+from amaranth import *
+from amaranth.hdl.ir import Fragment
+
+from transactron import *
+from transactron.lib import Adapter
+from transactron.logic_depth import LogicDepthEstimator, transaction_depths
+from transactron.tracing import TracingFragment
+
+from ..common import data_layout
+
+
+class TestLogicDepthEstimator(unittest.TestCase):
+    def estimator(self, m: Module) -> LogicDepthEstimator:
+        return LogicDepthEstimator(Fragment.get(m, None).prepare())
+
+    def test_registers(self):
+        m = Module()
+        a = Signal(8)
+        b = Signal(8)
+        m.d.sync += b.eq(a + 1)
+
+        estimator = self.estimator(m)
+        self.assertEqual(estimator.depth(a), 0)
+        self.assertEqual(estimator.depth(b), 0)
+
+    def test_bitwise_cone(self):
+        m = Module()
+        ins = [Signal() for _ in range(16)]
+        wires = [Signal() for _ in range(4)]
+        out = Signal()
+        for i, wire in enumerate(wires):
+            m.d.comb += wire.eq(ins[4 * i] & ins[4 * i + 1] | ins[4 * i + 2] & ins[4 * i + 3])
+        m.d.comb += out.eq(Cat(wires).any())
+
+        estimator = self.estimator(m)
+        self.assertEqual(estimator.depth(wires[0]), 1)
+        # 16 inputs of bitwise logic fit in two levels of 4-input LUTs
+        self.assertEqual(estimator.depth(out), 2)
+        self.assertEqual(estimator.levels(17), 3)
+
+    def test_chain(self):
+        m = Module()
+        a = Signal(8)
+        sigs = [Signal(8) for _ in range(4)]
+        m.d.comb += sigs[0].eq(a + 1)
+        for prev, sig in zip(sigs, sigs[1:]):
+            m.d.comb += sig.eq(prev + 1)
+
+        estimator = self.estimator(m)
+        depths = [estimator.depth(sig) for sig in sigs]
+        self.assertEqual(depths, sorted(depths))
+        self.assertEqual(len(set(depths)), len(depths))
+        self.assertEqual([id(sig) for sig in estimator.path(sigs[-1])], [id(sig) for sig in [a, *sigs]])
+
+    def test_conditions(self):
+        m = Module()
+        a = Signal(8)
+        cond = Signal(8)
+        out1 = Signal(8)
+        out2 = Signal(8)
+        m.d.comb += out1.eq(a)
+        with m.If(cond + 1 == 0):
+            m.d.comb += out2.eq(a)
+
+        estimator = self.estimator(m)
+        self.assertEqual(estimator.depth(out1), 0)
+        self.assertGreater(estimator.depth(out2), estimator.depth(cond + 1))
+        self.assertIs(estimator.path(out2)[0], cond)
+
+    def test_memory(self):
+        m = Module()
+        addr = Signal(4)
+        addr_comb = Signal(4)
+        mem = Memory(width=8, depth=16)
+        m.submodules.read_port = read_port = mem.read_port(domain="comb")
+        m.d.comb += addr_comb.eq(addr + 1)
+        m.d.comb += read_port.addr.eq(addr_comb)
+
+        estimator = self.estimator(m)
+        self.assertEqual(estimator.depth(read_port.data), estimator.depth(addr_comb) + 1)
+
+    def test_loop(self):
+        m = Module()
+        a = Signal()
+        b = Signal()
+        m.d.comb += a.eq(~b)
+        m.d.comb += b.eq(~a)
+
+        estimator = self.estimator(m)
+        estimator.depth(a)
+        self.assertEqual(len(estimator.loops), 1)
+
+
+class DepthTestCircuit(Elaboratable):
+    def __init__(self):
+        self.adapter = Adapter(i=data_layout(8), o=data_layout(8))
+        self.shallow = Method(o=data_layout(8))
+        self.deep = Method(i=data_layout(8), o=data_layout(8))
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        m.submodules.adapter = self.adapter
+
+        reg = Signal(8)
+
+        @def_method(m, self.shallow)
+        def _():
+            return reg
+
+        @def_method(m, self.deep)
+        def _(data):
+            return (data * data + reg)[:8]
+
+        with Transaction(name="deep_caller").body(m):
+            m.d.sync += reg.eq(self.deep(m, self.shallow(m)))
+
+        return m
+
+
+class TestTransactionDepths(unittest.TestCase):
+    def test_transaction_depths(self):
+        circ = DepthTestCircuit()
+        tm = TransactionModule(circ)
+        fragment = TracingFragment.get(tm, platform=None).prepare()
+
+        entries = transaction_depths(fragment, tm.transactionManager)
+        depths = [entry.depth for entry in entries]
+        self.assertEqual(depths, sorted(depths, reverse=True))
+
+        by_signal = {(entry.name.split(".")[-1], entry.signal): entry for entry in entries}
+        deep = by_signal[("DepthTestCircuit_deep", "data_out")]
+        shallow = by_signal[("DepthTestCircuit_shallow", "data_out")]
+        self.assertEqual(shallow.depth, 0)
+        self.assertGreater(deep.depth, 0)
+        self.assertTrue(deep.path[0].endswith("reg"))
+        self.assertIn(("DepthTestCircuit_deep_caller", "grant"), by_signal)
+
+    def test_hierarchical_names(self):
+        class TwoCircuits(Elaboratable):
+            def __init__(self):
+                self.first = DepthTestCircuit()
+                self.second = DepthTestCircuit()
+
+            def elaborate(self, platform):
+                m = TModule()
+                m.submodules.first = self.first
+                m.submodules.second = self.second
+                return m
+
+        tm = TransactionModule(TwoCircuits())
+        fragment = TracingFragment.get(tm, platform=None).prepare()
+
+        entries = transaction_depths(fragment, tm.transactionManager)
+        run_paths = {entry.name: entry.path for entry in entries if entry.signal == "run"}
+        self.assertEqual(len(run_paths), 4)
+
+        # the signals driven by the transaction manager are named after their transactions and methods
+        for name, path in run_paths.items():
+            caller = name.removesuffix("_shallow").removesuffix("_deep") + "_deep_caller"
+            self.assertEqual(path, [f"{caller}.grant", f"{name}.run"])
+
+        data_in = next(entry for entry in entries if entry.signal == "data_in")
+        self.assertTrue(data_in.path[-1].startswith(data_in.name + "."))
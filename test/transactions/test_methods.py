@@ -617,3 +617,60 @@ class TestDataDependentConditionalMethod(TestCaseWithSimulator):
 
     def test_random_kwarg(self):
         self.base_random(lambda data: data != self.bad_number)
+
+
+class AndOrMuxCircuit(Elaboratable):
+    def __init__(self, count: int, and_or_mux: bool):
+        self.method = Method(i=data_layout(WIDTH), and_or_mux=and_or_mux)
+
+        self.ins = [Record(data_layout(WIDTH)) for _ in range(count)]
+        self.reqs = Signal(count)
+
+        self.out = Signal(WIDTH)
+        self.running = Signal()
+        self.grants = Signal(count)
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        @def_method(m, self.method)
+        def _(data):
+            m.d.comb += self.out.eq(data)
+            m.d.comb += self.running.eq(1)
+
+        for i, data_in in enumerate(self.ins):
+            with Transaction().body(m, request=self.reqs[i]):
+                m.d.comb += self.grants[i].eq(1)
+                self.method(m, data_in)
+
+        return m
+
+
+class TestAndOrMux(TestCaseWithSimulator):
+    @parameterized.expand([("method", True, False), ("manager", False, True)])
+    def test_random(self, name: str, method_and_or_mux: bool, manager_and_or_mux: bool):
+        random.seed(14)
+        count = 5
+        circ = AndOrMuxCircuit(count, method_and_or_mux)
+
+        def process():
+            for _ in range(100):
+                ins = [random.randrange(2**WIDTH) for _ in range(count)]
+                reqs = random.randrange(2**count)
+
+                for i in range(count):
+                    yield circ.ins[i].data.eq(ins[i])
+                yield circ.reqs.eq(reqs)
+                yield Settle()
+
+                grants = yield circ.grants
+                self.assertEqual((yield circ.running), reqs != 0)
+                if reqs != 0:
+                    self.assertEqual(grants & reqs, grants)
+                    self.assertEqual(grants.bit_count(), 1)
+                    self.assertEqual((yield circ.out), ins[grants.bit_length() - 1])
+                yield
+
+        manager = TransactionManager(and_or_mux=manager_and_or_mux)
+        with self.run_simulation(TransactionModule(circ, manager), add_transaction_module=False) as sim:
+            sim.add_sync_process(process)
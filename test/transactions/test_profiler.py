@@ -0,0 +1,133 @@
+import io
+import unittest
+from typing import Optional
+
+from amaranth import *
+from amaranth.hdl.ir import Fragment
+
+from transactron import *
+from transactron.profiler import ElaborationProfiler, ProfileEntry, profile_section
+from transactron.tracing import TracingFragment
+
+
+class ProfiledCircuit(Elaboratable):
+    def __init__(self):
+        self.method = Method(o=[("data", 4)])
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        counter = Signal(4)
+
+        @def_method(m, self.method)
+        def _():
+            return {"data": counter}
+
+        with Transaction(name="increment").body(m):
+            m.d.sync += counter.eq(self.method(m).data + 1)
+
+        return m
+
+
+class ProfiledTop(Elaboratable):
+    def elaborate(self, platform):
+        m = Module()
+        m.submodules.circuit = ProfiledCircuit()
+        return TransactionModule(m)
+
+
+class TestElaborationProfiler(unittest.TestCase):
+    def profile(self, tracing: bool = False, **kwargs) -> ElaborationProfiler:
+        with ElaborationProfiler(**kwargs) as profiler:
+            if tracing:
+                TracingFragment.get(ProfiledTop(), None)
+            else:
+                Fragment.get(ProfiledTop(), None)
+        return profiler
+
+    def find_entry(self, entry: ProfileEntry, key: tuple[str, str]) -> Optional[ProfileEntry]:
+        if key in entry.children:
+            return entry.children[key]
+        for child in entry.children.values():
+            if (found := self.find_entry(child, key)) is not None:
+                return found
+        return None
+
+    def check_profile(self, profiler: ElaborationProfiler):
+        summary = {entry.label: entry for entry in profiler.summary()}
+
+        self.assertIn("elaborate:ProfiledTop", summary)
+        self.assertIn("elaborate:ProfiledCircuit", summary)
+        self.assertIn("elaborate:TransactionManager", summary)
+        self.assertIn("method:method", summary)
+        self.assertIn("transaction:increment", summary)
+        for phase in ["simultaneous", "conflict_graph", "schedulers", "method_calls", "argument_muxing"]:
+            self.assertEqual(summary[f"manager:{phase}"].calls, 1)
+
+        top = summary["elaborate:ProfiledTop"]
+        self.assertLessEqual(top.total_time, profiler.root.total_time)
+        for entry in summary.values():
+            self.assertLessEqual(entry.self_time, entry.total_time + 1e-9)
+            self.assertLessEqual(entry.total_time, top.total_time + 1e-9)
+
+        circuit = self.find_entry(
+            profiler.root.children[("elaborate", "ProfiledTop")], ("elaborate", "ProfiledCircuit")
+        )
+        assert circuit is not None
+        self.assertIn(("method", "method"), circuit.children)
+        self.assertIn(("transaction", "increment"), circuit.children)
+
+    def test_fragment_get(self):
+        orig_get = Fragment.get
+        profiler = self.profile()
+        self.assertIs(Fragment.get, orig_get)
+        self.assertIsNone(ElaborationProfiler.active)
+        self.check_profile(profiler)
+
+    def test_tracing_fragment(self):
+        self.check_profile(self.profile(tracing=True))
+
+    def test_memory(self):
+        profiler = self.profile(trace_memory=True)
+        self.assertIn("memory", profiler.report())
+        self.assertGreater(profiler.root.allocated, 0)
+
+    def test_report(self):
+        profiler = self.profile()
+
+        for sort_by in ["total", "self", "calls", "memory", "name"]:
+            lines = profiler.report(sort_by=sort_by, limit=3).splitlines()
+            self.assertEqual(len(lines), 5)
+
+        lines = profiler.report(sort_by="name").splitlines()[2:]
+        labels = [line.split()[-1] for line in lines]
+        self.assertEqual(labels, sorted(labels))
+
+        with self.assertRaises(ValueError):
+            profiler.report(sort_by="invalid")
+
+    def test_flamegraph(self):
+        profiler = self.profile()
+        output = io.StringIO()
+        profiler.dump_flamegraph(output)
+
+        total = 0
+        for line in output.getvalue().splitlines():
+            stack, value = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("root:elaboration"))
+            self.assertNotIn(" ", stack)
+            self.assertGreater(int(value), 0)
+            total += int(value)
+
+        self.assertAlmostEqual(total, profiler.root.total_time * 1e6, delta=1000)
+
+    def test_inactive(self):
+        with profile_section("elaborate", "none"):
+            pass
+        self.assertIsNone(ElaborationProfiler.active)
+
+    def test_nested_profilers(self):
+        with ElaborationProfiler():
+            with self.assertRaises(RuntimeError):
+                with ElaborationProfiler():
+                    pass
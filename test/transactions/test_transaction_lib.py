@@ -34,7 +34,7 @@ class RevConnect(Elaboratable):
         return self.connect
 
 
-FIFO_Like: TypeAlias = FIFO | Forwarder | Connect | RevConnect
+FIFO_Like: TypeAlias = FIFO | Forwarder | Pipe | Connect | RevConnect
 
 
 class TestFifoBase(TestCaseWithSimulator):
@@ -133,6 +133,72 @@ class TestForwarder(TestFifoBase):
             sim.add_sync_process(process)
 
 
+class TestPipe(TestFifoBase):
+    @parameterized.expand([(0, 0), (2, 0), (0, 2), (1, 1)])
+    def test_fifo(self, writer_rand, reader_rand):
+        self.do_test_fifo(Pipe, writer_rand=writer_rand, reader_rand=reader_rand)
+
+    def test_pipelining(self):
+        iosize = 8
+
+        m = SimpleTestCircuit(Pipe(data_layout(iosize)))
+
+        def process():
+            # the written value is not forwarded
+            yield from m.read.enable()
+            yield from m.write.call_init(data=1)
+            yield Settle()
+            self.assertIsNone((yield from m.read.call_result()))
+            self.assertIsNotNone((yield from m.write.call_result()))
+            yield
+
+            # full throughput
+            for x in range(2, 6):
+                yield from m.write.call_init(data=x)
+                yield Settle()
+                self.assertEqual((yield from m.read.call_result()), {"data": x - 1})
+                self.assertIsNotNone((yield from m.write.call_result()))
+                yield
+
+            # load the skid buffer
+            yield from m.read.disable()
+            yield from m.write.call_init(data=6)
+            yield Settle()
+            self.assertIsNotNone((yield from m.write.call_result()))
+            yield
+
+            # writes are not possible now
+            yield from m.write.call_init(data=7)
+            yield Settle()
+            self.assertIsNone((yield from m.write.call_result()))
+            yield
+
+            # read from the main register, writes still blocked
+            yield from m.read.enable()
+            yield Settle()
+            self.assertEqual((yield from m.read.call_result()), {"data": 5})
+            self.assertIsNone((yield from m.write.call_result()))
+            yield
+
+            # read from the skid buffer, writes possible again
+            yield Settle()
+            self.assertEqual((yield from m.read.call_result()), {"data": 6})
+            self.assertIsNotNone((yield from m.write.call_result()))
+            yield
+
+            yield from m.write.disable()
+            yield Settle()
+            self.assertEqual((yield from m.read.call_result()), {"data": 7})
+            yield
+
+            # the pipe is empty
+            yield Settle()
+            self.assertIsNone((yield from m.read.call_result()))
+
+        with self.run_simulation(m) as sim:
+            sim.add_sync_process(process)
+
+
 class TestMemoryBank(TestCaseWithSimulator):
     test_conf = [(9, 3, 3, 3, 14), (16, 1, 1, 3, 15), (16, 1, 1, 1, 16), (12, 3, 1, 1, 17)]
 
@@ -241,9 +307,10 @@ class TestMemoryBank(TestCaseWithSimulator):
 
 
 class ManyToOneConnectTransTestCircuit(Elaboratable):
-    def __init__(self, count: int, lay: LayoutLike):
+    def __init__(self, count: int, lay: LayoutLike, and_or_mux: bool = False):
         self.count = count
         self.lay = lay
+        self.and_or_mux = and_or_mux
         self.inputs = []
 
     def elaborate(self, platform):
@@ -260,18 +327,20 @@ class ManyToOneConnectTransTestCircuit(Elaboratable):
         output = TestbenchIO(Adapter(i=self.lay))
         m.submodules.output = output
         self.output = output
-        m.submodules.fu_arbitration = ManyToOneConnectTrans(get_results=get_results, put_result=output.adapter.iface)
+        m.submodules.fu_arbitration = ManyToOneConnectTrans(
+            get_results=get_results, put_result=output.adapter.iface, and_or_mux=self.and_or_mux
+        )
 
         return m
 
 
 class TestManyToOneConnectTrans(TestCaseWithSimulator):
-    def initialize(self):
+    def initialize(self, and_or_mux: bool = False):
         f1_size = 14
         f2_size = 3
         self.lay = [("field1", f1_size), ("field2", f2_size)]
 
-        self.m = ManyToOneConnectTransTestCircuit(self.count, self.lay)
+        self.m = ManyToOneConnectTransTestCircuit(self.count, self.lay, and_or_mux)
         random.seed(14)
 
         self.inputs = []
@@ -350,6 +419,14 @@ class TestManyToOneConnectTrans(TestCaseWithSimulator):
             for i in range(self.count):
                 sim.add_sync_process(self.generate_producer(i))
 
+    def test_many_out_and_or_mux(self):
+        self.count = 4
+        self.initialize(and_or_mux=True)
+        with self.run_simulation(self.m) as sim:
+            sim.add_sync_process(self.consumer)
+            for i in range(self.count):
+                sim.add_sync_process(self.generate_producer(i))
+
 
 class MethodTransformerTestCircuit(Elaboratable):
     def __init__(self, iosize: int, use_methods: bool, use_dicts: bool):
@@ -7,6 +7,7 @@ import contextlib
 
 from collections import deque
 from typing import Iterable, Callable
+from functools import partial
 from parameterized import parameterized, parameterized_class
 
 from ..common import TestCaseWithSimulator, TestbenchIO, data_layout
@@ -16,10 +17,14 @@ from transactron.lib import Adapter, AdapterTrans
 from transactron._utils import Scheduler
 
 from transactron.core import (
+    MethodMap,
     Priority,
     TransactionScheduler,
+    UtilizationCounters,
     trivial_roundrobin_cc_scheduler,
     eager_deterministic_cc_scheduler,
+    eager_bounded_depth_cc_scheduler,
+    eager_roundrobin_cc_scheduler,
 )
 
 
@@ -122,6 +127,8 @@ class TransactionConflictTestCircuit(Elaboratable):
     [
         ("trivial_roundrobin", trivial_roundrobin_cc_scheduler),
         ("eager_deterministic", eager_deterministic_cc_scheduler),
+        ("eager_bounded_depth", eager_bounded_depth_cc_scheduler),
+        ("eager_roundrobin", eager_roundrobin_cc_scheduler),
     ],
 )
 class TestTransactionConflict(TestCaseWithSimulator):
@@ -311,6 +318,197 @@ class TestTransactionPriorities(TestCaseWithSimulator):
                 pass
 
 
+class ConflictGraphTestCircuit(Elaboratable):
+    def __init__(
+        self,
+        scheduler: TransactionScheduler,
+        conflicts: list[tuple[int, int]],
+        count: int,
+        priority: Priority = Priority.LEFT,
+    ):
+        self.scheduler = scheduler
+        self.conflicts = conflicts
+        self.priority = priority
+        self.requests = [Signal() for _ in range(count)]
+        self.grants = [Signal() for _ in range(count)]
+
+    def elaborate(self, platform):
+        m = TModule()
+        tm = TransactionModule(m, TransactionManager(self.scheduler))
+
+        with tm.transaction_context():
+            transactions = []
+            for request, grant in zip(self.requests, self.grants):
+                with (transaction := Transaction()).body(m, request=request):
+                    m.d.comb += grant.eq(1)
+                transactions.append(transaction)
+
+            for i, j in self.conflicts:
+                transactions[i].add_conflict(transactions[j], self.priority)
+
+        return tm
+
+
+class TestEagerBoundedDepthScheduler(TestCaseWithSimulator):
+    def setUp(self):
+        random.seed(42)
+        self.count = 12
+        self.conflicts = [(i, j) for i in range(self.count) for j in range(i + 1, self.count) if random.random() < 0.3]
+
+    def greedy_grants(self, requests: list[int]) -> list[int]:
+        grants = []
+        for j, request in enumerate(requests):
+            blocked = any(grants[i] for i, k in self.conflicts if k == j)
+            grants.append(int(request and not blocked))
+        return grants
+
+    @parameterized.expand([(1,), (3,), (13,)])
+    def test_grants(self, depth: int):
+        m = ConflictGraphTestCircuit(partial(eager_bounded_depth_cc_scheduler, depth=depth), self.conflicts, self.count)
+
+        def process():
+            for _ in range(100):
+                requests = [random.randint(0, 1) for _ in range(self.count)]
+                for signal, request in zip(m.requests, requests):
+                    yield signal.eq(request)
+                yield Settle()
+                grants = []
+                for grant in m.grants:
+                    grants.append((yield grant))
+                expected = self.greedy_grants(requests)
+                for i, j in self.conflicts:
+                    self.assertFalse(grants[i] and grants[j])
+                if depth > self.count:
+                    self.assertEqual(grants, expected)
+                else:
+                    self.assertTrue(all(g <= e for g, e in zip(grants, expected)))
+
+        with self.run_simulation(m, add_transaction_module=False) as sim:
+            sim.add_process(process)
+
+    def test_even_depth(self):
+        m = ConflictGraphTestCircuit(partial(eager_bounded_depth_cc_scheduler, depth=2), self.conflicts, self.count)
+
+        with self.assertRaises(ValueError):
+            with self.run_simulation(m, add_transaction_module=False):
+                pass
+
+
+class TestEagerRoundRobinScheduler(TestCaseWithSimulator):
+    def setUp(self):
+        random.seed(42)
+        self.count = 8
+        self.conflicts = [(i, j) for i in range(self.count) for j in range(i + 1, self.count) if random.random() < 0.4]
+
+    def test_grants(self):
+        m = ConflictGraphTestCircuit(eager_roundrobin_cc_scheduler, self.conflicts, self.count, Priority.UNDEFINED)
+
+        def process():
+            waiting = [0] * self.count
+            for _ in range(200):
+                requests = [int(random.random() < 0.8) for _ in range(self.count)]
+                for signal, request in zip(m.requests, requests):
+                    yield signal.eq(request)
+                yield Settle()
+                grants = []
+                for grant in m.grants:
+                    grants.append((yield grant))
+
+                # Granted transactions form a maximal independent set of the requesting ones
+                for i, j in self.conflicts:
+                    self.assertFalse(grants[i] and grants[j])
+                for k in range(self.count):
+                    neighbours = [j for i, j in self.conflicts if i == k] + [i for i, j in self.conflicts if j == k]
+                    self.assertEqual(grants[k], requests[k] and not any(grants[j] for j in neighbours))
+
+                # No transaction waits longer than a full rotation
+                for k in range(self.count):
+                    waiting[k] = waiting[k] + 1 if requests[k] and not grants[k] else 0
+                    self.assertLess(waiting[k], self.count)
+                yield
+
+        with self.run_simulation(m, add_transaction_module=False) as sim:
+            sim.add_sync_process(process)
+
+    def test_priorities(self):
+        # With priorities defined for every conflict, the scheduler is deterministic
+        m = ConflictGraphTestCircuit(eager_roundrobin_cc_scheduler, self.conflicts, self.count, Priority.LEFT)
+
+        def process():
+            for _ in range(50):
+                requests = [random.randint(0, 1) for _ in range(self.count)]
+                for signal, request in zip(m.requests, requests):
+                    yield signal.eq(request)
+                yield Settle()
+                granted = set()
+                for k in range(self.count):
+                    blocked = any(i in granted for i, j in self.conflicts if j == k)
+                    self.assertEqual((yield m.grants[k]), int(requests[k] and not blocked))
+                    if (yield m.grants[k]):
+                        granted.add(k)
+                yield
+
+        with self.run_simulation(m, add_transaction_module=False) as sim:
+            sim.add_sync_process(process)
+
+
+class ExclusiveCallsTestCircuit(Elaboratable):
+    def __init__(self, exclusive: bool):
+        self.exclusive = exclusive
+        self.sel = Signal(2)
+        self.out = Signal(8)
+        self.manager = TransactionManager()
+
+    def elaborate(self, platform):
+        m = TModule()
+        tm = TransactionModule(m, self.manager)
+
+        method = Method(i=data_layout(8))
+
+        @def_method(m, method)
+        def _(data):
+            m.d.comb += self.out.eq(data)
+
+        with tm.transaction_context():
+            if self.exclusive:
+                with m.Switch(self.sel):
+                    for i in range(3):
+                        with m.Case(i):
+                            with Transaction().body(m):
+                                method(m, data=i + 1)
+            else:
+                for i in range(3):
+                    with m.If(self.sel == i):
+                        with Transaction().body(m):
+                            method(m, data=i + 1)
+
+        return tm
+
+
+class TestExclusiveCalls(TestCaseWithSimulator):
+    @parameterized.expand([(True,), (False,)])
+    def test_conflicts(self, exclusive: bool):
+        circ = ExclusiveCallsTestCircuit(exclusive)
+        Fragment.get(circ, None)
+
+        cgr, _, _ = TransactionManager._conflict_graph(MethodMap(circ.manager.transactions))
+        self.assertEqual(len(cgr), 3)
+        for transaction in cgr:
+            self.assertEqual(len(cgr[transaction]), 0 if exclusive else 2)
+
+    def test_calls(self):
+        circ = ExclusiveCallsTestCircuit(True)
+
+        def process():
+            for sel in [0, 1, 2, 3, 1, 0]:
+                yield circ.sel.eq(sel)
+                yield Settle()
+                self.assertEqual((yield circ.out), sel + 1 if sel < 3 else 0)
+
+        with self.run_simulation(circ, add_transaction_module=False) as sim:
+            sim.add_process(process)
+
+
 class NestedTransactionsTestCircuit(SchedulingTestCircuit):
     def elaborate(self, platform):
         m = TModule()
@@ -445,3 +643,82 @@ class TestSingleCaller(TestCaseWithSimulator):
         with self.assertRaises(RuntimeError):
             with self.run_simulation(m):
                 pass
+
+
+class UtilizationCountersTestCircuit(SchedulingTestCircuit):
+    def __init__(self):
+        super().__init__()
+        self.ready = Signal()
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        method = Method(name="method")
+
+        @def_method(m, method, ready=self.ready)
+        def _():
+            pass
+
+        with Transaction(name="transaction1").body(m, request=self.r1):
+            m.d.comb += self.t1.eq(1)
+            method(m)
+
+        with Transaction(name="transaction2").body(m, request=self.r2):
+            m.d.comb += self.t2.eq(1)
+            method(m)
+
+        return m
+
+
+class TestUtilizationCounters(TestCaseWithSimulator):
+    def test_counters(self):
+        random.seed(42)
+        m = UtilizationCountersTestCircuit()
+        manager = TransactionManager()
+        counters = manager.utilization_counters(width=8)
+
+        expected = {
+            f"{name}.{kind}": 0
+            for name in ["transaction1", "transaction2", "method"]
+            for kind in UtilizationCounters.kinds
+        }
+
+        def count(name: str, requested: bool, granted: bool, ready: bool):
+            expected[f"{name}.requested"] += requested
+            expected[f"{name}.granted"] += granted
+            expected[f"{name}.blocked_not_ready"] += requested and not ready
+            expected[f"{name}.blocked_conflict"] += requested and ready and not granted
+
+        def read_counters():
+            values = {}
+            for i, name in enumerate(counters.names):
+                yield counters.addr.eq(i)
+                yield Settle()
+                values[name.removeprefix("UtilizationCountersTestCircuit_")] = yield counters.data
+            return values
+
+        def process():
+            for _ in range(100):
+                r1, r2, ready = (random.randrange(2) for _ in range(3))
+                yield m.r1.eq(r1)
+                yield m.r2.eq(r2)
+                yield m.ready.eq(ready)
+                yield Settle()
+                t1 = yield m.t1
+                t2 = yield m.t2
+                count("transaction1", r1, t1, ready)
+                count("transaction2", r2, t2, ready)
+                count("method", r1 or r2, t1 or t2, ready)
+                yield
+
+            yield m.r1.eq(0)
+            yield m.r2.eq(0)
+            self.assertEqual((yield from read_counters()), expected)
+
+            yield counters.clear.eq(1)
+            yield
+            yield counters.clear.eq(0)
+            self.assertEqual((yield from read_counters()), {name: 0 for name in expected})
+
+        with self.run_simulation(TransactionModule(m, manager), add_transaction_module=False) as sim:
+            sim.add_sync_process(process)
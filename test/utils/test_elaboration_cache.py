@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+
+from coreblocks.fu.alu import ALUComponent
+from coreblocks.params.configurations import basic_core_config, full_core_config, tiny_core_config
+from coreblocks.stages.rs_func_block import RSBlockComponent
+from coreblocks.utils.elaboration_cache import ElaborationCache, config_hash
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_equal_configs(self):
+        config1 = basic_core_config.replace(func_units_config=(RSBlockComponent([ALUComponent()], rs_entries=4),))
+        config2 = basic_core_config.replace(func_units_config=(RSBlockComponent([ALUComponent()], rs_entries=4),))
+        self.assertEqual(config_hash(config1), config_hash(config2))
+
+    def test_different_configs(self):
+        configs = [
+            basic_core_config,
+            tiny_core_config,
+            full_core_config,
+            basic_core_config.replace(start_pc=4),
+            basic_core_config.replace(func_units_config=(RSBlockComponent([ALUComponent()], rs_entries=4),)),
+            basic_core_config.replace(func_units_config=(RSBlockComponent([ALUComponent()], rs_entries=2),)),
+            basic_core_config.replace(func_units_config=(RSBlockComponent([ALUComponent(zba_enable=True)], 4),)),
+        ]
+        hashes = {config_hash(config) for config in configs}
+        self.assertEqual(len(hashes), len(configs))
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            config_hash(lambda: 0)
+
+
+class TestElaborationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ElaborationCache(self.tmp_dir.name)
+        self.generated = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def generate(self):
+        self.generated += 1
+        return f"module top{self.generated}; endmodule"
+
+    def test_reuse(self):
+        first = self.cache.get_or_generate(self.generate, "verilog", basic_core_config)
+        second = self.cache.get_or_generate(self.generate, "verilog", basic_core_config)
+        self.assertEqual(first, second)
+        self.assertEqual(self.generated, 1)
+
+        # a fresh cache object in the same directory reuses the entries
+        cache = ElaborationCache(self.tmp_dir.name)
+        self.assertEqual(cache.get_or_generate(self.generate, "verilog", basic_core_config), first)
+        self.assertEqual(self.generated, 1)
+
+    def test_different_keys(self):
+        self.cache.get_or_generate(self.generate, "verilog", basic_core_config)
+        self.cache.get_or_generate(self.generate, "verilog", tiny_core_config)
+        self.cache.get_or_generate(self.generate, "rtlil", basic_core_config)
+        self.assertEqual(self.generated, 3)
@@ -10,13 +10,14 @@ import random
 
 
 class BasicFifoTestCircuit(Elaboratable):
-    def __init__(self, depth):
+    def __init__(self, depth, init=()):
         self.depth = depth
+        self.init = init
 
     def elaborate(self, platform):
         m = Module()
 
-        m.submodules.fifo = self.fifo = BasicFifo(layout=data_layout(8), depth=self.depth)
+        m.submodules.fifo = self.fifo = BasicFifo(layout=data_layout(8), depth=self.depth, init=self.init)
 
         m.submodules.fifo_read = self.fifo_read = TestbenchIO(AdapterTrans(self.fifo.read))
         m.submodules.fifo_write = self.fifo_write = TestbenchIO(AdapterTrans(self.fifo.write))
@@ -76,3 +77,25 @@ class TestBasicFifo(TestCaseWithSimulator):
         with self.run_simulation(fifoc) as sim:
             sim.add_sync_process(source)
             sim.add_sync_process(target)
+
+    def test_init(self):
+        random.seed(42)
+        init = [random.randrange(2**8) for _ in range(self.depth)]
+        fifoc = BasicFifoTestCircuit(depth=self.depth, init=init)
+
+        def process():
+            # the FIFO is full after reset
+            yield from fifoc.fifo_write.call_init(data=0)
+            yield
+            self.assertIsNone((yield from fifoc.fifo_write.call_result()))
+            yield from fifoc.fifo_write.disable()
+
+            for v in init:
+                self.assertEqual((yield from fifoc.fifo_read.call())["data"], v)
+
+            v = random.randrange(2**8)
+            yield from fifoc.fifo_write.call(data=v)
+            self.assertEqual((yield from fifoc.fifo_read.call())["data"], v)
+
+        with self.run_simulation(fifoc) as sim:
+            sim.add_sync_process(process)
@@ -9,6 +9,7 @@ from transactron.utils import (
     popcount,
     count_leading_zeros,
     count_trailing_zeros,
+    one_hot_mux,
 )
 from parameterized import parameterized_class
 
@@ -194,3 +195,57 @@ class TestCountTrailingZeros(TestCaseWithSimulator):
     def test_count_trailing_zeros(self):
         with self.run_simulation(self.m) as sim:
             sim.add_process(self.process)
+
+
+class OneHotMuxTestCircuit(Elaboratable):
+    def __init__(self, count: int, width: int):
+        self.sel = Signal(count)
+        self.values = [Signal(width) for _ in range(count)]
+        self.sig_out = Signal(width)
+
+    def elaborate(self, platform):
+        m = Module()
+
+        m.d.comb += self.sig_out.eq(one_hot_mux(self.sel, self.values))
+        # dummy signal
+        s = Signal()
+        m.d.sync += s.eq(1)
+
+        return m
+
+
+@parameterized_class(
+    ("name", "count"),
+    [("count" + str(c), c) for c in [1, 2, 3, 5, 8]],
+)
+class TestOneHotMux(TestCaseWithSimulator):
+    count: int
+
+    def setUp(self):
+        random.seed(14)
+        self.test_number = 40
+        self.width = 8
+        self.m = OneHotMuxTestCircuit(self.count, self.width)
+
+    def process(self):
+        for _ in range(self.test_number):
+            values = [random.randrange(2**self.width) for _ in range(self.count)]
+            for signal, value in zip(self.m.values, values):
+                yield signal.eq(value)
+
+            for i in range(self.count):
+                yield self.m.sel.eq(1 << i)
+                yield Settle()
+                self.assertEqual((yield self.m.sig_out), values[i])
+
+            yield self.m.sel.eq(0)
+            yield Settle()
+            self.assertEqual((yield self.m.sig_out), 0)
+
+    def test_one_hot_mux(self):
+        with self.run_simulation(self.m) as sim:
+            sim.add_process(self.process)
+
+    def test_width_mismatch(self):
+        with self.assertRaises(ValueError):
+            one_hot_mux(Signal(self.count + 1), self.m.values)
@@ -22,10 +22,11 @@ from itertools import count, chain, filterfalse, product
 from amaranth.hdl.dsl import FSM, _ModuleBuilderDomain
 
 from transactron.utils import AssignType, assign, ModuleConnector, silence_mustuse
-from transactron.utils.utils import OneHotSwitchDynamic
+from transactron.utils.utils import OneHotSwitchDynamic, one_hot_mux
 from ._utils import *
 from transactron.utils._typing import ValueLike, SignalBundle, HasElaborate, SwitchKey, ModuleLike
 from .graph import Owned, OwnershipGraph, Direction
+from .profiler import profile_section
 
 __all__ = [
     "MethodLayout",
@@ -36,7 +37,10 @@ __all__ = [
     "TransactionModule",
     "Transaction",
     "Method",
+    "UtilizationCounters",
     "eager_deterministic_cc_scheduler",
+    "eager_bounded_depth_cc_scheduler",
+    "eager_roundrobin_cc_scheduler",
     "trivial_roundrobin_cc_scheduler",
     "def_method",
 ]
@@ -48,6 +52,7 @@ PriorityOrder: TypeAlias = dict["Transaction", int]
 TransactionScheduler: TypeAlias = Callable[["MethodMap", TransactionGraph, TransactionGraphCC, PriorityOrder], Module]
 RecordDict: TypeAlias = ValueLike | Mapping[str, "RecordDict"]
 TransactionOrMethod: TypeAlias = Union["Transaction", "Method"]
+ConditionPath: TypeAlias = tuple[tuple[int, int], ...]
 TransactionOrMethodBound = TypeVar("TransactionOrMethodBound", "Transaction", "Method")
 
 
@@ -76,8 +81,9 @@ class MethodMap:
         self.methods_by_transaction = dict[Transaction, list[Method]]()
         self.transactions_by_method = defaultdict[Method, list[Transaction]](list)
         self.readiness_by_method_and_transaction = dict[tuple[Transaction, Method], ValueLike]()
+        self.paths_by_method_and_transaction = dict[tuple[Transaction, Method], ConditionPath]()
 
-        def rec(transaction: Transaction, source: TransactionBase):
+        def rec(transaction: Transaction, source: TransactionBase, path: ConditionPath):
             for method, (arg_rec, _) in source.method_uses.items():
                 if not method.defined:
                     raise RuntimeError(f"Trying to use method '{method.name}' which is not defined yet")
@@ -86,11 +92,25 @@ class MethodMap:
                 self.methods_by_transaction[transaction].append(method)
                 self.transactions_by_method[method].append(transaction)
                 self.readiness_by_method_and_transaction[(transaction, method)] = method._validate_arguments(arg_rec)
-                rec(transaction, method)
+                method_path = path + source.method_paths.get(method, ())
+                self.paths_by_method_and_transaction[(transaction, method)] = method_path
+                rec(transaction, method, method_path)
 
         for transaction in transactions:
             self.methods_by_transaction[transaction] = []
-            rec(transaction, transaction)
+            rec(transaction, transaction, ())
+
+    def calls_exclusive(self, transaction1: "Transaction", transaction2: "Transaction", method: "Method") -> bool:
+        """Checks if the calls of `method` by two transactions are mutually exclusive.
+
+        This is the case when the calls are placed in different branches
+        of the same `If`, `Switch` or `FSM` construct.
+        """
+        branches = dict(self.paths_by_method_and_transaction[(transaction1, method)])
+        return any(
+            chain in branches and branches[chain] != branch
+            for chain, branch in self.paths_by_method_and_transaction[(transaction2, method)]
+        )
 
     def transactions_for(self, elem: TransactionOrMethod) -> Iterable["Transaction"]:
         if isinstance(elem, Transaction):
@@ -152,6 +172,185 @@ def eager_deterministic_cc_scheduler(
     return m
 
 
+def eager_bounded_depth_cc_scheduler(
+    method_map: MethodMap, gr: TransactionGraph, cc: TransactionGraphCC, porder: PriorityOrder, *, depth: int = 3
+) -> Module:
+    """eager_bounded_depth_cc_scheduler
+
+    This function generates an eager scheduler for the transaction
+    subsystem with bounded combinational depth. It uses the same static
+    priorities as `eager_deterministic_cc_scheduler`, but instead of
+    computing the grant of every transaction from the final grants of
+    all higher priority conflicting transactions, the grants are computed
+    in `depth` levels. On level zero every runnable transaction is
+    assumed to be granted. On every next level a transaction is granted
+    if none of its higher priority neighbours was granted on the previous
+    level. Every level is a single OR reduction, so the depth of the
+    generated logic is proportional to `depth` times the logarithm of
+    the number of conflicts of a transaction.
+
+    The result is the same as for `eager_deterministic_cc_scheduler`
+    for transactions whose chains of higher priority conflicting
+    transactions are not longer than `depth`. For longer chains, the
+    odd number of levels guarantees that the grants are a subset of
+    the ones given by `eager_deterministic_cc_scheduler`, so a
+    transaction can be denied a grant it would otherwise get, but two
+    conflicting transactions are never granted together. For example,
+    for `depth` equal to one, a transaction is granted only if no higher
+    priority conflicting transaction is runnable, which is exact when
+    the connected component is a clique.
+
+    To use a different depth, pass e.g.
+    `functools.partial(eager_bounded_depth_cc_scheduler, depth=5)`
+    to the `TransactionManager`.
+
+    Parameters
+    ----------
+    manager : TransactionManager
+        TransactionManager which uses this instance of scheduler for
+        arbitrating which agent should get a grant signal.
+    gr : TransactionGraph
+        Graph of conflicts between transactions, where vertices are transactions and edges are conflicts.
+    cc : Set[Transaction]
+        Connected components of the graph `gr` for which scheduler
+        should be generated.
+    porder : PriorityOrder
+        Linear ordering of transactions which is consistent with priority constraints.
+    depth : int
+        Number of levels of the generated logic. Must be odd.
+    """
+    if depth < 1 or depth % 2 == 0:
+        raise ValueError(f"Scheduler depth must be a positive odd number, got {depth}")
+
+    m = Module()
+    ccl = list(cc)
+    ccl.sort(key=lambda transaction: porder[transaction])
+
+    higher: dict[Transaction, list[Transaction]] = {}
+    height: dict[Transaction, int] = {}
+    runnable: dict[Transaction, Value] = {}
+    for transaction in ccl:
+        higher[transaction] = [other for other in gr[transaction] if porder[other] < porder[transaction]]
+        # Grants of transactions are exact on levels not lower than their height.
+        height[transaction] = max((height[other] + 1 for other in higher[transaction]), default=0)
+        ready = [
+            method_map.readiness_by_method_and_transaction[(transaction, method)]
+            for method in method_map.methods_by_transaction[transaction]
+        ]
+        runnable[transaction] = transaction.request & Cat(ready).all()
+
+    grants: dict[tuple[Transaction, int], Value] = {}
+
+    def level_grant(transaction: Transaction, level: int) -> Value:
+        level = min(level, height[transaction])
+        if level == 0:
+            return runnable[transaction]
+        if (transaction, level) not in grants:
+            grant = Signal(name=f"{transaction.name}_grant_{level}")
+            conflicts = [level_grant(other, level - 1) for other in higher[transaction]]
+            m.d.comb += grant.eq(runnable[transaction] & ~Cat(conflicts).any())
+            grants[(transaction, level)] = grant
+        return grants[(transaction, level)]
+
+    for transaction in ccl:
+        m.d.comb += transaction.grant.eq(level_grant(transaction, depth))
+    return m
+
+
+def eager_roundrobin_cc_scheduler(
+    method_map: MethodMap, gr: TransactionGraph, cc: TransactionGraphCC, porder: PriorityOrder
+) -> Module:
+    """eager_roundrobin_cc_scheduler
+
+    This function generates a fair eager scheduler for the transaction
+    subsystem. Like `eager_deterministic_cc_scheduler`, it starts every
+    runnable transaction which does not conflict with a higher priority
+    granted transaction, but the priorities rotate. Every cycle in which
+    some transaction in `cc` is granted, a different transaction becomes
+    the highest priority one.
+
+    Transactions which have priority relations, added with `add_conflict`
+    or `schedule_before`, keep their order from `porder` relative to each
+    other. Other transactions are rotated, so if one of them is continuously
+    runnable, it is granted after at most `len(cc)` cycles.
+
+    The scheduler contains a copy of the eager scheduling logic for every
+    priority rotation, so its size is quadratic in the size of `cc`.
+
+    Parameters
+    ----------
+    manager : TransactionManager
+        TransactionManager which uses this instance of scheduler for
+        arbitrating which agent should get a grant signal.
+    gr : TransactionGraph
+        Graph of conflicts between transactions, where vertices are transactions and edges are conflicts.
+    cc : Set[Transaction]
+        Connected components of the graph `gr` for which scheduler
+        should be generated.
+    porder : PriorityOrder
+        Linear ordering of transactions which is consistent with priority constraints.
+    """
+    m = Module()
+    ccl = list(cc)
+    ccl.sort(key=lambda transaction: porder[transaction])
+    index = {transaction: k for k, transaction in enumerate(ccl)}
+
+    # Transactions with priority relations keep their relative order from `porder`. This respects
+    # the priorities and avoids combinational loops when requests depend on grants.
+    fixed: list[int] = []
+    for elem in method_map.methods_and_transactions:
+        for relation in elem.relations:
+            if relation["priority"] == Priority.UNDEFINED:
+                continue
+            for transaction in chain(method_map.transactions_for(elem), method_map.transactions_for(relation["end"])):
+                if transaction in index:
+                    fixed.append(index[transaction])
+    fixed = sorted(set(fixed))
+
+    runnable: list[Value] = []
+    for transaction in ccl:
+        ready = [
+            method_map.readiness_by_method_and_transaction[(transaction, method)]
+            for method in method_map.methods_by_transaction[transaction]
+        ]
+        runnable.append(transaction.request & Cat(ready).all())
+
+    pointer = Signal(range(len(ccl)))
+    orders: dict[tuple[int, ...], list[Signal]] = {}
+    grants: list[tuple[int, list[Signal]]] = []
+    for rotation in range(len(ccl)):
+        # Rotated order of transactions, transactions in `fixed` are delayed to keep their order.
+        order: list[int] = []
+        next_fixed = 0
+        delayed: set[int] = set()
+        for k in chain(range(rotation, len(ccl)), range(rotation)):
+            if k not in fixed:
+                order.append(k)
+                continue
+            delayed.add(k)
+            while next_fixed < len(fixed) and fixed[next_fixed] in delayed:
+                order.append(fixed[next_fixed])
+                next_fixed += 1
+
+        if tuple(order) not in orders:
+            rotation_grants = [Signal(name=f"{transaction.name}_grant_r{rotation}") for transaction in ccl]
+            for pos, k in enumerate(order):
+                conflicts = [rotation_grants[j] for j in order[:pos] if ccl[j] in gr[ccl[k]]]
+                m.d.comb += rotation_grants[k].eq(runnable[k] & ~Cat(conflicts).any())
+            orders[tuple(order)] = rotation_grants
+        grants.append((rotation, orders[tuple(order)]))
+
+    for k, transaction in enumerate(ccl):
+        m.d.comb += transaction.grant.eq(
+            Cat((pointer == rotation) & rotation_grants[k] for rotation, rotation_grants in grants).any()
+        )
+
+    with m.If(Cat(transaction.grant for transaction in ccl).any()):
+        m.d.sync += pointer.eq(Mux(pointer == len(ccl) - 1, 0, pointer + 1))
+
+    return m
+
+
 def trivial_roundrobin_cc_scheduler(
     method_map: MethodMap, gr: TransactionGraph, cc: TransactionGraphCC, porder: PriorityOrder
 ) -> Module:
@@ -190,6 +389,59 @@ def trivial_roundrobin_cc_scheduler(
     return m
 
 
+class UtilizationCounters:
+    """Utilization counters interface
+
+    Read interface of the utilization counters generated by the
+    `TransactionManager`, created by `TransactionManager.utilization_counters`.
+    For every transaction and every method, four counters are kept,
+    in the order given by `kinds`:
+
+    * `requested` -- cycles in which the transaction requested execution;
+      for methods, cycles in which some calling transaction requested
+      execution and the call was enabled,
+    * `granted` -- cycles in which the transaction or method was run,
+    * `blocked_not_ready` -- cycles in which execution was requested,
+      but some of the called methods (for methods: the method itself)
+      were not ready,
+    * `blocked_conflict` -- cycles in which execution was requested
+      and possible, but not granted due to a conflict.
+
+    The counters form a read-only window: the value of the counter
+    with index `addr` is available combinationally on `data`.
+
+    Attributes
+    ----------
+    addr: Signal, in
+        Index of the counter to read.
+    data: Signal, out
+        Value of the counter selected by `addr`. Zero if there is no such
+        counter.
+    clear: Signal, in
+        Resets all the counters to zero.
+    names: list[str]
+        Names of the counters, indexed by counter index. Filled in when
+        the `TransactionManager` is elaborated.
+    """
+
+    kinds = ("requested", "granted", "blocked_not_ready", "blocked_conflict")
+
+    def __init__(self, *, width: int, addr_width: int):
+        """
+        Parameters
+        ----------
+        width: int
+            Bit width of the counters. The counters wrap around on overflow.
+        addr_width: int
+            Bit width of the counter index.
+        """
+        self.width = width
+        self.addr = Signal(addr_width)
+        self.data = Signal(width)
+        self.clear = Signal()
+        self.names: list[str] = []
+
+
 class TransactionManager(Elaboratable):
     """Transaction manager
 
@@ -198,13 +450,53 @@ class TransactionManager(Elaboratable):
     are never granted in the same clock cycle.
     """
 
-    def __init__(self, cc_scheduler: TransactionScheduler = eager_deterministic_cc_scheduler):
+    def __init__(
+        self, cc_scheduler: TransactionScheduler = eager_deterministic_cc_scheduler, *, and_or_mux: bool = False
+    ):
+        """
+        Parameters
+        ----------
+        cc_scheduler: TransactionScheduler
+            Scheduler generator, called for every connected component
+            of the transaction conflict graph.
+        and_or_mux: bool
+            If true, arguments of all methods with multiple callers are
+            selected using AND-OR multiplexers (see `one_hot_mux`) instead
+            of a `Switch` on the one-hot run vector. This can be also
+            enabled for single methods, see `Method`.
+        """
         self.transactions: list[Transaction] = []
         self.cc_scheduler = cc_scheduler
+        self.and_or_mux = and_or_mux
+        self.counters: Optional[UtilizationCounters] = None
 
     def add_transaction(self, transaction: "Transaction"):
         self.transactions.append(transaction)
 
+    def utilization_counters(self, *, width: int = 32, addr_width: int = 16) -> UtilizationCounters:
+        """Enables the utilization counters.
+
+        The manager generates the counters described in `UtilizationCounters`
+        for all transactions and methods it schedules. The counters are
+        generated only if this function is called before the manager is
+        elaborated; later calls return the same interface.
+
+        Parameters
+        ----------
+        width: int
+            Bit width of the counters.
+        addr_width: int
+            Bit width of the counter index.
+
+        Returns
+        -------
+        UtilizationCounters
+            Interface for reading the counters.
+        """
+        if self.counters is None:
+            self.counters = UtilizationCounters(width=width, addr_width=addr_width)
+        return self.counters
+
     @staticmethod
     def _conflict_graph(method_map: MethodMap) -> Tuple[TransactionGraph, TransactionGraph, PriorityOrder]:
         """_conflict_graph
@@ -213,7 +505,9 @@ class TransactionManager(Elaboratable):
         between transactions can be explicit or implicit. Two transactions
         conflict explicitly, if a conflict was added between the transactions
         or the methods used by them via `add_conflict`. Two transactions
-        conflict implicitly if they are both using the same method.
+        conflict implicitly if they are both using the same method, unless
+        the calls are placed in different branches of the same `If`,
+        `Switch` or `FSM` construct, so they are never enabled together.
 
         Created graph is undirected. Transactions are nodes in that graph
         and conflict between two transactions is marked as an edge. In such
@@ -264,8 +558,11 @@ class TransactionManager(Elaboratable):
                 continue
             for transaction1 in method_map.transactions_for(method):
                 for transaction2 in method_map.transactions_for(method):
-                    if transaction1 is not transaction2:
-                        add_edge(transaction1, transaction2, Priority.UNDEFINED, True)
+                    if transaction1 is transaction2:
+                        continue
+                    if method_map.calls_exclusive(transaction1, transaction2, method):
+                        continue
+                    add_edge(transaction1, transaction2, Priority.UNDEFINED, True)
 
         relations = [
             Relation(**relation, start=elem)
@@ -308,6 +605,51 @@ class TransactionManager(Elaboratable):
 
         return method_enables
 
+    def _utilization_counters(
+        self,
+        m: Module,
+        method_map: MethodMap,
+        method_enables: Mapping["Transaction", Mapping["Method", ValueLike]],
+    ):
+        assert self.counters is not None
+        events: list[tuple[str, Sequence[ValueLike]]] = []
+
+        for transaction in method_map.transactions:
+            ready = Cat(
+                method_map.readiness_by_method_and_transaction[(transaction, method)]
+                for method in method_map.methods_by_transaction[transaction]
+            ).all()
+            request = transaction.request
+            grant = transaction.grant
+            events.append((transaction.owned_name, [request, grant, request & ~ready, request & ready & ~grant]))
+
+        for method, transactions in method_map.transactions_by_method.items():
+            request = Cat(transaction.request & method_enables[transaction][method] for transaction in transactions)
+            request = request.any()
+            ready = method.ready
+            run = method.run
+            events.append((method.owned_name, [request, run, request & ~ready, request & ready & ~run]))
+
+        if len(events) * len(UtilizationCounters.kinds) > 2 ** len(self.counters.addr):
+            raise RuntimeError(f"Too many utilization counters for {len(self.counters.addr)}-bit index")
+
+        counters: list[Signal] = []
+        self.counters.names.clear()
+        for name, conditions in events:
+            for kind, condition in zip(UtilizationCounters.kinds, conditions):
+                counter = Signal(self.counters.width, name=f"{name}_{kind}")
+                with m.If(self.counters.clear):
+                    m.d.sync += counter.eq(0)
+                with m.Elif(condition):
+                    m.d.sync += counter.eq(counter + 1)
+                counters.append(counter)
+                self.counters.names.append(f"{name}.{kind}")
+
+        with m.Switch(self.counters.addr):
+            for i, counter in enumerate(counters):
+                with m.Case(i):
+                    m.d.comb += self.counters.data.eq(counter)
+
     @staticmethod
     def _method_calls(
         m: Module, method_map: MethodMap
@@ -315,6 +657,13 @@ class TransactionManager(Elaboratable):
         args = defaultdict[Method, list[ValueLike]](list)
         runs = defaultdict[Method, list[ValueLike]](list)
 
+        # Methods with mutually exclusive calls can be called by simultaneously granted transactions,
+        # so the call enables are needed to choose the caller.
+        exclusive_methods = set[Method]()
+        for method, transactions in method_map.transactions_by_method.items():
+            if any(method_map.calls_exclusive(t1, t2, method) for t1, t2 in product(transactions, transactions)):
+                exclusive_methods.add(method)
+
         for source in method_map.methods_and_transactions:
             if isinstance(source, Method):
                 run_val = Cat(transaction.grant for transaction in method_map.transactions_by_method[source]).any()
@@ -322,9 +671,12 @@ class TransactionManager(Elaboratable):
                 m.d.comb += run.eq(run_val)
             else:
                 run = source.grant
-            for method, (arg, _) in source.method_uses.items():
+            for method, (arg, enable) in source.method_uses.items():
                 args[method].append(arg)
-                runs[method].append(run)
+                if method in exclusive_methods:
+                    runs[method].append((source.run if isinstance(source, Method) else run) & enable)
+                else:
+                    runs[method].append(run)
 
         return (args, runs)
 
@@ -365,28 +717,61 @@ class TransactionManager(Elaboratable):
                         )
                     simultaneous.add(frozenset({tr1, tr2}))
 
-        # step 2: transitivity computation
-        tr_simultaneous = set[frozenset[Transaction]]()
+        # step 2: connected components of the simultaneity graph, computed using union-find
+        parent = dict[Transaction, Transaction]()
+
+        def find(transaction: Transaction) -> Transaction:
+            root = transaction
+            while parent.setdefault(root, root) is not root:
+                root = parent[root]
+            while transaction is not root:
+                parent[transaction], transaction = root, parent[transaction]
+            return root
+
+        for tr1, tr2 in simultaneous:
+            parent[find(tr1)] = find(tr2)
+
+        components = defaultdict[Transaction, set[frozenset[Transaction]]](set)
+        for group in simultaneous:
+            components[find(next(iter(group)))].add(group)
 
         def conflicting(group: frozenset[Transaction]):
-            return any(tr1 != tr2 and tr1 in independents[tr2] for tr1 in group for tr2 in group)
+            return any((independents[tr] & group) - {tr} for tr in group)
 
-        q = deque[frozenset[Transaction]](simultaneous)
+        final_simultaneous = set[frozenset[Transaction]]()
 
-        while q:
-            new_group = q.popleft()
-            if new_group in tr_simultaneous or conflicting(new_group):
+        for pairs in components.values():
+            component = frozenset[Transaction]().union(*pairs)
+            # the whole component is the only maximal group, unless it contains independent transactions
+            if not conflicting(component):
+                final_simultaneous.add(component)
                 continue
-            q.extend(new_group | other_group for other_group in simultaneous if new_group & other_group)
-            tr_simultaneous.add(new_group)
 
-        # step 3: maximal group selection
-        def maximal(group: frozenset[Transaction]):
-            return not any(group.issubset(group2) and group != group2 for group2 in tr_simultaneous)
+            # step 3: transitivity computation inside the component
+            pairs_by_transaction = defaultdict[Transaction, list[frozenset[Transaction]]](list)
+            for group in pairs:
+                for transaction in group:
+                    pairs_by_transaction[transaction].append(group)
+
+            tr_simultaneous = set[frozenset[Transaction]]()
+            q = deque[frozenset[Transaction]](pairs)
 
-        final_simultaneous = set(filter(maximal, tr_simultaneous))
+            while q:
+                new_group = q.popleft()
+                if new_group in tr_simultaneous or conflicting(new_group):
+                    continue
+                q.extend(new_group | group for transaction in new_group for group in pairs_by_transaction[transaction])
+                tr_simultaneous.add(new_group)
 
-        # step 4: convert transactions to methods
+            # step 4: maximal group selection
+            maximal_groups = list[frozenset[Transaction]]()
+            for group in sorted(tr_simultaneous, key=len, reverse=True):
+                if not any(group < group2 for group2 in maximal_groups):
+                    maximal_groups.append(group)
+
+            final_simultaneous.update(maximal_groups)
+
+        # step 5: convert transactions to methods
         joined_transactions = set[Transaction]().union(*final_simultaneous)
 
         self.transactions = list(filter(lambda t: t not in joined_transactions, self.transactions))
@@ -400,6 +785,7 @@ class TransactionManager(Elaboratable):
             method.run = transaction.grant
             method.defined = transaction.defined
             method.method_uses = transaction.method_uses
+            method.method_paths = transaction.method_paths
             method.relations = transaction.relations
             method.def_order = transaction.def_order
             methods[transaction] = method
@@ -410,7 +796,7 @@ class TransactionManager(Elaboratable):
                 if relation["end"] in methods:
                     relation["end"] = methods[relation["end"]]
 
-        # step 5: construct merged transactions
+        # step 6: construct merged transactions
         m = TModule()
         m._MustUse__silence = True  # type: ignore
 
@@ -426,36 +812,49 @@ class TransactionManager(Elaboratable):
         # In the following, various problems in the transaction set-up are detected.
         # The exception triggers an unused Elaboratable warning.
         with silence_mustuse(self):
-            merge_manager = self._simultaneous()
+            with profile_section("manager", "simultaneous"):
+                merge_manager = self._simultaneous()
 
-            method_map = MethodMap(self.transactions)
-            cgr, rgr, porder = TransactionManager._conflict_graph(method_map)
+            with profile_section("manager", "conflict_graph"):
+                method_map = MethodMap(self.transactions)
+                cgr, rgr, porder = TransactionManager._conflict_graph(method_map)
 
         m = Module()
         m.submodules.merge_manager = merge_manager
 
-        m.submodules._transactron_schedulers = ModuleConnector(
-            *[self.cc_scheduler(method_map, cgr, cc, porder) for cc in _graph_ccs(rgr)]
-        )
+        with profile_section("manager", "schedulers"):
+            m.submodules._transactron_schedulers = ModuleConnector(
+                *[self.cc_scheduler(method_map, cgr, cc, porder) for cc in _graph_ccs(rgr)]
+            )
 
-        method_enables = self._method_enables(method_map)
+        with profile_section("manager", "method_enables"):
+            method_enables = self._method_enables(method_map)
 
-        for method, transactions in method_map.transactions_by_method.items():
-            granted = Cat(transaction.grant & method_enables[transaction][method] for transaction in transactions)
-            m.d.comb += method.run.eq(granted.any())
+            for method, transactions in method_map.transactions_by_method.items():
+                granted = Cat(transaction.grant & method_enables[transaction][method] for transaction in transactions)
+                m.d.comb += method.run.eq(granted.any())
 
-        (method_args, method_runs) = self._method_calls(m, method_map)
+        if self.counters is not None:
+            with profile_section("manager", "utilization_counters"):
+                self._utilization_counters(m, method_map, method_enables)
 
-        for method in method_map.methods:
-            if len(method_args[method]) == 1:
-                m.d.comb += method.data_in.eq(method_args[method][0])
-            else:
-                if method.single_caller:
-                    raise RuntimeError(f"Single-caller method '{method.name}' called more than once")
+        with profile_section("manager", "method_calls"):
+            (method_args, method_runs) = self._method_calls(m, method_map)
 
-                runs = Cat(method_runs[method])
-                for i in OneHotSwitchDynamic(m, runs):
-                    m.d.comb += method.data_in.eq(method_args[method][i])
+        with profile_section("manager", "argument_muxing"):
+            for method in method_map.methods:
+                if len(method_args[method]) == 1:
+                    m.d.comb += method.data_in.eq(method_args[method][0])
+                else:
+                    if method.single_caller:
+                        raise RuntimeError(f"Single-caller method '{method.name}' called more than once")
+
+                    runs = Cat(method_runs[method])
+                    if self.and_or_mux or method.and_or_mux:
+                        m.d.comb += method.data_in.eq(one_hot_mux(runs, method_args[method]))
+                    else:
+                        for i in OneHotSwitchDynamic(m, runs):
+                            m.d.comb += method.data_in.eq(method_args[method][i])
 
         return m
 
@@ -596,8 +995,15 @@ class TModule(ModuleLike, Elaboratable):
       execute. It can be used to reduce combinational path length due to
       multplexers while keeping related combinational and synchronous
       statements together.
+
+    The module also tracks the branches of `If`, `Switch` and `FSM`
+    constructs in which the code is currently defined. The transaction
+    manager uses them to find method calls which can never happen in
+    the same clock cycle.
     """
 
+    _chain_counter: ClassVar[count] = count()
+
     def __init__(self):
         self.main_module = Module()
         self.avoiding_module = Module()
@@ -606,6 +1012,29 @@ class TModule(ModuleLike, Elaboratable):
         self.submodules = self.main_module.submodules
         self.domains = self.main_module.domains
         self.fsm: Optional[FSM] = None
+        self._path: list[tuple[int, int]] = []
+        self._if_chains: dict[int, list[int]] = {}
+        self._switch_chains: list[list[int]] = []
+        self._fsm_chain: Optional[tuple[int, dict[str, int]]] = None
+
+    @property
+    def path(self) -> ConditionPath:
+        """Branches in which the code is currently defined.
+
+        Every element is a pair of an identifier of an `If`/`Elif`/`Else`
+        chain, a `Switch` or an `FSM`, and the index of the branch taken.
+        Two paths which take different branches of the same construct
+        are mutually exclusive.
+        """
+        return tuple(self._path)
+
+    @contextmanager
+    def _branch(self, chain: int, branch: int):
+        self._path.append((chain, branch))
+        try:
+            yield
+        finally:
+            self._path.pop()
 
     @contextmanager
     def AvoidedIf(self, cond: ValueLike):  # noqa: N802
@@ -616,52 +1045,76 @@ class TModule(ModuleLike, Elaboratable):
     def If(self, cond: ValueLike):  # noqa: N802
         with self.main_module.If(cond):
             with self.avoiding_module.If(cond):
-                yield
+                chain = [next(TModule._chain_counter), 0]
+                self._if_chains[len(self._path)] = chain
+                with self._branch(chain[0], chain[1]):
+                    yield
 
     @contextmanager
     def Elif(self, cond):  # noqa: N802
         with self.main_module.Elif(cond):
             with self.avoiding_module.Elif(cond):
-                yield
+                chain = self._if_chains[len(self._path)]
+                chain[1] += 1
+                with self._branch(chain[0], chain[1]):
+                    yield
 
     @contextmanager
     def Else(self):  # noqa: N802
         with self.main_module.Else():
             with self.avoiding_module.Else():
-                yield
+                chain = self._if_chains[len(self._path)]
+                chain[1] += 1
+                with self._branch(chain[0], chain[1]):
+                    yield
 
     @contextmanager
     def Switch(self, test: ValueLike):  # noqa: N802
         with self.main_module.Switch(test):
             with self.avoiding_module.Switch(test):
-                yield
+                self._switch_chains.append([next(TModule._chain_counter), 0])
+                try:
+                    yield
+                finally:
+                    self._switch_chains.pop()
 
     @contextmanager
     def Case(self, *patterns: SwitchKey):  # noqa: N802
         with self.main_module.Case(*patterns):
             with self.avoiding_module.Case(*patterns):
-                yield
+                chain = self._switch_chains[-1]
+                chain[1] += 1
+                with self._branch(chain[0], chain[1]):
+                    yield
 
     @contextmanager
     def Default(self):  # noqa: N802
         with self.main_module.Default():
             with self.avoiding_module.Default():
-                yield
+                chain = self._switch_chains[-1]
+                chain[1] += 1
+                with self._branch(chain[0], chain[1]):
+                    yield
 
     @contextmanager
     def FSM(self, reset: Optional[str] = None, domain: str = "sync", name: str = "fsm"):  # noqa: N802
         old_fsm = self.fsm
+        old_fsm_chain = self._fsm_chain
         with self.main_module.FSM(reset, domain, name) as fsm:
             self.fsm = fsm
+            self._fsm_chain = (next(TModule._chain_counter), {})
             yield fsm
         self.fsm = old_fsm
+        self._fsm_chain = old_fsm_chain
 
     @contextmanager
     def State(self, name: str):  # noqa: N802
-        assert self.fsm is not None
+        assert self.fsm is not None and self._fsm_chain is not None
         with self.main_module.State(name):
             with self.avoiding_module.If(self.fsm.ongoing(name)):
-                yield
+                chain, states = self._fsm_chain
+                with self._branch(chain, states.setdefault(name, len(states))):
+                    yield
 
     @property
     def next(self) -> NoReturn:
@@ -695,12 +1148,14 @@ class TransactionBase(Owned, Protocol):
     defined: bool = False
     name: str
     method_uses: dict["Method", Tuple[Record, ValueLike]]
+    method_paths: dict["Method", ConditionPath]
     relations: list[RelationBase]
     simultaneous_list: list[TransactionOrMethod]
     independent_list: list[TransactionOrMethod]
 
     def __init__(self):
         self.method_uses: dict["Method", Tuple[Record, ValueLike]] = dict()
+        self.method_paths: dict["Method", ConditionPath] = dict()
         self.relations: list[RelationBase] = []
         self.simultaneous_list: list[TransactionOrMethod] = []
         self.independent_list: list[TransactionOrMethod] = []
@@ -740,10 +1195,11 @@ class TransactionBase(Owned, Protocol):
             RelationBase(end=end, priority=Priority.LEFT, conflict=False, silence_warning=self.owner != end.owner)
         )
 
-    def use_method(self, method: "Method", arg: Record, enable: ValueLike):
+    def use_method(self, method: "Method", arg: Record, enable: ValueLike, path: ConditionPath = ()):
         if method in self.method_uses:
             raise RuntimeError(f"Method '{method.name}' can't be called twice from the same transaction '{self.name}'")
         self.method_uses[method] = (arg, enable)
+        self.method_paths[method] = path
 
     def simultaneous(self, *others: TransactionOrMethod) -> None:
         """Adds simultaneity relations.
@@ -913,9 +1369,10 @@ class Transaction(TransactionBase):
         self.def_order = next(TransactionBase.def_counter)
 
         m.d.av_comb += self.request.eq(request)
-        with self.context(m):
-            with m.AvoidedIf(self.grant):
-                yield self
+        with profile_section("transaction", self.name):
+            with self.context(m):
+                with m.AvoidedIf(self.grant):
+                    yield self
         self.defined = True
 
     def __repr__(self) -> str:
@@ -971,6 +1428,7 @@ class Method(TransactionBase):
         o: MethodLayout = (),
         nonexclusive: bool = False,
         single_caller: bool = False,
+        and_or_mux: bool = False,
     ):
         """
         Parameters
@@ -993,6 +1451,11 @@ class Method(TransactionBase):
             If true, this method is intended to be called from a single
             transaction. An error will be thrown if called from multiple
             transactions.
+        and_or_mux: bool
+            If true, the arguments of this method are selected using an
+            AND-OR multiplexer (see `one_hot_mux`) instead of a `Switch`
+            when the method has multiple callers. This results in shallower
+            logic for methods with many callers.
         """
         super().__init__()
         self.owner, owner_name = get_caller_class_name(default="$method")
@@ -1003,6 +1466,7 @@ class Method(TransactionBase):
         self.data_out = Record(o)
         self.nonexclusive = nonexclusive
         self.single_caller = single_caller
+        self.and_or_mux = and_or_mux
         self.validate_arguments: Optional[Callable[..., ValueLike]] = None
         if nonexclusive:
             assert len(self.data_in) == 0
@@ -1109,9 +1573,10 @@ class Method(TransactionBase):
         try:
             m.d.av_comb += self.ready.eq(ready)
             m.d.top_comb += self.data_out.eq(out)
-            with self.context(m):
-                with m.AvoidedIf(self.run):
-                    yield self.data_in
+            with profile_section("method", self.name):
+                with self.context(m):
+                    with m.AvoidedIf(self.run):
+                        yield self.data_in
         finally:
             self.defined = True
 
@@ -1180,7 +1645,7 @@ class Method(TransactionBase):
         enable_sig = Signal(name=self.owned_name + "_enable")
         m.d.av_comb += enable_sig.eq(enable)
         m.d.top_comb += assign(arg_rec, arg, fields=AssignType.ALL)
-        TransactionBase.get().use_method(self, arg_rec, enable_sig)
+        TransactionBase.get().use_method(self, arg_rec, enable_sig, m.path)
 
         return self.data_out
 
@@ -107,6 +107,20 @@ class OwnershipGraph:
         hier = self.hier[owner_id]
         return f"{hier}.{name}"
 
+    def hierarchize(self):
+        """
+        Compute hierarchical names of all owners, without dumping the graph.
+        """
+
+        def rec(owner: int, hier: str):
+            self.hier[owner] = hier
+            for subowner in self.graph.get(owner, []):
+                rec(subowner, f"{hier}.{self.names[subowner]}")
+
+        for owner in self.names:
+            if owner not in self.labels:
+                rec(owner, self.names[owner])
+
     def prune(self, owner: Optional[int] = None):
         """
         Mark all empty subgraphs.
@@ -5,6 +5,7 @@ from ..core import *
 __all__ = [
     "FIFO",
     "Forwarder",
+    "Pipe",
     "Connect",
     "ConnectTrans",
     "ManyToOneConnectTrans",
@@ -136,6 +137,80 @@ class Forwarder(Elaboratable):
         return m
 
 
+class Pipe(Elaboratable):
+    """Pipeline register with skid buffering
+
+    Provides a means to connect two transactions through a register slice,
+    breaking the combinational paths between them. Exposes two methods:
+    `read`, and `write`. Unlike `Forwarder`, the data written by `write`
+    is available to `read` in the next clock cycle. The readiness of both
+    methods depends only on registers, so neither the `ready` nor the data
+    paths are combinationally connected between the callers of `read` and
+    `write`. The methods are not ordered.
+
+    To keep the throughput of one transfer per clock cycle, a second (skid)
+    register stores the value written when `read` is not executed. `write`
+    is ready as long as the skid register is empty.
+
+    Attributes
+    ----------
+    read: Method
+        The read method. Accepts an empty argument, returns a `Record`.
+    write: Method
+        The write method. Accepts a `Record`, returns empty result.
+    clear: Method
+        Removes all stored values.
+    """
+
+    def __init__(self, layout: MethodLayout):
+        """
+        Parameters
+        ----------
+        layout: record layout
+            The format of records passed through the pipe.
+        """
+        self.read = Method(o=layout)
+        self.write = Method(i=layout)
+        self.clear = Method()
+
+        self.clear.add_conflict(self.read, Priority.LEFT)
+        self.clear.add_conflict(self.write, Priority.LEFT)
+
+    def elaborate(self, platform):
+        m = TModule()
+
+        main = Record.like(self.read.data_out)
+        main_valid = Signal()
+        skid = Record.like(self.read.data_out)
+        skid_valid = Signal()
+
+        @def_method(m, self.write, ready=~skid_valid)
+        def _(arg):
+            with m.If(main_valid & ~self.read.run):
+                m.d.sync += skid.eq(arg)
+                m.d.sync += skid_valid.eq(1)
+            with m.Else():
+                m.d.sync += main.eq(arg)
+                m.d.sync += main_valid.eq(1)
+
+        @def_method(m, self.read, ready=main_valid)
+        def _():
+            # when write is run, the skid register is empty
+            with m.If(skid_valid):
+                m.d.sync += main.eq(skid)
+                m.d.sync += skid_valid.eq(0)
+            with m.Elif(~self.write.run):
+                m.d.sync += main_valid.eq(0)
+            return main
+
+        @def_method(m, self.clear)
+        def _():
+            m.d.sync += main_valid.eq(0)
+            m.d.sync += skid_valid.eq(0)
+
+        return m
+
+
 class Connect(Elaboratable):
     """Forwarding by transaction simultaneity
 
@@ -229,7 +304,7 @@ class ManyToOneConnectTrans(Elaboratable):
     transactions. Equivalent to a set of `ConnectTrans`.
     """
 
-    def __init__(self, *, get_results: list[Method], put_result: Method):
+    def __init__(self, *, get_results: list[Method], put_result: Method, and_or_mux: bool = False):
         """
         Parameters
         ----------
@@ -237,16 +312,27 @@ class ManyToOneConnectTrans(Elaboratable):
             Methods to be connected to the `put_result` method.
         put_result: Method
             Common method for each of the connections created.
+        and_or_mux: bool
+            If true, the argument of `put_result` is selected using an
+            AND-OR multiplexer instead of a `Switch`.
         """
         self.get_results = get_results
         self.m_put_result = put_result
+        self.and_or_mux = and_or_mux
 
         self.count = len(self.get_results)
 
     def elaborate(self, platform):
         m = TModule()
 
+        put_result = self.m_put_result
+        if self.and_or_mux:
+            # the multiplexer type is a property of the called method, so a proxy is needed
+            layouts = {"i": self.m_put_result.data_in.layout, "o": self.m_put_result.data_out.layout}
+            put_result = Method(name="put_result", **layouts, and_or_mux=True)
+            put_result.proxy(m, self.m_put_result)
+
         for i in range(self.count):
-            m.submodules[f"ManyToOneConnectTrans_input_{i}"] = ConnectTrans(self.m_put_result, self.get_results[i])
+            m.submodules[f"ManyToOneConnectTrans_input_{i}"] = ConnectTrans(put_result, self.get_results[i])
 
         return m
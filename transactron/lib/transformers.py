@@ -242,14 +242,18 @@ class Collector(Elaboratable):
         Method which returns single result of provided methods.
     """
 
-    def __init__(self, targets: list[Method]):
+    def __init__(self, targets: list[Method], *, and_or_mux: bool = False):
         """
         Parameters
         ----------
         method_list: list[Method]
             List of methods from which results will be collected.
+        and_or_mux: bool
+            If true, the results are selected using an AND-OR multiplexer
+            instead of a `Switch`.
         """
         self.method_list = targets
+        self.and_or_mux = and_or_mux
         layout = targets[0].data_out.layout
         self.method = Method(o=layout)
 
@@ -263,7 +267,7 @@ class Collector(Elaboratable):
         m.submodules.forwarder = forwarder = Forwarder(self.method.data_out.layout)
 
         m.submodules.connect = ManyToOneConnectTrans(
-            get_results=[get for get in self.method_list], put_result=forwarder.write
+            get_results=[get for get in self.method_list], put_result=forwarder.write, and_or_mux=self.and_or_mux
         )
 
         self.method.proxy(m, forwarder.read)
@@ -0,0 +1,382 @@
+"""
+Static estimation of combinational logic depth of Amaranth and Transactron designs.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from amaranth import *
+from amaranth.hdl.ast import ArrayProxy, Assign, Operator, Part, Slice, Statement, Switch
+from amaranth.hdl.ir import Fragment, Instance
+
+from .core import MethodMap, TransactionBase, TransactionManager
+from .graph import OwnershipGraph
+from .utils import ValueLike
+
+__all__ = ["LogicDepthEstimator", "DepthEntry", "transaction_depths"]
+
+
+# Leaves of a cone of LUT-mappable logic: id of the leaf -> (arrival depth, critical source signal).
+_Form = dict[int, tuple[int, Optional[Signal]]]
+
+_BITWISE_OPERATORS = {"~", "&", "|", "^", "m", "u", "s"}
+_REDUCTION_OPERATORS = {"b", "r|", "r&", "r^"}
+_EQUALITY_OPERATORS = {"==", "!="}
+_CARRY_OPERATORS = {"+", "-", "<", "<=", ">", ">="}
+_SHIFT_OPERATORS = {"<<", ">>"}
+
+
+class LogicDepthEstimator:
+    """Static estimator of combinational logic depth.
+
+    Estimates the number of LUT levels on combinational paths in
+    a prepared `Fragment`, without running synthesis. Registers, inputs
+    and instance outputs have depth 0. Cones of bitwise logic (including
+    multiplexers and `If`/`Switch` conditions) are assumed to be mapped
+    to balanced trees of LUTs, which gives `ceil(log_k(n))` levels for
+    `n` distinct inputs and `k`-input LUTs. Carry-chain operators
+    (addition, subtraction, comparisons) cost one level plus one level per
+    `carry_bits_per_level` bits. Combinational memory read ports are
+    counted as distributed RAM.
+
+    The estimate ignores fan-out, routing and retiming, so it is only
+    meaningful for comparing paths in the same design.
+
+    Attributes
+    ----------
+    loops: list[Signal]
+        Signals on which a combinational loop was detected. Loops are
+        broken by treating these signals as sources.
+    """
+
+    def __init__(self, fragment: Fragment, *, lut_inputs: int = 4, carry_bits_per_level: int = 8):
+        """
+        Parameters
+        ----------
+        fragment: Fragment
+            Prepared fragment (see `Fragment.prepare`) of the analyzed design.
+        lut_inputs: int
+            Number of LUT inputs.
+        carry_bits_per_level: int
+            Number of bits of a carry chain which count as a single LUT level.
+        """
+        self.lut_inputs = lut_inputs
+        self.carry_bits_per_level = carry_bits_per_level
+        # cones with more inputs are cut at signal boundaries
+        self.max_cone_inputs = lut_inputs**2
+
+        self.loops: list[Signal] = []
+        self._loop_ids: set[int] = set()
+
+        self._signals: dict[int, Signal] = {}
+        self._drivers: dict[int, list[tuple[list[Value], Value]]] = {}
+        self._memory_reads: dict[int, tuple[Value, int]] = {}
+        self._forms: dict[int, _Form] = {}
+        # keeps the values used as leaves alive, so that their ids stay unique
+        self._leaf_values: list[Value] = []
+
+        self._names: dict[int, str] = {}
+
+        self._collect(fragment, "top")
+
+    def levels(self, inputs: int) -> int:
+        """Number of LUT levels needed to combine the given number of inputs."""
+        levels = 0
+        while inputs > 1:
+            inputs = -(-inputs // self.lut_inputs)
+            levels += 1
+        return levels
+
+    def depth(self, value: ValueLike) -> int:
+        """Estimated number of LUT levels before the value is computed."""
+        return self._form_depth(self._form(Value.cast(value)))[0]
+
+    def path(self, value: ValueLike) -> list[Signal]:
+        """Signals on the critical path to the value, starting from a source."""
+        _, source = self._form_depth(self._form(Value.cast(value)))
+        path: list[Signal] = []
+        while source is not None and not any(signal is source for signal in path):
+            path.append(source)
+            if id(source) not in self._signals or id(source) in self._loop_ids:
+                break
+            _, source = self._form_depth(self._signal_cone(source))
+        return list(reversed(path))
+
+    def name(self, signal: Signal) -> str:
+        """Hierarchical name of a signal.
+
+        Unless set by `set_name`, the name is based on the fragment which drives the signal.
+        """
+        return self._names.get(id(signal), signal.name)
+
+    def set_name(self, signal: Signal, name: str):
+        """Sets the name of a signal, e.g. one driven outside the module which owns it."""
+        self._names[id(signal)] = name
+
+    def _collect(self, fragment: Fragment, hier: str):
+        if isinstance(fragment, Instance):
+            if fragment.type == "$mem_v2":
+                self._collect_memory(fragment, hier)
+            return
+
+        for domain_signals in fragment.drivers.values():
+            for signal in domain_signals:
+                self._names[id(signal)] = f"{hier}.{signal.name}"
+
+        comb_signals = set(id(signal) for signal in fragment.drivers.get(None, []))
+        self._collect_statements(fragment.statements, [], comb_signals)
+
+        for i, (subfragment, name) in enumerate(fragment.subfragments):
+            self._collect(subfragment, f"{hier}.{name if name is not None else f'U${i}'}")
+
+    def _collect_memory(self, instance: Instance, hier: str):
+        clk_enable = instance.parameters["RD_CLK_ENABLE"].value
+        size = instance.parameters["SIZE"]
+        addrs = Value.cast(instance.named_ports["RD_ADDR"][0]).parts
+        datas = Value.cast(instance.named_ports["RD_DATA"][0]).parts
+        for i, (addr, data) in enumerate(zip(addrs, datas)):
+            if not clk_enable & (1 << i) and isinstance(data, Signal):
+                self._signals[id(data)] = data
+                self._names[id(data)] = f"{hier}.{data.name}"
+                # 16-entry LUT RAMs followed by a multiplexer tree
+                self._memory_reads[id(data)] = (addr, 1 + self.levels(-(-size // 16)))
+
+    def _collect_statements(self, statements: list[Statement], conds: list[Value], comb_signals: set[int]):
+        for stmt in statements:
+            if isinstance(stmt, Assign):
+                lhs_conds = conds + self._lhs_conditions(stmt.lhs)
+                for signal in stmt.lhs._lhs_signals():
+                    if id(signal) in comb_signals:
+                        self._signals[id(signal)] = signal
+                        self._drivers.setdefault(id(signal), []).append((lhs_conds, stmt.rhs))
+            elif isinstance(stmt, Switch):
+                for case_stmts in stmt.cases.values():
+                    self._collect_statements(case_stmts, conds + [stmt.test], comb_signals)
+
+    def _lhs_conditions(self, lhs: Value) -> list[Value]:
+        if isinstance(lhs, Part):
+            return [lhs.offset] + self._lhs_conditions(lhs.value)
+        if isinstance(lhs, Slice):
+            return self._lhs_conditions(lhs.value)
+        if isinstance(lhs, Cat):
+            return [cond for part in lhs.parts for cond in self._lhs_conditions(part)]
+        if isinstance(lhs, ArrayProxy):
+            return [lhs.index] + [cond for elem in lhs.elems for cond in self._lhs_conditions(Value.cast(elem))]
+        return []
+
+    def _dependencies(self, signal_id: int) -> list[Signal]:
+        if signal_id in self._memory_reads:
+            return list(self._memory_reads[signal_id][0]._rhs_signals())
+        deps = []
+        for conds, rhs in self._drivers[signal_id]:
+            for value in conds + [rhs]:
+                deps.extend(value._rhs_signals())
+        return deps
+
+    def _compute(self, signal: Signal):
+        """Computes the forms of the signal and its dependencies, avoiding deep recursion."""
+        in_progress = set()
+        stack = [(signal, iter(self._dependencies(id(signal))))]
+        in_progress.add(id(signal))
+        while stack:
+            current, deps = stack[-1]
+            for dep in deps:
+                if id(dep) in self._forms or id(dep) not in self._signals:
+                    continue
+                if id(dep) in in_progress:
+                    if id(dep) not in self._loop_ids:
+                        self._loop_ids.add(id(dep))
+                        self.loops.append(dep)
+                    continue
+                in_progress.add(id(dep))
+                stack.append((dep, iter(self._dependencies(id(dep)))))
+                break
+            else:
+                stack.pop()
+                in_progress.remove(id(current))
+                form = self._cut(self._signal_cone(current), current)
+                # the critical paths through the leaves pass through this signal
+                self._forms[id(current)] = {key: (depth, current) for key, (depth, _) in form.items()}
+
+    def _signal_cone(self, signal: Signal) -> _Form:
+        if id(signal) in self._memory_reads:
+            addr, cost = self._memory_reads[id(signal)]
+            depth, source = self._form_depth(self._form(addr))
+            return {id(signal): (depth + cost, source)}
+
+        form: _Form = {}
+        for conds, rhs in self._drivers[id(signal)]:
+            for value in conds + [rhs]:
+                self._merge(form, self._form(value))
+        return form
+
+    def _signal_form(self, signal: Signal) -> _Form:
+        if id(signal) not in self._signals:
+            return {id(signal): (0, signal)}
+        if id(signal) not in self._forms:
+            if id(signal) in self._loop_ids:
+                return {id(signal): (0, signal)}
+            self._compute(signal)
+        return self._forms[id(signal)]
+
+    def _form_depth(self, form: _Form) -> tuple[int, Optional[Signal]]:
+        if not form:
+            return 0, None
+        depth, source = max(form.values(), key=lambda leaf: leaf[0])
+        return depth + self.levels(len(form)), source
+
+    def _merge(self, form: _Form, other: _Form):
+        for key, leaf in other.items():
+            if key not in form or form[key][0] < leaf[0]:
+                form[key] = leaf
+
+    def _cut(self, form: _Form, value: Value) -> _Form:
+        if len(form) <= self.max_cone_inputs:
+            return form
+        depth, source = self._form_depth(form)
+        self._leaf_values.append(value)
+        return {id(value): (depth, source)}
+
+    def _leaf(self, value: Value, form: _Form, inputs: int, cost: int = 0) -> _Form:
+        depth, source = max(form.values(), key=lambda leaf: leaf[0], default=(0, None))
+        self._leaf_values.append(value)
+        return {id(value): (depth + self.levels(inputs) + cost, source)}
+
+    def _form(self, value: Value) -> _Form:
+        if isinstance(value, Signal):
+            return self._signal_form(value)
+        if isinstance(value, Slice) or isinstance(value, Part) and isinstance(value.offset, Const):
+            return self._form(value.value)
+        if isinstance(value, Part):
+            form = self._merge_all([value.value, value.offset])
+            return self._leaf(value, form, len(form) + 2 ** len(value.offset))
+        if isinstance(value, Cat):
+            return self._merge_all(value.parts)
+        if isinstance(value, ArrayProxy):
+            return self._cut(self._merge_all([Value.cast(elem) for elem in value.elems] + [value.index]), value)
+        if isinstance(value, Operator):
+            operands = value.operands
+            if value.operator in _BITWISE_OPERATORS:
+                return self._cut(self._merge_all(operands), value)
+            width = max(len(operand) for operand in operands)
+            if value.operator in _REDUCTION_OPERATORS | _EQUALITY_OPERATORS:
+                # every bit of the operands is an input
+                form = self._merge_all(operands)
+                return self._leaf(value, form, max(len(form), len(operands) * width))
+            if value.operator in _CARRY_OPERATORS:
+                form = self._merge_all(operands)
+                return self._leaf(value, form, len(form), 1 + width // self.carry_bits_per_level)
+            if value.operator in _SHIFT_OPERATORS:
+                if isinstance(operands[1], Const):
+                    return self._form(operands[0])
+                form = self._merge_all(operands)
+                return self._leaf(value, form, len(form) + min(2 ** len(operands[1]), width))
+            # multiplication, division, modulo
+            form = self._merge_all(operands)
+            return self._leaf(value, form, len(form), 2 * width)
+        # constants and other values without combinational dependencies
+        form = {}
+        for signal in value._rhs_signals():
+            self._merge(form, self._signal_form(signal))
+        return form
+
+    def _merge_all(self, values: list[Value]) -> _Form:
+        form: _Form = {}
+        for value in values:
+            self._merge(form, self._form(value))
+        return form
+
+
+@dataclass
+class DepthEntry:
+    """Estimated logic depth of a transaction or method signal.
+
+    Attributes
+    ----------
+    name: str
+        Hierarchical name of the transaction or method.
+    kind: str
+        Either `transaction` or `method`.
+    signal: str
+        The analyzed signal: `grant` for transactions, `ready`, `run`,
+        `data_in` or `data_out` for methods.
+    depth: int
+        Estimated number of LUT levels.
+    path: list[str]
+        Names of the signals on the critical path.
+    """
+
+    name: str
+    kind: str
+    signal: str
+    depth: int
+    path: list[str]
+
+
+def transaction_depths(
+    fragment: Fragment, manager: TransactionManager, estimator: Optional[LogicDepthEstimator] = None
+) -> list[DepthEntry]:
+    """Estimates the logic depth of transaction and method signals.
+
+    Parameters
+    ----------
+    fragment: TracingFragment
+        Prepared fragment of the design, elaborated using `TracingFragment`.
+    manager: TransactionManager
+        Transaction manager of the design.
+    estimator: LogicDepthEstimator, optional
+        Estimator used. By default, one with the default parameters is created.
+
+    Returns
+    -------
+    list[DepthEntry]
+        Estimated depths, from the deepest.
+    """
+    if estimator is None:
+        estimator = LogicDepthEstimator(fragment)
+
+    method_map = MethodMap(manager.transactions)
+    graph = OwnershipGraph(fragment)
+    for obj in method_map.methods_and_transactions:
+        if obj.owner is not None:
+            graph.insert_node(obj)
+    graph.hierarchize()
+
+    def hier_name(obj: TransactionBase) -> str:
+        if obj.owner is None:
+            return obj.name
+        try:
+            return graph.get_hier_name(obj)
+        except KeyError:
+            return graph.get_name(obj)
+
+    names = {id(obj): hier_name(obj) for obj in method_map.methods_and_transactions}
+
+    # The control signals and the method arguments are driven by the transaction manager, and
+    # their names are not unique, so they are named after their transactions and methods.
+    for transaction in method_map.transactions:
+        estimator.set_name(transaction.request, f"{names[id(transaction)]}.request")
+        estimator.set_name(transaction.grant, f"{names[id(transaction)]}.grant")
+    for method in method_map.methods:
+        estimator.set_name(method.ready, f"{names[id(method)]}.ready")
+        estimator.set_name(method.run, f"{names[id(method)]}.run")
+        for signal in method.data_in._lhs_signals():
+            estimator.set_name(signal, f"{names[id(method)]}.{signal.name}")
+
+    def entry(obj: TransactionBase, kind: str, signal: str, value: ValueLike) -> DepthEntry:
+        path = [estimator.name(signal) for signal in estimator.path(value)]
+        return DepthEntry(names[id(obj)], kind, signal, estimator.depth(value), path)
+
+    entries = []
+    for transaction in method_map.transactions:
+        entries.append(entry(transaction, "transaction", "grant", transaction.grant))
+    for method in method_map.methods:
+        entries.append(entry(method, "method", "ready", method.ready))
+        entries.append(entry(method, "method", "run", method.run))
+        if len(method.data_in):
+            entries.append(entry(method, "method", "data_in", method.data_in))
+        if len(method.data_out):
+            entries.append(entry(method, "method", "data_out", method.data_out))
+
+    entries.sort(key=lambda entry: entry.depth, reverse=True)
+    return entries
@@ -0,0 +1,244 @@
+"""
+Profiling of the elaboration of Amaranth and Transactron designs.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, ContextManager, Optional, TextIO
+
+from amaranth.hdl.ir import Fragment
+
+__all__ = ["ElaborationProfiler", "ProfileEntry", "ProfileSummary", "profile_section"]
+
+
+@dataclass
+class ProfileEntry:
+    """Node of the elaboration profile tree.
+
+    Attributes
+    ----------
+    kind: str
+        Kind of the profiled section, e.g. `elaborate`, `method` or `manager`.
+    name: str
+        Name of the profiled section, e.g. class or method name.
+    calls: int
+        Number of times the section was entered in the given context.
+    total_time: float
+        Wall time spent in the section, including the nested sections, in seconds.
+    allocated: int
+        Net change of the memory allocated by Python in the section, in bytes.
+        Only measured when memory tracing is enabled.
+    children: dict[tuple[str, str], ProfileEntry]
+        Sections nested in this section, by kind and name.
+    """
+
+    kind: str
+    name: str
+    calls: int = 0
+    total_time: float = 0
+    allocated: int = 0
+    children: dict[tuple[str, str], "ProfileEntry"] = field(default_factory=dict)
+
+    @property
+    def self_time(self) -> float:
+        """Wall time spent in the section, excluding the nested sections."""
+        return self.total_time - sum(child.total_time for child in self.children.values())
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+
+@dataclass
+class ProfileSummary:
+    """Statistics of all sections with the same kind and name."""
+
+    kind: str
+    name: str
+    calls: int = 0
+    total_time: float = 0
+    self_time: float = 0
+    allocated: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+
+class ElaborationProfiler:
+    """Elaboration profiler.
+
+    When used as a context manager, measures the wall time and, optionally,
+    the memory allocated during the elaboration of every `Elaboratable`
+    (that is, every `Fragment.get` call), the definition of every method
+    and transaction body, and every phase of `TransactionManager`.
+    The measurements are collected in a tree of `ProfileEntry` objects,
+    which follows the nesting of the sections.
+
+    Example
+    -------
+    .. highlight:: python
+    .. code-block:: python
+
+        with ElaborationProfiler() as profiler:
+            verilog.convert(top, ports=ports)
+        print(profiler.report(sort_by="self"))
+        with open("elaboration.folded", "w") as f:
+            profiler.dump_flamegraph(f)
+    """
+
+    active: ClassVar[Optional["ElaborationProfiler"]] = None
+
+    def __init__(self, *, trace_memory: bool = False):
+        """
+        Parameters
+        ----------
+        trace_memory: bool
+            Measure allocated memory using `tracemalloc`. This significantly
+            slows down the elaboration.
+        """
+        self.trace_memory = trace_memory
+        self.root = ProfileEntry("root", "elaboration")
+        self._stack = [self.root]
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if ElaborationProfiler.active is not None:
+            raise RuntimeError("Another elaboration profiler is already active")
+        ElaborationProfiler.active = self
+
+        orig_fragment_get = Fragment.get
+        self._orig_fragment_get = orig_fragment_get
+
+        def fragment_get(obj, platform):
+            if isinstance(obj, Fragment):
+                return orig_fragment_get(obj, platform)
+            with self.section("elaborate", type(obj).__name__):
+                return orig_fragment_get(obj, platform)
+
+        Fragment.get = staticmethod(fragment_get)  # type: ignore
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self._root_section = self._measure(self.root)
+        self._root_section.__enter__()
+        return self
+
+    def __exit__(self, tp, val, tb):
+        self._root_section.__exit__(tp, val, tb)
+        Fragment.get = self._orig_fragment_get  # type: ignore
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        ElaborationProfiler.active = None
+
+    def section(self, kind: str, name: str) -> ContextManager[None]:
+        """Profiles a section nested in the currently profiled one."""
+        parent = self._stack[-1]
+        entry = parent.children.get((kind, name))
+        if entry is None:
+            entry = parent.children[(kind, name)] = ProfileEntry(kind, name)
+        return self._measure(entry)
+
+    @contextmanager
+    def _measure(self, entry: ProfileEntry) -> Iterator[None]:
+        self._stack.append(entry)
+        memory_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry.total_time += time.perf_counter() - start
+            if self.trace_memory:
+                entry.allocated += tracemalloc.get_traced_memory()[0] - memory_start
+            entry.calls += 1
+            self._stack.pop()
+
+    def summary(self) -> list[ProfileSummary]:
+        """Returns the statistics aggregated by section kind and name.
+
+        The total time and the allocated memory of recursively nested
+        sections with the same kind and name are counted only once.
+        """
+        summary: dict[tuple[str, str], ProfileSummary] = {}
+
+        def rec(entry: ProfileEntry, active: frozenset[tuple[str, str]]):
+            key = (entry.kind, entry.name)
+            if key not in summary:
+                summary[key] = ProfileSummary(entry.kind, entry.name)
+            summary[key].calls += entry.calls
+            summary[key].self_time += entry.self_time
+            if key not in active:
+                summary[key].total_time += entry.total_time
+                summary[key].allocated += entry.allocated
+            for child in entry.children.values():
+                rec(child, active | {key})
+
+        for child in self.root.children.values():
+            rec(child, frozenset())
+
+        return list(summary.values())
+
+    def report(self, *, sort_by: str = "total", limit: Optional[int] = None) -> str:
+        """Generates a textual report of the statistics aggregated by section.
+
+        Parameters
+        ----------
+        sort_by: str
+            Column used for sorting: `total`, `self`, `calls`, `memory` or `name`.
+        limit: int, optional
+            Maximum number of reported sections.
+        """
+        keys: dict[str, Callable[[ProfileSummary], Any]] = {
+            "total": lambda e: -e.total_time,
+            "self": lambda e: -e.self_time,
+            "calls": lambda e: -e.calls,
+            "memory": lambda e: -e.allocated,
+            "name": lambda e: e.label,
+        }
+        if sort_by not in keys:
+            raise ValueError(f"Unknown sort key '{sort_by}', expected one of: {', '.join(keys)}")
+
+        entries = sorted(self.summary(), key=keys[sort_by])[:limit]
+
+        lines = [f"Elaboration time: {self.root.total_time:.3f} s"]
+        header = f"{'total [s]':>10} {'self [s]':>10} {'calls':>8}"
+        if self.trace_memory:
+            header += f" {'memory [kB]':>12}"
+        lines.append(header + "  section")
+        for entry in entries:
+            line = f"{entry.total_time:10.4f} {entry.self_time:10.4f} {entry.calls:8}"
+            if self.trace_memory:
+                line += f" {entry.allocated / 1024:12.1f}"
+            lines.append(line + "  " + entry.label)
+        return "\n".join(lines)
+
+    def dump_flamegraph(self, file: TextIO):
+        """Writes the profile in the folded stacks format.
+
+        The output can be processed by `flamegraph.pl`, `inferno` or
+        `speedscope`. Values are self times in microseconds.
+        """
+
+        def rec(entry: ProfileEntry, stack: str):
+            label = entry.label.replace(";", ":").replace(" ", "_")
+            stack = f"{stack};{label}" if stack else label
+            value = round(entry.self_time * 1e6)
+            if value > 0:
+                file.write(f"{stack} {value}\n")
+            for child in entry.children.values():
+                rec(child, stack)
+
+        rec(self.root, "")
+
+
+def profile_section(kind: str, name: str) -> ContextManager[None]:
+    """Profiles a section if an `ElaborationProfiler` is active."""
+    if ElaborationProfiler.active is None:
+        return nullcontext()
+    return ElaborationProfiler.active.section(kind, name)
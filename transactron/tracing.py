@@ -9,6 +9,7 @@ from amaranth.hdl.xfrm import FragmentTransformer
 from amaranth.hdl import dsl, ir, mem, xfrm
 from transactron.utils import HasElaborate
 from . import core
+from .profiler import profile_section
 
 
 # generic tuple because of aggressive monkey-patching
@@ -73,7 +74,7 @@ class TracingFragment(Fragment):
 
         Relevant copyrights apply.
         """
-        with TracingEnabler():
+        with TracingEnabler(), profile_section("elaborate", type(obj).__name__):
             code = None
             old_obj = None
             while True:
@@ -108,7 +109,7 @@ class TracingFragment(Fragment):
                     )
                 # }} (taken from Amaranth)
                 new_obj._tracing_original = obj  # type: ignore
-                obj._elaborated = new_obj        # type: ignore
+                obj._elaborated = new_obj  # type: ignore
 
                 old_obj = obj
                 obj = new_obj
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from amaranth import *
 from transactron import Method, def_method, Priority, TModule
 from transactron._utils import MethodLayout
@@ -21,7 +22,7 @@ class BasicFifo(Elaboratable):
 
     """
 
-    def __init__(self, layout: MethodLayout, depth: int) -> None:
+    def __init__(self, layout: MethodLayout, depth: int, init: Iterable[int] = ()) -> None:
         """
         Parameters
         ----------
@@ -30,26 +31,33 @@ class BasicFifo(Elaboratable):
             If integer is given, Record with field `data` and width of this paramter is used as internal layout.
         depth: int
             Size of the FIFO.
+        init: Iterable[int]
+            Raw values of the entries present in the FIFO after reset. The first value is read first.
+            By default, the FIFO is empty after reset.
 
         """
         self.layout = layout
         self.width = len(Record(self.layout))
         self.depth = depth
+        self.init = list(init)
+
+        if len(self.init) > self.depth:
+            raise ValueError(f"Too many initial values for a FIFO of depth {self.depth}")
 
         self.read = Method(o=self.layout)
         self.write = Method(i=self.layout)
         self.clear = Method()
         self.head = Record(self.layout)
 
-        self.buff = Memory(width=self.width, depth=self.depth)
+        self.buff = Memory(width=self.width, depth=self.depth, init=self.init)
 
         self.write_ready = Signal()
         self.read_ready = Signal()
 
         self.read_idx = Signal((self.depth - 1).bit_length())
-        self.write_idx = Signal((self.depth - 1).bit_length())
+        self.write_idx = Signal((self.depth - 1).bit_length(), reset=len(self.init) % self.depth)
         # current fifo depth
-        self.level = Signal((self.depth).bit_length())
+        self.level = Signal((self.depth).bit_length(), reset=len(self.init))
 
         self.clear.add_conflict(self.read, Priority.LEFT)
         self.clear.add_conflict(self.write, Priority.LEFT)
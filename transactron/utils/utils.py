@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from enum import Enum
 from typing import Literal, Optional, TypeAlias, cast, overload
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Mapping, Sequence
 from amaranth import *
 from amaranth.hdl.ast import Assign, ArrayProxy
 from amaranth.lib import data
@@ -23,6 +23,7 @@ __all__ = [
     "popcount",
     "count_leading_zeros",
     "count_trailing_zeros",
+    "one_hot_mux",
 ]
 
 
@@ -288,6 +289,46 @@ def popcount(s: Value):
     return sum_layers[0][0 : bits_for(len(s))]
 
 
+def one_hot_mux(sel: Value, values: Sequence[ValueLike]) -> Value:
+    """AND-OR multiplexer for one-hot selectors.
+
+    Each value is masked with the corresponding selector bit, and the
+    results are combined using a balanced tree of ORs. Unlike a `Switch`,
+    this does not encode any priority between the values, which allows
+    synthesis tools to generate shallower logic.
+
+    Parameters
+    ----------
+    sel : Value
+        One-hot selector, one bit for every value. If more than one bit
+        is set, the result is the bitwise OR of the selected values.
+        If no bit is set, the result is zero.
+    values : Sequence[ValueLike]
+        Values to choose from.
+
+    Returns
+    -------
+    Value
+        The selected value, as wide as the widest of the values.
+    """
+    if len(sel) != len(values):
+        raise ValueError(f"Selector width {len(sel)} does not match the number of values {len(values)}")
+
+    casted = [Value.cast(value) for value in values]
+    width = max((len(value) for value in casted), default=0)
+    or_layers = [value & sel[i].replicate(width) for i, value in enumerate(casted)]
+
+    if not or_layers:
+        return C(0, width)
+
+    while len(or_layers) > 1:
+        if len(or_layers) % 2:
+            or_layers.append(C(0, width))
+        or_layers = [a | b for a, b in zip(or_layers[::2], or_layers[1::2])]
+
+    return or_layers[0]
+
+
 def count_leading_zeros(s: Value) -> Value:
     def iter(s: Value, step: int) -> Value:
         # if no bits left - return empty value